@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import asyncio
+import bisect
 import hashlib
 import logging
+import math
 import os
 import shutil
 import subprocess
@@ -12,23 +14,36 @@ from pathlib import Path
 from typing import List, Optional
 
 import flet as ft
+import flet.canvas as cv
 import flet_audio as fta
 import flet_video as ftv
 
+from core.asset_server import RangeFileServer, link_asset, prune_asset_copies
+from core.background import PriorityLoader
 from core.config import ConfigStore
 from core.ffmpeg import (
     FFmpegNotFound,
     ExportCancelled,
     export_project,
     export_project_with_progress,
-    probe_media,
+    export_range_with_progress,
+    probe_media_batch,
+    probe_media_cached,
+    set_probe_cache,
+    set_proxy_map,
     resolve_ffmpeg_bins,
 )
-from core.history import HistoryEntry, HistoryManager
+from core.history import HistoryEntry, HistoryManager, ProjectSnapshot, restore_project, snapshot_project
 from core.model import MAX_CLIP_SPEED, MIN_CLIP_SPEED, ExportSettings, Project, Transition, normalize_speed
-from core.project_io import load_project, save_project
+from core.playback import PlaybackClock
+from core.probe_cache import ProbeCache
+from core.proxy import ProxyMap, ProxyPolicy, generate_proxy
+from core.segment_cache import SegmentCache
+from core.project_io import ProjectJournal, has_journal, load_project, project_from_snapshot, save_project
+from core.render import FrameScheduler
 from core.shortcuts import (
     ACTION_DELETE,
+    ACTION_DRAFT_RENDER,
     ACTION_DUPLICATE,
     ACTION_EXPORT,
     ACTION_IMPORT,
@@ -48,8 +63,10 @@ from core.shortcuts import (
     resolve_shortcut_action,
     shortcut_legend,
 )
-from core.thumbnails import generate_thumbnail, generate_waveform
+from core.peaks import WaveformPeaks, generate_peaks
+from core.thumbnails import FilmstripIndex, generate_filmstrip
 from core.timeline import (
+    TimelineIndex,
     add_clip_end,
     duplicate_clip,
     insert_clip_before,
@@ -58,6 +75,8 @@ from core.timeline import (
     split_clip_at_timeline_sec,
     total_duration,
     trim_clip,
+    span_spacers,
+    visible_span,
 )
 
 logging.basicConfig(level=logging.INFO)
@@ -130,6 +149,7 @@ class MediaItem:
     pixel_format: str = ""
     sample_rate: int = 0
     channels: int = 0
+    proxy_path: str = ""  # low-res stand-in used for previews; exports read `path`
 
 
 class AppState:
@@ -144,6 +164,12 @@ class AppState:
         self.px_per_sec: float = 60.0  # timeline zoom
         self.export_audio_mode: str = "mix"  # "mix" | "a1_only" | "v1_only"
         self.export_settings: ExportSettings = ExportSettings()
+        # Stream-copy unchanged GOPs when the timeline allows it.
+        self.export_smart_render: bool = False
+        # Render hard-cut chunks in parallel ffmpeg processes.
+        self.export_parallel: bool = False
+        # Keep rendered segments on disk so re-exports only encode what changed.
+        self.export_segment_cache: bool = False
         # Split marker time (seconds) for the currently selected clip.
         self.split_pos_sec: float = 0.0
         self.split_pos_clip_id: Optional[str] = None
@@ -176,12 +202,31 @@ def main(page: ft.Page) -> None:
     web_preview_cache: dict[str, str] = {}
     timeline_visual_web_cache: dict[str, str] = {}
     timeline_cache_root = root / ".cache" / "timeline_visuals"
-    timeline_thumb_dir = timeline_cache_root / "thumbs"
-    timeline_wave_dir = timeline_cache_root / "waves"
+    timeline_wave_dir = timeline_cache_root / "peaks"
+    timeline_strip_dir = timeline_cache_root / "filmstrips"
+    # Source path -> filmstrip index (None = generation failed; don't retry).
+    timeline_filmstrips: dict[str, Optional[FilmstripIndex]] = {}
+    # Source path -> memory-mapped waveform peaks (None = no audio / failed).
+    timeline_peaks: dict[str, Optional[WaveformPeaks]] = {}
+    # Filmstrips/peaks load off the UI thread; lower priority value loads first.
+    timeline_loader = PriorityLoader(workers=2, name="minicut-visuals")
+    # "track:clip" -> (track_id, clip, placeholder slot, width, height) awaiting a visual.
+    timeline_visual_slots: dict[str, tuple] = {}
     timeline_ffmpeg_path: Optional[str] = None
     timeline_visual_disabled: bool = False
-    history = HistoryManager(limit=50)
+    # Heavy sources are edited through proxies; clips keep the original path and
+    # the export builders resolve any proxy back to it.
+    proxy_map = ProxyMap()
+    set_proxy_map(proxy_map)
+    proxy_policy = ProxyPolicy()
+    proxy_dir = root / ".cache" / "proxies"
+    proxy_loader = PriorityLoader(workers=1, name="minicut-proxies")
+    history = HistoryManager()
     cfg = ConfigStore.default()
+    # ffprobe results persist across sessions; unchanged files are never re-probed.
+    set_probe_cache(ProbeCache(cfg.root_dir / "probe_cache.sqlite3"))
+    # Opt-in (export settings): rendered segments reused by later exports.
+    segment_cache = SegmentCache(cfg.root_dir / "segments")
     typing_shortcuts_blocked = False
     playhead_handle_w = 14.0
     playhead_bar = ft.Column(
@@ -211,6 +256,8 @@ def main(page: ft.Page) -> None:
     v_start_sec_map: dict[str, float] = {}
     v_start_px_map: dict[str, float] = {}
     v_clip_width_px_map: dict[str, float] = {}
+    v_start_px_list: List[float] = []
+    timeline_indexes: dict[str, TimelineIndex] = {}
     playhead_drag_start_left: float = 0.0
     playhead_drag_start_pointer_x: float = 0.0
     timeline_pan_active: bool = False
@@ -221,6 +268,9 @@ def main(page: ft.Page) -> None:
     timeline_v1_left_offset = timeline_lane_label_w + timeline_lane_gap_w
     timeline_total_sec: float = 0.0
     export_in_progress: bool = False
+    # Draft renders cover the selected clip, else playhead +/- this many seconds.
+    draft_render_pad_sec = 5.0
+    draft_dir = cfg.root_dir / "drafts"
 
     # Project path starts unset unless there's an existing default project.json.
     # This avoids writing into the app folder when running as a packaged executable.
@@ -232,6 +282,27 @@ def main(page: ft.Page) -> None:
         # SnackBar is a DialogControl in newer Flet versions.
         page.show_dialog(ft.SnackBar(ft.Text(msg)))
 
+    def _schedule_frame(fn, delay: float) -> None:
+        async def _run() -> None:
+            if delay > 0:
+                await asyncio.sleep(delay)
+            fn()
+
+        try:
+            page.run_task(_run)
+        except Exception:
+            fn()
+
+    # All regular UI refreshes go through `ui`: handlers mark regions dirty and
+    # one `page.update()` per frame sends the accumulated changes.
+    ui = FrameScheduler(
+        commit=page.update,
+        schedule=_schedule_frame,
+        on_error=lambda region, ex: log.exception("render %s failed: %s", region, ex),
+    )
+    for _region in ("media", "toolbar", "inspector", "timeline", "thumbnails", "playhead", "progress"):
+        ui.register(_region)
+
     def get_bins() -> Optional[tuple[str, str]]:
         try:
             return resolve_ffmpeg_bins(root)
@@ -273,6 +344,7 @@ def main(page: ft.Page) -> None:
         name = Path(state.project_path).name if state.project_path else "Untitled"
         dirty = " *" if state.dirty else ""
         page.title = f"MiniCut (MVP) - {name}{dirty}"
+        ui.invalidate("toolbar")
 
     def _mark_dirty() -> None:
         state.dirty = True
@@ -282,6 +354,17 @@ def main(page: ft.Page) -> None:
         state.dirty = False
         _update_title()
 
+    project_journal: Optional[ProjectJournal] = None
+
+    def _project_journal() -> Optional[ProjectJournal]:
+        nonlocal project_journal
+        path = state.project_path
+        if not path:
+            return None
+        if project_journal is None or str(project_journal.project_path) != str(Path(path)):
+            project_journal = ProjectJournal(path)
+        return project_journal
+
     def _parse_time_input(raw: str) -> Optional[float]:
         """
         Accept seconds (e.g. "3.5") or timestamps ("mm:ss", "hh:mm:ss").
@@ -364,35 +447,33 @@ def main(page: ft.Page) -> None:
     def _timeline_video_clips():
         return list(_timeline_video_track().clips)
 
+    def _track_index(track) -> TimelineIndex:
+        idx = timeline_indexes.get(track.id)
+        if idx is None:
+            idx = timeline_indexes[track.id] = TimelineIndex()
+        # Edits always assign a new clips list, so an unchanged list is a no-op.
+        return idx.update(track.clips)
+
+    def _timeline_video_index() -> TimelineIndex:
+        return _track_index(_timeline_video_track())
+
     def _timeline_video_total_sec() -> float:
-        return max(0.0, total_duration(_timeline_video_clips()))
+        return _timeline_video_index().total
 
     def _timeline_sec_to_position(sec: float) -> tuple[Optional[str], float, float]:
-        clips = _timeline_video_clips()
-        if not clips:
+        idx = _timeline_video_index()
+        if not len(idx):
             return None, 0.0, 0.0
-        s = max(0.0, min(float(sec), _timeline_video_total_sec()))
-        acc = 0.0
-        for c in clips:
-            end = acc + float(c.dur)
-            if s <= end + 1e-9:
-                rel = max(0.0, min(float(c.dur), s - acc))
-                return c.id, s, rel
-            acc = end
-        last = clips[-1]
-        return last.id, _timeline_video_total_sec(), float(last.dur)
+        s = max(0.0, min(float(sec), idx.total))
+        hit = idx.locate(s)
+        if hit is None:
+            last = len(idx) - 1
+            return idx.clips[last].id, idx.total, idx.dur_at(last)
+        i, rel = hit
+        return idx.clips[i].id, s, rel
 
     def _timeline_edge_points_sec() -> List[float]:
-        clips = _timeline_video_clips()
-        points: List[float] = [0.0]
-        acc = 0.0
-        for c in clips:
-            points.append(acc)
-            acc += float(c.dur)
-            points.append(acc)
-        if acc > 0.0:
-            points.append(acc)
-        return points
+        return _timeline_video_index().edge_points()
 
     def _snap_sec(sec: float) -> tuple[float, Optional[str]]:
         if not bool(state.snap_enabled):
@@ -448,7 +529,8 @@ def main(page: ft.Page) -> None:
             t.clips = list(clips)
 
     def _find_clip(track_id: str, clip_id: str):
-        return next((c for c in _track_clips(track_id) if c.id == clip_id), None)
+        t = _track_obj(track_id)
+        return _track_index(t).get(clip_id) if t is not None else None
 
     def _selected_clip():
         if not state.selected_track or not state.selected_clip_id:
@@ -471,93 +553,250 @@ def main(page: ft.Page) -> None:
             timeline_visual_disabled = True
             return None
 
-    def _prepare_web_asset_src(src: str, bucket: str = "_timeline_cache") -> Optional[str]:
-        if not is_web:
-            return src
-        try:
-            src_path = Path(src)
-            if not src_path.exists():
-                return None
+    web_asset_server: Optional[RangeFileServer] = None
 
-            st = src_path.stat()
-            key = f"{bucket}|{src_path.resolve()}|{st.st_mtime_ns}|{st.st_size}"
-            cached = timeline_visual_web_cache.get(key)
-            if cached:
-                return cached
+    def _web_asset_url(src: str, bucket: str, cache: dict[str, str], default_ext: str) -> Optional[str]:
+        """
+        Browser URL for a local file, without duplicating it.
 
-            ext = (src_path.suffix or ".png").lower()
-            digest = hashlib.sha1(key.encode("utf-8", errors="ignore")).hexdigest()[:16]
-            rel = Path(bucket) / f"{digest}{ext}"
-            dst = root / "assets" / rel
-            dst.parent.mkdir(parents=True, exist_ok=True)
+        A hard link under `assets/<bucket>` is served same-origin by Flet. When the
+        file lives on another volume it is streamed (with Range support) by a local
+        server instead; copying is only the last resort.
+        """
+        nonlocal web_asset_server
+        src_path = Path(src)
+        if not src_path.exists():
+            return None
 
+        st = src_path.stat()
+        key = f"{bucket}|{src_path.resolve()}|{st.st_mtime_ns}|{st.st_size}"
+        cached = cache.get(key)
+        if cached:
+            return cached
+
+        ext = (src_path.suffix or default_ext).lower()
+        digest = hashlib.sha1(key.encode("utf-8", errors="ignore")).hexdigest()[:16]
+        rel = Path(bucket) / f"{digest}{ext}"
+        dst = root / "assets" / rel
+        url: Optional[str] = None
+        if link_asset(src_path, dst):
+            url = str(rel).replace("\\", "/")
+        else:
+            try:
+                if web_asset_server is None:
+                    web_asset_server = RangeFileServer(
+                        host=os.environ.get("MINICUT_ASSET_HOST", "127.0.0.1"),
+                        public_host=os.environ.get("MINICUT_ASSET_PUBLIC_HOST") or None,
+                    )
+                url = web_asset_server.register(src_path)
+            except Exception as ex:
+                log.warning("asset server unavailable, copying %s (%s)", src_path.name, ex)
+        if url is None:
+            dst.parent.mkdir(parents=True, exist_ok=True)
             if not dst.exists() or dst.stat().st_size != st.st_size:
                 shutil.copy2(src_path, dst)
+            url = str(rel).replace("\\", "/")
+        cache[key] = url
+        return url
 
-            rel_web = str(rel).replace("\\", "/")
-            timeline_visual_web_cache[key] = rel_web
-            return rel_web
+    def _prepare_web_asset_src(src: str, bucket: str = "_timeline_cache") -> Optional[str]:
+        if not is_web:
+            return src
+        try:
+            return _web_asset_url(src, bucket, timeline_visual_web_cache, ".png")
         except Exception:
             return None
 
-    def _timeline_clip_visual_src(track_id: str, clip) -> Optional[str]:
+    if is_web:
+        # Copies made by older builds are keyed differently and would never be reused.
+        for bucket_dir in [root / "assets" / "_preview_cache", *(root / "assets").glob("_timeline_cache*")]:
+            freed = prune_asset_copies(bucket_dir)
+            if freed:
+                log.info("removed %d bytes of stale asset copies in %s", freed, bucket_dir.name)
+
+    def _visual_ready(kind: str, src: str) -> None:
+        """Worker callback: fill placeholders of clips that use `src`."""
+
+        async def _apply() -> None:
+            for slot_key, (track_id, clip, slot, width_px, height_px) in list(timeline_visual_slots.items()):
+                if clip.src != src or _track_kind(track_id) != kind:
+                    continue
+                visual = _timeline_clip_visual(track_id, clip, width_px, height_px)
+                if visual is None:
+                    continue
+                timeline_visual_slots.pop(slot_key, None)
+                slot.content = visual
+                ui.invalidate("thumbnails")
+
+        page.run_task(_apply)
+
+    def _timeline_filmstrip(src: str, priority: float = 0.0) -> Optional[FilmstripIndex]:
+        """Cached filmstrip, or None while it loads in the background."""
+        if src in timeline_filmstrips:
+            return timeline_filmstrips[src]
         ffmpeg = _get_timeline_ffmpeg()
         if not ffmpeg:
             return None
-        try:
-            kind = _track_kind(track_id)
-            if kind == "video":
-                img = generate_thumbnail(
-                    ffmpeg_path=ffmpeg,
-                    src=clip.src,
-                    in_sec=clip.in_sec,
-                    cache_dir=timeline_thumb_dir,
-                    width=320,
-                )
-                if not img:
-                    return None
-                return _prepare_web_asset_src(img, "_timeline_cache_v")
-
-            if kind != "audio":
-                return None
+        mi = next((m for m in state.media if m.path == src), None)
+        duration = mi.duration if mi else None
 
-            img = generate_waveform(
+        def _load() -> Optional[FilmstripIndex]:
+            return generate_filmstrip(
                 ffmpeg_path=ffmpeg,
-                src=clip.src,
-                in_sec=clip.in_sec,
-                duration=max(0.0, float(clip.out_sec) - float(clip.in_sec)),
-                cache_dir=timeline_wave_dir,
-                width=420,
-                height=42,
+                src=proxy_map.media_src(src),
+                cache_dir=timeline_strip_dir,
+                duration=duration,
             )
-            if not img:
+
+        def _done(strip: Optional[FilmstripIndex]) -> None:
+            timeline_filmstrips[src] = strip
+            if strip is not None:
+                _visual_ready("video", src)
+
+        timeline_loader.request(("strip", src), _load, _done, priority=priority)
+        return None
+
+    def _filmstrip_control(clip, width_px: int, height_px: int, priority: float = 0.0) -> Optional[ft.Control]:
+        """Frames from the source filmstrip laid across the clip width."""
+        strip = _timeline_filmstrip(clip.src, priority)
+        if strip is None:
+            return None
+        scale = float(height_px) / float(strip.tile_h)
+        frame_w = max(1.0, strip.tile_w * scale)
+        sheet_w = strip.cols * strip.tile_w * scale
+        sheet_h = strip.rows * strip.tile_h * scale
+        speed = normalize_speed(getattr(clip, "speed", 1.0))
+        count = max(1, min(40, int(math.ceil(width_px / frame_w))))
+        frames: List[ft.Control] = []
+        for k in range(count):
+            clip_sec = (k * frame_w) / max(1e-6, state.px_per_sec)
+            sheet, x, y = strip.frame_at(float(clip.in_sec) + clip_sec * speed)
+            sheet_src = _prepare_web_asset_src(sheet, "_timeline_cache_v")
+            if not sheet_src:
                 return None
-            return _prepare_web_asset_src(img, "_timeline_cache_a")
-        except Exception:
+            frames.append(
+                ft.Container(
+                    width=frame_w,
+                    height=height_px,
+                    clip_behavior=ft.ClipBehavior.HARD_EDGE,
+                    content=ft.Stack(
+                        [
+                            ft.Image(
+                                src=sheet_src,
+                                left=-x * scale,
+                                top=-y * scale,
+                                width=sheet_w,
+                                height=sheet_h,
+                                fit=ft.BoxFit.FILL,
+                            )
+                        ],
+                        width=frame_w,
+                        height=height_px,
+                    ),
+                )
+            )
+        return ft.Row(frames, spacing=0, width=width_px, height=height_px)
+
+    def _timeline_peaks(src: str, priority: float = 0.0) -> Optional[WaveformPeaks]:
+        """Cached waveform peaks, or None while they load in the background."""
+        if src in timeline_peaks:
+            return timeline_peaks[src]
+        ffmpeg = _get_timeline_ffmpeg()
+        if not ffmpeg:
+            return None
+
+        def _load() -> Optional[WaveformPeaks]:
+            path = generate_peaks(ffmpeg_path=ffmpeg, src=proxy_map.media_src(src), cache_dir=timeline_wave_dir)
+            return WaveformPeaks(Path(path)) if path else None
+
+        def _done(peaks: Optional[WaveformPeaks]) -> None:
+            timeline_peaks[src] = peaks
+            if peaks is not None:
+                _visual_ready("audio", src)
+
+        timeline_loader.request(("peaks", src), _load, _done, priority=priority)
+        return None
+
+    def _waveform_control(clip, width_px: int, height_px: int, priority: float = 0.0) -> Optional[ft.Control]:
+        """Waveform of the clip's source range, drawn in-process from cached peaks."""
+        peaks = _timeline_peaks(clip.src, priority)
+        if peaks is None:
+            return None
+        env = peaks.envelope(
+            float(clip.in_sec),
+            max(0.0, float(clip.out_sec) - float(clip.in_sec)),
+            max(1, int(width_px // 2)),
+        )
+        mid = height_px / 2.0
+        step = float(width_px) / float(len(env))
+        elements: List = [cv.Path.MoveTo(0.0, mid)]
+        for i, (_lo, hi) in enumerate(env):
+            elements.append(cv.Path.LineTo(i * step, mid - hi * mid))
+        for i in range(len(env) - 1, -1, -1):
+            elements.append(cv.Path.LineTo(i * step, mid - env[i][0] * mid))
+        elements.append(cv.Path.Close())
+        return cv.Canvas(
+            shapes=[
+                cv.Rect(0, 0, width_px, height_px, paint=ft.Paint(color=ft.Colors.GREEN_900)),
+                cv.Path(elements, paint=ft.Paint(color="#84D1FF", style=ft.PaintingStyle.FILL)),
+            ],
+            width=width_px,
+            height=height_px,
+        )
+
+    def _timeline_clip_visual(
+        track_id: str,
+        clip,
+        width_px: int,
+        height_px: int,
+        priority: float = 0.0,
+    ) -> Optional[ft.Control]:
+        """Visual for a clip if already loaded; otherwise queue it and return None."""
+        try:
+            kind = _track_kind(track_id)
+            if kind == "video":
+                return _filmstrip_control(clip, width_px, height_px, priority)
+            if kind == "audio":
+                return _waveform_control(clip, width_px, height_px, priority)
+        except Exception as ex:
+            # Keep the placeholder, but don't hide bugs in the visual builders.
+            log.exception("timeline visual failed for %s: %s", getattr(clip, "src", "?"), ex)
             return None
+        return None
 
     # ---------- Undo / Redo ----------
+    def _history_snapshot() -> ProjectSnapshot:
+        prev = history.peek_undo_project()
+        return snapshot_project(state.project, prev if isinstance(prev, ProjectSnapshot) else None)
+
     def _history_current(label: str = "(current)") -> HistoryEntry:
         return HistoryEntry(
             label=label,
-            project=state.project.to_dict(),
+            project=_history_snapshot(),
             selected_track=state.selected_track,
             selected_clip_id=state.selected_clip_id,
         )
 
-    def _history_record(label: str) -> None:
+    def _history_record(label: str, coalesce_key: Optional[tuple] = None) -> None:
+        # Slider bursts on one clip merge into a single step; skip the snapshot too.
+        if history.extend(coalesce_key):
+            return
         history.record(
             HistoryEntry(
                 label=label,
-                project=state.project.to_dict(),
+                project=_history_snapshot(),
                 selected_track=state.selected_track,
                 selected_clip_id=state.selected_clip_id,
-            )
+            ),
+            coalesce_key=coalesce_key,
         )
         _refresh_history_controls()
 
     def _history_apply(entry: HistoryEntry) -> None:
-        state.project = Project.from_dict(entry.project)
+        if isinstance(entry.project, ProjectSnapshot):
+            restore_project(state.project, entry.project)
+        else:
+            state.project = Project.from_dict(entry.project)
         state.selected_track = entry.selected_track
         state.selected_clip_id = entry.selected_clip_id
         _refresh_history_controls()
@@ -601,6 +840,7 @@ def main(page: ft.Page) -> None:
             redo_btn.tooltip = f"Redo: {history.peek_redo_label()} (Ctrl/Cmd+Y)"
         else:
             redo_btn.tooltip = "Redo (Ctrl/Cmd+Y)"
+        ui.invalidate("toolbar")
 
     def _select_neighbor(delta: int) -> None:
         selected_track = _track_obj(state.selected_track)
@@ -691,6 +931,8 @@ def main(page: ft.Page) -> None:
             trim_set_out_click(None)
         elif action == ACTION_EXPORT:
             export_click(None)
+        elif action == ACTION_DRAFT_RENDER:
+            draft_render_click(None)
         elif action == ACTION_IMPORT:
             import_click(None)
         elif action == ACTION_DUPLICATE:
@@ -768,12 +1010,17 @@ def main(page: ft.Page) -> None:
         page.show_dialog(dlg)
 
     def refresh_media() -> None:
+        ui.invalidate("media")
+
+    def _render_media() -> None:
         media_list.controls.clear()
         for it in state.media:
             icon = ft.Icons.MOVIE if it.has_video else ft.Icons.AUDIOTRACK
             tooltip = f"{Path(it.path).name}\n{_fmt_time(it.duration)}"
             if it.has_video and it.width and it.height:
                 tooltip += f"\n{it.width}x{it.height}"
+            if it.proxy_path:
+                tooltip += "\nProxy ready"
             media_list.controls.append(
                 ft.Draggable(
                     group="tl",
@@ -800,7 +1047,8 @@ def main(page: ft.Page) -> None:
                     ),
                 )
             )
-        page.update()
+
+    ui.register("media", _render_media)
 
     file_picker = ft.FilePicker()
     page.overlay.append(file_picker)
@@ -825,6 +1073,94 @@ def main(page: ft.Page) -> None:
         ".m4a",
     }
 
+    def _media_item_from_info(path: str, info) -> MediaItem:
+        return MediaItem(
+            path=path,
+            duration=info.duration,
+            has_video=info.has_video,
+            has_audio=info.has_audio,
+            width=info.width,
+            height=info.height,
+            fps=info.fps,
+            video_codec=info.video_codec,
+            audio_codec=info.audio_codec,
+            video_bitrate=info.video_bitrate,
+            audio_bitrate=info.audio_bitrate,
+            file_size_bytes=info.file_size_bytes,
+            pixel_format=info.pixel_format,
+            sample_rate=info.sample_rate,
+            channels=info.channels,
+        )
+
+    def _proxy_ready(src: str, proxy: Optional[str]) -> None:
+        """Worker callback: switch previews of `src` to its finished proxy."""
+        if not proxy:
+            return
+        proxy_map.register(src, proxy)
+
+        async def _apply() -> None:
+            for mi in state.media:
+                if mi.path == src:
+                    mi.proxy_path = proxy
+            refresh_media()
+            clip = _selected_clip()
+            if clip is not None and clip.src == src:
+                update_inspector()
+
+        page.run_task(_apply)
+
+    def _ensure_proxy(mi: MediaItem) -> None:
+        """Build (or pick up a cached) proxy in the background if `mi` is heavy."""
+        if not proxy_policy.needs_proxy(mi) or proxy_map.proxy_for(mi.path):
+            return
+        ffmpeg = _get_timeline_ffmpeg()
+        if not ffmpeg:
+            return
+        src = mi.path
+        proxy_loader.request(
+            ("proxy", src),
+            lambda: generate_proxy(ffmpeg, src, proxy_dir),
+            lambda proxy: _proxy_ready(src, proxy),
+            # Smaller files finish sooner, so more of the bin becomes light quickly.
+            priority=float(mi.file_size_bytes or 0),
+        )
+
+    async def _import_media_paths(paths: List[str], ffprobe: str) -> tuple[int, List[str]]:
+        """
+        Probe `paths` concurrently and add them to the Media Bin as results arrive.
+
+        Returns (added_count, failed_paths).
+        """
+        added = 0
+        failed: List[str] = []
+        results = probe_media_batch(ffprobe, paths)
+        last_refresh = 0.0
+        while True:
+            item = await asyncio.to_thread(next, results, None)
+            if item is None:
+                break
+            path, info, err = item
+            if err is not None or info is None:
+                log.warning("probe failed: %s (%s)", path, err)
+                failed.append(path)
+                continue
+            if info.duration <= 0.01:
+                continue
+            if any(m.path == path for m in state.media):
+                continue
+            mi = _media_item_from_info(path, info)
+            state.media.append(mi)
+            _ensure_proxy(mi)
+            added += 1
+            # Fill the Media Bin progressively without redrawing per file.
+            now = time.monotonic()
+            if now - last_refresh >= 0.25:
+                last_refresh = now
+                refresh_media()
+        if added:
+            refresh_media()
+        return added, failed
+
     def on_file_drop(e) -> None:
         files = getattr(e, "files", None) or []
         if not files:
@@ -835,7 +1171,7 @@ def main(page: ft.Page) -> None:
             return
         _, ffprobe = bins
 
-        added = 0
+        paths: List[str] = []
         for f in files:
             path = getattr(f, "path", None)
             if not path:
@@ -843,38 +1179,18 @@ def main(page: ft.Page) -> None:
             ext = Path(path).suffix.lower()
             if ext not in allowed_import_ext:
                 continue
-            if any(m.path == path for m in state.media):
+            if any(m.path == path for m in state.media) or path in paths:
                 continue
-            try:
-                info = probe_media(ffprobe, path)
-                if info.duration <= 0.01:
-                    continue
-                state.media.append(
-                    MediaItem(
-                        path=path,
-                        duration=info.duration,
-                        has_video=info.has_video,
-                        has_audio=info.has_audio,
-                        width=info.width,
-                        height=info.height,
-                        fps=info.fps,
-                        video_codec=info.video_codec,
-                        audio_codec=info.audio_codec,
-                        video_bitrate=info.video_bitrate,
-                        audio_bitrate=info.audio_bitrate,
-                        file_size_bytes=info.file_size_bytes,
-                        pixel_format=info.pixel_format,
-                        sample_rate=info.sample_rate,
-                        channels=info.channels,
-                    )
-                )
-                added += 1
-            except Exception as ex:
-                log.exception("probe failed: %s", ex)
+            paths.append(path)
+        if not paths:
+            return
 
-        if added:
-            snack(f"Imported {added} file(s)")
-            refresh_media()
+        async def _drop_import() -> None:
+            added, _failed = await _import_media_paths(paths, ffprobe)
+            if added:
+                snack(f"Imported {added} file(s)")
+
+        page.run_task(_drop_import)
 
     # Best-effort: Flet desktop supports dropping files from OS.
     page.on_drop = on_file_drop
@@ -915,8 +1231,12 @@ def main(page: ft.Page) -> None:
             snack(f"Project not found: {Path(opened_path).name}")
             return
         try:
+            recovered = has_journal(opened_path)
             state.project = load_project(opened_path)
             state.project_path = opened_path
+            journal = _project_journal()
+            if journal is not None:
+                journal.reset(snapshot_project(state.project))
             state.selected_clip_id = None
             state.selected_track = None
 
@@ -931,52 +1251,25 @@ def main(page: ft.Page) -> None:
 
             if sources and ffprobe_path:
                 async def _probe_sources() -> None:
-                    added = 0
-                    missing = 0
-                    for src in sources:
-                        p = Path(src)
-                        if not p.exists():
-                            missing += 1
-                            continue
-                        try:
-                            info = await asyncio.to_thread(probe_media, ffprobe_path, src)
-                            if info.duration <= 0.01:
-                                continue
-                            state.media.append(
-                                MediaItem(
-                                    path=src,
-                                    duration=info.duration,
-                                    has_video=info.has_video,
-                                    has_audio=info.has_audio,
-                                    width=info.width,
-                                    height=info.height,
-                                    fps=info.fps,
-                                    video_codec=info.video_codec,
-                                    audio_codec=info.audio_codec,
-                                    video_bitrate=info.video_bitrate,
-                                    audio_bitrate=info.audio_bitrate,
-                                    file_size_bytes=info.file_size_bytes,
-                                    pixel_format=info.pixel_format,
-                                    sample_rate=info.sample_rate,
-                                    channels=info.channels,
-                                )
-                            )
-                            added += 1
-                        except Exception:
-                            missing += 1
-                    if added:
-                        refresh_media()
+                    existing = [src for src in sources if Path(src).exists()]
+                    missing = len(sources) - len(existing)
+                    _added, failed = await _import_media_paths(existing, ffprobe_path)
+                    missing += len(failed)
                     if missing:
                         snack(f"Some media files could not be loaded ({missing})")
 
                 page.run_task(_probe_sources)
 
-            cfg.add_recent_project(opened_path)
-            cfg.set_last_project_dir(opened_path)
+            with cfg.batch():
+                cfg.add_recent_project(opened_path)
+                cfg.set_last_project_dir(opened_path)
             _mark_saved()
             _refresh_recent_menu()
 
-            snack(f"Opened: {Path(opened_path).name}")
+            if recovered:
+                snack(f"Opened: {Path(opened_path).name} (recovered autosaved edits)")
+            else:
+                snack(f"Opened: {Path(opened_path).name}")
             update_inspector()
             refresh_timeline()
         except Exception as ex:
@@ -985,7 +1278,7 @@ def main(page: ft.Page) -> None:
     def _clear_recent(_e=None) -> None:
         cfg.clear_recent_projects()
         _refresh_recent_menu()
-        page.update()
+        ui.invalidate("toolbar")
 
     def _refresh_recent_menu() -> None:
         items: List[ft.PopupMenuItem] = []
@@ -998,8 +1291,9 @@ def main(page: ft.Page) -> None:
             except Exception:
                 missing_paths.append(rp.path)
         if missing_paths:
-            for p in missing_paths:
-                cfg.remove_recent_project(p)
+            with cfg.batch():
+                for p in missing_paths:
+                    cfg.remove_recent_project(p)
             recents = cfg.recent_projects(limit=10)
 
         if not recents:
@@ -1132,12 +1426,7 @@ def main(page: ft.Page) -> None:
             trim_range_hint.value = (
                 f"Preview: {_fmt_time(start_sec)} -> {_fmt_time(end_sec)} (release to apply)."
             )
-        try:
-            trim_in.update()
-            trim_out.update()
-            trim_range_hint.update()
-        except Exception:
-            pass
+        ui.invalidate("inspector")
 
     def _trim_anchor_source_sec(clip) -> float:
         # Anchor trim helpers to the current split/playhead position inside the selected clip.
@@ -1197,7 +1486,9 @@ def main(page: ft.Page) -> None:
             min_piece_sec=trim_min_piece_sec,
         )
         if clips != before:
-            _history_record(f"Trim {clip.name}")
+            # Range-slider drags coalesce; typed trims and Set In/Out stay separate steps.
+            coalesce = ("trim", clip.id) if action_label == "Trim Slider" else None
+            _history_record(f"Trim {clip.name}", coalesce_key=coalesce)
             _set_track_clips(state.selected_track, clips)
             _mark_dirty()
             speed = _clip_speed(clip)
@@ -1350,7 +1641,7 @@ def main(page: ft.Page) -> None:
 
         if not changed:
             return False
-        _history_record(f"Transition {track.name}:{clip.name}")
+        _history_record(f"Transition {track.name}:{clip.name}", coalesce_key=("transition", track_id, clip.id))
         _set_track_clips(track_id, out)
         _mark_dirty()
         update_inspector()
@@ -1362,7 +1653,7 @@ def main(page: ft.Page) -> None:
             transition_dur_value.value = f"{float(e.control.value):.2f}s"
         except Exception:
             transition_dur_value.value = "-"
-        transition_dur_value.update()
+        ui.invalidate("inspector")
 
     def on_transition_kind_change(_e: ft.ControlEvent) -> None:
         k = str(transition_kind.value or "none").strip().lower()
@@ -1375,7 +1666,7 @@ def main(page: ft.Page) -> None:
                 transition_hint.value = f"Selected {k} ({float(transition_dur.value):.2f}s). Click Apply."
             except Exception:
                 transition_hint.value = f"Selected {k}. Click Apply."
-        transition_panel.update()
+        ui.invalidate("inspector")
 
     def transition_apply_click(_e=None) -> None:
         kind = str(transition_kind.value or "none")
@@ -1587,7 +1878,7 @@ def main(page: ft.Page) -> None:
         pos_sec = float(e.position) / 1000.0
         rel_sec = _source_abs_to_timeline_rel(clip, pos_sec)
         audio_pos.value = f"{_fmt_time(rel_sec)} / {_fmt_time(clip.dur)}"
-        audio_pos.update()
+        ui.invalidate("inspector")
 
         # Auto-stop at end of the selected audio clip.
         if e.position >= int(clip.out_sec * 1000) - 30:
@@ -1620,7 +1911,7 @@ def main(page: ft.Page) -> None:
 
         if not changed:
             return
-        _history_record(f"{label} {clip.name}")
+        _history_record(f"{label} {clip.name}", coalesce_key=("volume", clip.id) if muted is None else None)
         _set_track_clips(track, out)
         _mark_dirty()
         update_inspector()
@@ -1651,7 +1942,7 @@ def main(page: ft.Page) -> None:
             return
         if state.is_playing:
             stop_playback()
-        _history_record(f"{label} {clip.name}")
+        _history_record(f"{label} {clip.name}", coalesce_key=("speed", clip.id))
         _set_track_clips(track, out)
         _mark_dirty()
         update_inspector()
@@ -1663,7 +1954,7 @@ def main(page: ft.Page) -> None:
             speed_value.value = f"{val:.2f}x"
         except Exception:
             speed_value.value = "-"
-        speed_value.update()
+        ui.invalidate("inspector")
 
     def _apply_speed_value(raw_value: object, label: str = "Speed") -> None:
         clip = _selected_clip()
@@ -1694,7 +1985,7 @@ def main(page: ft.Page) -> None:
             volume_value.value = f"{float(e.control.value):.2f}x"
         except Exception:
             volume_value.value = "-"
-        volume_value.update()
+        ui.invalidate("inspector")
 
     def on_volume_change_end(e: ft.ControlEvent) -> None:
         clip = _selected_clip()
@@ -1776,6 +2067,8 @@ def main(page: ft.Page) -> None:
         clip = _selected_clip()
         if not clip:
             return
+        # A new preview source must reach the client before it can be seeked.
+        ui.flush()
         seek_sec = max(0.0, float(clip.in_sec))
         if state.playhead_clip_id == clip.id:
             clip_start = v_start_sec_map.get(clip.id, 0.0)
@@ -1828,109 +2121,63 @@ def main(page: ft.Page) -> None:
 
             page.run_task(_pause_video)
 
+    def _player_rel_sec(clip, pos_raw, expected_rel: float) -> Optional[float]:
+        """Timeline-relative seconds from a player position report, if usable."""
+        pos_sec: Optional[float] = None
+        if pos_raw is not None:
+            try:
+                if hasattr(pos_raw, "in_milliseconds"):
+                    pos_sec = max(0.0, float(pos_raw.in_milliseconds) / 1000.0)
+                elif isinstance(pos_raw, (int, float)):
+                    pos_sec = max(0.0, float(pos_raw) / 1000.0)
+                elif isinstance(pos_raw, str):
+                    pos_sec = _parse_time_input(pos_raw)
+            except Exception:
+                pos_sec = None
+        if pos_sec is None:
+            return None
+        # Backends may report timeline-relative, source-relative, or absolute source time.
+        candidates = [
+            max(0.0, min(clip.dur, pos_sec)),
+            _source_rel_to_timeline_rel(clip, pos_sec),
+            _source_abs_to_timeline_rel(clip, pos_sec),
+        ]
+        return min(candidates, key=lambda v: abs(v - expected_rel))
+
+    # The playhead ticks on a local predictive clock; the player is only asked
+    # for its position when the clock wants to resync (see PlaybackClock).
+    playhead_frame_sec = 1.0 / 20.0 if is_web else 1.0 / 30.0
+
     async def _playhead_loop(loop_id: int) -> None:
         nonlocal preview_video, playback_loop_id
-        last_tick = time.perf_counter()
-        stale_ticks = 0
-        anchor_clip_id: Optional[str] = None
-        anchor_base_rel = 0.0
-        clock_origin_wall = last_tick
-        clock_origin_rel = 0.0
-        startup_mode = True
-        startup_deadline = last_tick + 0.35
+        clock: Optional[PlaybackClock] = None
+        clock_clip_id: Optional[str] = None
         while state.is_playing and loop_id == playback_loop_id and preview_video and preview_video_src:
             clip = _selected_clip()
             if not clip or not _is_selected_video():
                 stop_playback()
                 break
             clip_start = v_start_sec_map.get(clip.id, 0.0)
-            prev_rel_sec = max(0.0, min(clip.dur, state.playhead_sec - clip_start))
-            now = time.perf_counter()
-            last_tick = now
-
-            # Re-anchor the wall-clock model when playback clip changes.
-            if anchor_clip_id != clip.id:
-                anchor_clip_id = clip.id
-                anchor_base_rel = prev_rel_sec
-                clock_origin_wall = now
-                clock_origin_rel = prev_rel_sec
-                startup_mode = True
-                startup_deadline = now + 0.35
-                stale_ticks = 0
-
-            expected_rel = max(
-                0.0,
-                min(clip.dur, clock_origin_rel + max(0.0, now - clock_origin_wall)),
-            )
+            now = time.monotonic()
 
-            try:
-                pos_raw = await preview_video.get_current_position()
-            except Exception:
-                pos_raw = None
-
-            if loop_id != playback_loop_id or not state.is_playing:
-                break
+            # Re-anchor the clock when the playing clip changes.
+            if clock is None or clock_clip_id != clip.id:
+                clock = PlaybackClock(clip.dur)
+                clock.start(max(0.0, min(clip.dur, state.playhead_sec - clip_start)), now)
+                clock_clip_id = clip.id
+            clock.duration = clip.dur
 
-            pos_sec: Optional[float] = None
-            if pos_raw is not None:
+            if clock.due(now):
                 try:
-                    if hasattr(pos_raw, "in_milliseconds"):
-                        pos_sec = max(0.0, float(pos_raw.in_milliseconds) / 1000.0)
-                    elif isinstance(pos_raw, (int, float)):
-                        pos_sec = max(0.0, float(pos_raw) / 1000.0)
-                    elif isinstance(pos_raw, str):
-                        pos_sec = _parse_time_input(pos_raw)
+                    pos_raw = await preview_video.get_current_position()
                 except Exception:
-                    pos_sec = None
-
-            rel_backend: Optional[float] = None
-            if pos_sec is not None:
-                # Backends may report timeline-relative, source-relative, or absolute source time.
-                candidates = [
-                    max(0.0, min(clip.dur, pos_sec)),
-                    _source_rel_to_timeline_rel(clip, pos_sec),
-                    _source_abs_to_timeline_rel(clip, pos_sec),
-                ]
-                rel_backend = min(candidates, key=lambda v: abs(v - expected_rel))
-
-            # Avoid racing ahead during startup while the media backend is still ramping up.
-            if startup_mode:
-                if rel_backend is not None and rel_backend > anchor_base_rel + 0.015:
-                    startup_mode = False
-                    clock_origin_wall = now
-                    clock_origin_rel = rel_backend
-                    expected_rel = rel_backend
-                elif now >= startup_deadline:
-                    startup_mode = False
-
-            if rel_backend is None:
-                # Keep UI moving by the wall-clock model when backend position is unavailable.
-                rel_sec = expected_rel
-                stale_ticks = 0
-            else:
-                # If backend time is stale/regressing, blend toward wall-clock progression.
-                if rel_backend <= prev_rel_sec + 0.001:
-                    stale_ticks += 1
-                else:
-                    stale_ticks = 0
-
-                # Clamp backend jitter so playhead pace stays close to 1:1 wall-clock timing.
-                max_trail_sec = 0.05
-                max_lead_sec = 0.12
-                lo = max(0.0, expected_rel - max_trail_sec)
-                hi = min(clip.dur, expected_rel + max_lead_sec)
-                rel_fused = min(hi, max(lo, rel_backend))
-
-                if stale_ticks >= 2:
-                    rel_sec = expected_rel
-                else:
-                    rel_sec = rel_fused
-
-            # Playback should be monotonic while actively running.
-            if (not startup_mode) and rel_sec < prev_rel_sec and prev_rel_sec < clip.dur - 0.02:
-                rel_sec = prev_rel_sec
+                    pos_raw = None
+                if loop_id != playback_loop_id or not state.is_playing:
+                    break
+                now = time.monotonic()
+                clock.sync(_player_rel_sec(clip, pos_raw, clock.position(now)), now)
 
-            rel_sec = max(0.0, min(clip.dur, rel_sec))
+            rel_sec = clock.position(now)
             state.playhead_clip_id = clip.id
             state.playhead_sec = clip_start + rel_sec
             update_playhead_ui()
@@ -1946,36 +2193,38 @@ def main(page: ft.Page) -> None:
             if rel_sec >= clip.dur - 0.02:
                 stop_playback()
                 break
-            await asyncio.sleep(0.08)
+            await asyncio.sleep(playhead_frame_sec)
 
     def _timeline_x_to_v1_position(x_px: float) -> tuple[Optional[str], float, float]:
         """
         Convert timeline X (same coordinate space as playhead_line center) to:
         (clip_id, global_sec_on_timeline_video, sec_from_clip_start).
         """
-        timeline_clips = _timeline_video_clips()
-        if not timeline_clips:
+        idx = _timeline_video_index()
+        if not len(idx):
             return None, 0.0, 0.0
 
         x = float(x_px)
-        first = timeline_clips[0]
+        first = idx.clips[0]
         first_start_px = v_start_px_map.get(first.id, 0.0)
         if x <= first_start_px:
-            return first.id, v_start_sec_map.get(first.id, 0.0), 0.0
+            return first.id, idx.starts[0], 0.0
 
-        for c in timeline_clips:
-            start_px = v_start_px_map.get(c.id, 0.0)
-            width_px = max(1.0, float(v_clip_width_px_map.get(c.id, max(1.0, c.dur * state.px_per_sec))))
-            end_px = start_px + width_px
-            start_sec = v_start_sec_map.get(c.id, 0.0)
-            if x <= end_px:
-                ratio = max(0.0, min(1.0, (x - start_px) / width_px))
-                rel_sec = c.dur * ratio
-                return c.id, start_sec + rel_sec, rel_sec
-
-        last = timeline_clips[-1]
-        last_start_sec = v_start_sec_map.get(last.id, 0.0)
-        return last.id, last_start_sec + last.dur, last.dur
+        if len(v_start_px_list) == len(idx):
+            i = max(0, bisect.bisect_right(v_start_px_list, x) - 1)
+        else:
+            i = len(idx) - 1
+            for j, c in enumerate(idx.clips):
+                if x <= v_start_px_map.get(c.id, 0.0) + v_clip_width_px_map.get(c.id, 0.0):
+                    i = j
+                    break
+        c = idx.clips[i]
+        dur = idx.dur_at(i)
+        start_px = v_start_px_map.get(c.id, 0.0)
+        width_px = max(1.0, float(v_clip_width_px_map.get(c.id, max(1.0, dur * state.px_per_sec))))
+        ratio = max(0.0, min(1.0, (x - start_px) / width_px))
+        rel_sec = dur * ratio
+        return c.id, idx.starts[i] + rel_sec, rel_sec
 
     def _set_playhead_from_timeline_x(x_px: float, from_drag: bool = False) -> bool:
         clip_id, global_sec, rel_sec = _timeline_x_to_v1_position(x_px)
@@ -2009,11 +2258,7 @@ def main(page: ft.Page) -> None:
 
         split_slider.value = rel_sec
         split_label.value = f"Split: {_fmt_time(rel_sec)}"
-        try:
-            split_slider.update()
-            split_label.update()
-        except Exception:
-            pass
+        ui.invalidate("inspector")
 
         update_playhead_ui()
         if not from_drag:
@@ -2024,19 +2269,24 @@ def main(page: ft.Page) -> None:
         if not v_start_sec_map:
             playhead_line.visible = False
             return
+        was_visible = bool(playhead_line.visible)
         playhead_line.visible = True
         sec = max(0.0, state.playhead_sec)
         px = None
-        timeline_clips = _timeline_video_clips()
-        for c in timeline_clips:
-            start_sec = v_start_sec_map.get(c.id, 0.0)
-            end_sec = start_sec + c.dur
+        idx = _timeline_video_index()
+        timeline_clips = idx.clips
+        # The playing clip keeps the playhead through transition overlaps.
+        pos = idx.position_of(state.playhead_clip_id) if state.playhead_clip_id else None
+        if pos is None or not (idx.starts[pos] <= sec <= idx.ends[pos]):
+            hit = idx.locate(sec)
+            pos = hit[0] if hit is not None else None
+        if pos is not None:
+            c = timeline_clips[pos]
+            dur = idx.dur_at(pos)
             start_px = v_start_px_map.get(c.id, 0.0)
-            width_px = max(1.0, float(v_clip_width_px_map.get(c.id, max(1.0, c.dur * state.px_per_sec))))
-            if sec >= start_sec and sec <= end_sec:
-                rel = 0.0 if c.dur <= 0 else (sec - start_sec) / c.dur
-                px = start_px + max(0.0, min(1.0, rel)) * width_px
-                break
+            width_px = max(1.0, float(v_clip_width_px_map.get(c.id, max(1.0, dur * state.px_per_sec))))
+            rel = 0.0 if dur <= 0 else (sec - idx.starts[pos]) / dur
+            px = start_px + max(0.0, min(1.0, rel)) * width_px
         if px is None:
             if timeline_clips:
                 first = timeline_clips[0]
@@ -2052,19 +2302,11 @@ def main(page: ft.Page) -> None:
                     px = last_px
             else:
                 px = 0.0
-        playhead_line.left = max(0.0, timeline_v1_left_offset + px - (playhead_handle_w / 2))
-        try:
-            playhead_line.update()
-        except Exception:
-            pass
-        try:
-            timeline_tracks_col.update()
-        except Exception:
-            pass
-        try:
-            page.update()
-        except Exception:
-            pass
+        left = round(max(0.0, timeline_v1_left_offset + px - (playhead_handle_w / 2)), 1)
+        if left != playhead_line.left or not was_visible:
+            # Only a moved playhead is worth a frame; playback ticks faster than it moves.
+            playhead_line.left = left
+            ui.invalidate("playhead")
 
     def _playhead_timeline_x() -> float:
         return max(0.0, float(playhead_line.left or 0.0) + (playhead_handle_w / 2) - timeline_v1_left_offset)
@@ -2217,28 +2459,7 @@ def main(page: ft.Page) -> None:
             if not is_web:
                 return src
             try:
-                src_path = Path(src)
-                if not src_path.exists():
-                    return None
-
-                st = src_path.stat()
-                key = f"{src_path.resolve()}|{st.st_mtime_ns}|{st.st_size}"
-                cached = web_preview_cache.get(key)
-                if cached:
-                    return cached
-
-                ext = (src_path.suffix or ".mp4").lower()
-                digest = hashlib.sha1(key.encode("utf-8", errors="ignore")).hexdigest()[:16]
-                rel = Path("_preview_cache") / f"{digest}{ext}"
-                dst = root / "assets" / rel
-                dst.parent.mkdir(parents=True, exist_ok=True)
-
-                if not dst.exists() or dst.stat().st_size != st.st_size:
-                    shutil.copy2(src_path, dst)
-
-                rel_web = str(rel).replace("\\", "/")
-                web_preview_cache[key] = rel_web
-                return rel_web
+                return _web_asset_url(src, "_preview_cache", web_preview_cache, ".mp4")
             except Exception as ex:
                 log.exception("prepare web preview failed: %s", ex)
                 return None
@@ -2298,7 +2519,7 @@ def main(page: ft.Page) -> None:
             preview_hint.value = "Preview (optional)"
             preview_hint_layer.visible = True
             update_playhead_ui()
-            page.update()
+            ui.invalidate("inspector")
             return
 
         prefix = f"[{_track_name(state.selected_track)}]"
@@ -2433,7 +2654,7 @@ def main(page: ft.Page) -> None:
             audio_controls.visible = False
             audio_pos.visible = False
             _stop_audio_to_clip_start()
-            preview_src = _prepare_web_preview_src(clip.src)
+            preview_src = _prepare_web_preview_src(proxy_map.media_src(clip.src))
             if preview_src:
                 if preview_video is None:
                     preview_video = ftv.Video(
@@ -2476,7 +2697,7 @@ def main(page: ft.Page) -> None:
         update_playhead_ui()
         if _is_selected_video() and preview_video_src:
             _run_sync_video_to_playhead(resume=False)
-        page.update()
+        ui.invalidate("inspector")
 
     def on_split_slider(e: ft.ControlEvent) -> None:
         try:
@@ -2500,7 +2721,7 @@ def main(page: ft.Page) -> None:
                 state.playhead_sec = snapped_global_sec
                 val = rel2
         split_label.value = f"Split: {_fmt_time(val)}"
-        split_label.update()
+        ui.invalidate("inspector")
         # Move playhead to match split slider position.
         clip = _selected_clip()
         if clip and state.selected_clip_id:
@@ -2579,10 +2800,6 @@ def main(page: ft.Page) -> None:
         except Exception:
             state.snap_threshold_px = 12.0
         snap_threshold_label.value = f"{int(round(state.snap_threshold_px))}px"
-        try:
-            snap_threshold_label.update()
-        except Exception:
-            pass
         refresh_timeline()
 
     snap_enable_sw.on_change = _on_snap_toggle
@@ -2591,7 +2808,15 @@ def main(page: ft.Page) -> None:
     snap_grid_dd.on_change = _on_snap_grid_step
     snap_threshold_slider.on_change = _on_snap_threshold
 
-    def clip_block(track_id: str, clip_id: str) -> ft.Control:
+    def _split_marker_px(clip, dur_px: int) -> Optional[float]:
+        if clip.dur <= 0:
+            return None
+        try:
+            return max(0.0, min(dur_px, (float(split_slider.value) / clip.dur) * dur_px))
+        except Exception:
+            return None
+
+    def clip_block(track_id: str, clip_id: str, visual_priority: float = 0.0) -> ft.Control:
         track = _track_obj(track_id)
         assert track is not None
         clip = _find_clip(track_id, clip_id)
@@ -2629,50 +2854,53 @@ def main(page: ft.Page) -> None:
             refresh_timeline()
 
         block_height = 28 if is_audio else 36
-        visual_src = _timeline_clip_visual_src(track_id, clip)
-        if visual_src:
-            overlay_tint = ft.Colors.AMBER_900 if selected else ft.Colors.BLACK54
-            label_bg = ft.Colors.AMBER_800 if selected else ft.Colors.BLACK54
-            cont = ft.Container(
-                width=dur_px,
-                height=block_height,
-                border_radius=8,
-                clip_behavior=ft.ClipBehavior.HARD_EDGE,
-                border=ft.Border.all(1, ft.Colors.AMBER_300 if selected else ft.Colors.WHITE24),
-                content=ft.Stack(
-                    controls=[
-                        ft.Image(src=visual_src, width=dur_px, height=block_height, fit=ft.ImageFit.COVER),
-                        ft.Container(width=dur_px, height=block_height, bgcolor=overlay_tint, opacity=0.30),
-                        ft.Container(
-                            width=dur_px,
-                            height=block_height,
-                            padding=6,
-                            alignment=ft.Alignment(-1, 0),
-                            bgcolor=label_bg,
-                            opacity=0.85,
-                            content=ft.Text(label, size=12, no_wrap=True),
-                        ),
-                    ],
-                    width=dur_px,
-                    height=block_height,
-                ),
-            )
+        # The plain clip color doubles as the placeholder until the visual loads.
+        visual_slot = ft.Container(
+            width=dur_px,
+            height=block_height,
+            bgcolor=ft.Colors.AMBER_600 if selected else color,
+        )
+        visual = _timeline_clip_visual(
+            track_id,
+            clip,
+            dur_px,
+            block_height,
+            priority=-1.0 if selected else visual_priority,
+        )
+        if visual is not None:
+            visual_slot.content = visual
         else:
-            cont = ft.Container(
+            timeline_visual_slots[f"{track_id}:{clip.id}"] = (track_id, clip, visual_slot, dur_px, block_height)
+        overlay_tint = ft.Colors.AMBER_900 if selected else ft.Colors.BLACK54
+        label_bg = ft.Colors.AMBER_800 if selected else ft.Colors.BLACK54
+        cont = ft.Container(
+            width=dur_px,
+            height=block_height,
+            border_radius=8,
+            clip_behavior=ft.ClipBehavior.HARD_EDGE,
+            border=ft.Border.all(1, ft.Colors.AMBER_300 if selected else ft.Colors.WHITE24),
+            content=ft.Stack(
+                controls=[
+                    visual_slot,
+                    ft.Container(width=dur_px, height=block_height, bgcolor=overlay_tint, opacity=0.30),
+                    ft.Container(
+                        width=dur_px,
+                        height=block_height,
+                        padding=6,
+                        alignment=ft.Alignment(-1, 0),
+                        bgcolor=label_bg,
+                        opacity=0.85,
+                        content=ft.Text(label, size=12, no_wrap=True),
+                    ),
+                ],
                 width=dur_px,
                 height=block_height,
-                padding=6,
-                border_radius=8,
-                bgcolor=ft.Colors.AMBER_600 if selected else color,
-                content=ft.Text(label, size=12, no_wrap=True),
-            )
+            ),
+        )
 
         stack_children = [cont]
-        if selected and clip.dur > 0:
-            try:
-                play_px = max(0.0, min(dur_px, (float(split_slider.value) / clip.dur) * dur_px))
-            except Exception:
-                play_px = None
+        if selected:
+            play_px = _split_marker_px(clip, dur_px)
             if play_px is not None:
                 stack_children.append(
                     ft.Container(
@@ -2701,239 +2929,425 @@ def main(page: ft.Page) -> None:
         )
         return draggable
 
-    def refresh_timeline() -> None:
-        timeline_tracks_col.controls.clear()
-        timeline_ruler_row.controls.clear()
-        v_start_sec_map.clear()
-        v_start_px_map.clear()
-        v_clip_width_px_map.clear()
+    def _insert_existing_clip(before, target_id: str, moving_clip):
+        out = []
+        inserted = False
+        for c in before:
+            if c.id == target_id and not inserted:
+                out.append(moving_clip)
+                inserted = True
+            out.append(c)
+        if not inserted:
+            out.append(moving_clip)
+        return out
 
-        snap_edges_cb.disabled = not bool(state.snap_enabled)
-        snap_grid_cb.disabled = not bool(state.snap_enabled)
-        snap_grid_dd.disabled = (not bool(state.snap_enabled)) or (not bool(state.snap_to_grid))
-        snap_threshold_slider.disabled = not bool(state.snap_enabled)
+    def handle_drop(track_id: str, target_clip_id: Optional[str], payload: dict) -> None:
+        track = _track_obj(track_id)
+        if track is None:
+            return
+        kind = payload.get("kind")
+        if kind == "media":
+            path = payload.get("path")
+            mi = next((m for m in state.media if m.path == path), None)
+            if not mi:
+                snack("ไม่พบ media")
+                return
+            if track.kind == "video" and not mi.has_video:
+                snack(f"No video stream (drop on {state.project.primary_audio_track().name} instead)")
+                return
+            if track.kind == "audio" and not mi.has_audio:
+                snack("No audio stream")
+                return
 
-        def _insert_existing_clip(before, target_id: str, moving_clip):
-            out = []
-            inserted = False
-            for c in before:
-                if c.id == target_id and not inserted:
-                    out.append(moving_clip)
-                    inserted = True
-                out.append(c)
-            if not inserted:
-                out.append(moving_clip)
-            return out
+            before = _track_clips(track_id)
+            if target_clip_id:
+                clips = insert_clip_before(before, target_clip_id, path, mi.duration, has_audio=mi.has_audio)
+            else:
+                clips = add_clip_end(before, path, mi.duration, has_audio=mi.has_audio)
+
+            if clips != before:
+                _history_record(f"Add {Path(path).name} to {track.name}")
+                _set_track_clips(track_id, clips)
+                _mark_dirty()
+        elif kind == "clip":
+            moving_id = payload.get("id")
+            moving_track = payload.get("track")
+            if not moving_id:
+                return
+            src_track = _track_obj(str(moving_track or ""))
+            if src_track is None:
+                return
+            if src_track.kind != track.kind:
+                snack("Cannot move clip between video and audio tracks")
+                return
 
-        def handle_drop(track_id: str, target_clip_id: Optional[str], payload: dict) -> None:
-            track = _track_obj(track_id)
-            if track is None:
+            src_before = _track_clips(src_track.id)
+            moving_clip = next((c for c in src_before if c.id == moving_id), None)
+            if moving_clip is None:
                 return
-            kind = payload.get("kind")
-            if kind == "media":
-                path = payload.get("path")
-                mi = next((m for m in state.media if m.path == path), None)
-                if not mi:
-                    snack("ไม่พบ media")
-                    return
-                if track.kind == "video" and not mi.has_video:
-                    snack(f"No video stream (drop on {state.project.primary_audio_track().name} instead)")
-                    return
-                if track.kind == "audio" and not mi.has_audio:
-                    snack("No audio stream")
-                    return
 
-                before = _track_clips(track_id)
+            if src_track.id == track_id:
                 if target_clip_id:
-                    clips = insert_clip_before(before, target_clip_id, path, mi.duration, has_audio=mi.has_audio)
+                    clips = move_clip_before(src_before, moving_id, target_clip_id)
                 else:
-                    clips = add_clip_end(before, path, mi.duration, has_audio=mi.has_audio)
+                    moving = None
+                    rest = []
+                    for c in src_before:
+                        if c.id == moving_id:
+                            moving = c
+                        else:
+                            rest.append(c)
+                    if moving is None:
+                        return
+                    clips = [*rest, moving]
 
-                if clips != before:
-                    _history_record(f"Add {Path(path).name} to {track.name}")
+                if clips != src_before:
+                    m = _find_clip(track_id, moving_id)
+                    name = m.name if m else moving_id
+                    _history_record(f"Move {name}")
                     _set_track_clips(track_id, clips)
                     _mark_dirty()
-            elif kind == "clip":
-                moving_id = payload.get("id")
-                moving_track = payload.get("track")
-                if not moving_id:
-                    return
-                src_track = _track_obj(str(moving_track or ""))
-                if src_track is None:
-                    return
-                if src_track.kind != track.kind:
-                    snack("Cannot move clip between video and audio tracks")
-                    return
+            else:
+                dst_before = _track_clips(track_id)
+                src_after = [c for c in src_before if c.id != moving_id]
+                dst_after = (
+                    _insert_existing_clip(dst_before, target_clip_id, moving_clip)
+                    if target_clip_id
+                    else [*dst_before, moving_clip]
+                )
+                if src_after != src_before or dst_after != dst_before:
+                    _history_record(f"Move {moving_clip.name} {src_track.name}->{track.name}")
+                    _set_track_clips(src_track.id, src_after)
+                    _set_track_clips(track_id, dst_after)
+                    state.selected_track = track_id
+                    state.selected_clip_id = moving_clip.id
+                    _mark_dirty()
+        refresh_timeline()
 
-                src_before = _track_clips(src_track.id)
-                moving_clip = next((c for c in src_before if c.id == moving_id), None)
-                if moving_clip is None:
-                    return
+    def _payload(e: ft.DragTargetEvent):
+        return getattr(getattr(e, "src", None), "data", None)
 
-                if src_track.id == track_id:
-                    if target_clip_id:
-                        clips = move_clip_before(src_before, moving_id, target_clip_id)
-                    else:
-                        moving = None
-                        rest = []
-                        for c in src_before:
-                            if c.id == moving_id:
-                                moving = c
-                            else:
-                                rest.append(c)
-                        if moving is None:
-                            return
-                        clips = [*rest, moving]
-
-                    if clips != src_before:
-                        m = _find_clip(track_id, moving_id)
-                        name = m.name if m else moving_id
-                        _history_record(f"Move {name}")
-                        _set_track_clips(track_id, clips)
-                        _mark_dirty()
-                else:
-                    dst_before = _track_clips(track_id)
-                    src_after = [c for c in src_before if c.id != moving_id]
-                    dst_after = (
-                        _insert_existing_clip(dst_before, target_clip_id, moving_clip)
-                        if target_clip_id
-                        else [*dst_before, moving_clip]
-                    )
-                    if src_after != src_before or dst_after != dst_before:
-                        _history_record(f"Move {moving_clip.name} {src_track.name}->{track.name}")
-                        _set_track_clips(src_track.id, src_after)
-                        _set_track_clips(track_id, dst_after)
-                        state.selected_track = track_id
-                        state.selected_clip_id = moving_clip.id
-                        _mark_dirty()
-            refresh_timeline()
+    def _end_drop(track_id: str, height: int) -> ft.DragTarget:
+        def on_drop_end(e: ft.DragTargetEvent) -> None:
+            payload = _payload(e)
+            if isinstance(payload, dict):
+                handle_drop(track_id, None, payload)
 
-        def _payload(e: ft.DragTargetEvent):
-            return getattr(getattr(e, "src", None), "data", None)
-
-        def _end_drop(track_id: str, height: int) -> ft.DragTarget:
-            def on_drop_end(e: ft.DragTargetEvent) -> None:
-                payload = _payload(e)
-                if isinstance(payload, dict):
-                    handle_drop(track_id, None, payload)
-
-            return ft.DragTarget(
-                group="tl",
-                on_accept=on_drop_end,
-                content=ft.Container(
-                    width=190,
-                    height=height,
-                    alignment=ft.Alignment(0, 0),
-                    border_radius=10,
-                    bgcolor=ft.Colors.BLUE_GREY_900,
-                    border=ft.Border.all(1, ft.Colors.WHITE24),
-                    content=ft.Text("Drop to append", size=12),
-                ),
-            )
+        return ft.DragTarget(
+            group="tl",
+            on_accept=on_drop_end,
+            content=ft.Container(
+                width=190,
+                height=height,
+                alignment=ft.Alignment(0, 0),
+                border_radius=10,
+                bgcolor=ft.Colors.BLUE_GREY_900,
+                border=ft.Border.all(1, ft.Colors.WHITE24),
+                content=ft.Text("Drop to append", size=12),
+            ),
+        )
 
-        primary_video_track_id = _timeline_video_track_id()
-        v_time = 0.0
-        v_px = 0.0
-        total_clip_count = 0
+    def _select_track_only(track_id: str) -> None:
+        if state.selected_track == track_id and state.selected_clip_id is None:
+            return
+        state.selected_track = track_id
+        state.selected_clip_id = None
+        update_inspector()
+        refresh_timeline()
 
-        tracks_to_render = [*state.project.video_tracks, *state.project.audio_tracks]
+    # Keyed render cache. A clip/track whose render key is unchanged keeps its
+    # controls, so a refresh only rebuilds what changed and Flet sends a small
+    # patch (selecting a clip rebuilds two blocks, not the whole timeline).
+    timeline_clip_controls: dict[tuple[str, str], tuple[tuple, ft.Control]] = {}
+    timeline_lane_controls: dict[str, dict] = {}
+    timeline_ruler_key: Optional[tuple] = None
+
+    # Viewport virtualization: each lane (and the ruler) only realizes the
+    # items that intersect its scroll window plus a margin; off-screen runs
+    # collapse into one spacer, and scrolling realizes more.
+    timeline_scroll_px: dict[str, float] = {}
+    timeline_viewport_px: float = 0.0
+    timeline_row_spacing = 6
+    timeline_drop_zone_w = 16
+    timeline_ruler_scroll_key = "__ruler__"
+
+    def _timeline_viewport() -> float:
+        if timeline_viewport_px > 0:
+            return timeline_viewport_px
+        try:
+            width = float(page.width or page.window.width or 1100)
+        except Exception:
+            width = 1100.0
+        return max(400.0, width - timeline_lane_label_w - timeline_lane_gap_w)
+
+    def _timeline_window(scroll_key: str) -> tuple[float, float]:
+        viewport = _timeline_viewport()
+        left = float(timeline_scroll_px.get(scroll_key, 0.0))
+        return left - viewport, left + 2 * viewport
+
+    def _clamp_timeline_scroll(scroll_key: str, extent_px: float) -> None:
+        """Keep a stored scroll offset inside the content after it shrank (zoom out, deletes)."""
+        left = timeline_scroll_px.get(scroll_key)
+        if left is None:
+            return
+        max_left = max(0.0, float(extent_px) - _timeline_viewport())
+        if left > max_left:
+            timeline_scroll_px[scroll_key] = max_left
 
-        def _select_track_only(track_id: str) -> None:
-            if state.selected_track == track_id and state.selected_clip_id is None:
-                return
-            state.selected_track = track_id
-            state.selected_clip_id = None
-            update_inspector()
-            refresh_timeline()
+    def _window_covers(window: Optional[tuple], pixels: float, viewport: float) -> bool:
+        return window is not None and window[0] <= pixels and pixels + viewport <= window[1]
 
-        for track in tracks_to_render:
-            row = ft.Row(spacing=6, scroll=ft.ScrollMode.AUTO)
-            total_clip_count += len(track.clips)
+    def _on_timeline_scroll(scroll_key: str, e) -> bool:
+        """Record the scroll position of a lane/ruler; False if the event is unreadable."""
+        nonlocal timeline_viewport_px
+        try:
+            pixels = float(e.pixels)
+            viewport = float(e.viewport_dimension or 0.0)
+        except Exception:
+            return False
+        timeline_scroll_px[scroll_key] = pixels
+        if viewport > 0:
+            timeline_viewport_px = viewport
+        return True
 
-            for c in track.clips:
-                def _make_on_accept(current_track_id: str, target_id: str):
-                    def _on_accept(e: ft.DragTargetEvent) -> None:
-                        payload = _payload(e)
-                        if isinstance(payload, dict):
-                            handle_drop(current_track_id, target_id, payload)
-                    return _on_accept
-
-                width = max(70, int(c.dur * state.px_per_sec))
-                block = clip_block(track.id, c.id)
-                drop_zone = ft.DragTarget(
-                    group="tl",
-                    on_accept=_make_on_accept(track.id, c.id),
-                    content=ft.Container(
-                        width=16,
-                        height=40 if track.kind == "video" else 34,
-                        bgcolor=ft.Colors.TRANSPARENT,
-                        border=ft.Border(left=ft.BorderSide(1, ft.Colors.WHITE12)),
+    def _clip_render_key(track, clip, width: int) -> tuple:
+        selected = state.selected_track == track.id and state.selected_clip_id == clip.id
+        marker = _split_marker_px(clip, width) if selected else None
+        # Clips are never mutated in place, so the object itself is a valid key.
+        return (clip, track.kind, width, selected, None if marker is None else round(marker, 1))
+
+    def _clip_lane_control(track, clip, width: int, visual_priority: float) -> ft.Control:
+        def _on_accept(e: ft.DragTargetEvent, current_track_id: str = track.id, target_id: str = clip.id) -> None:
+            payload = _payload(e)
+            if isinstance(payload, dict):
+                handle_drop(current_track_id, target_id, payload)
+
+        block = clip_block(track.id, clip.id, visual_priority=visual_priority)
+        drop_zone = ft.DragTarget(
+            group="tl",
+            on_accept=_on_accept,
+            content=ft.Container(
+                width=timeline_drop_zone_w,
+                height=40 if track.kind == "video" else 34,
+                bgcolor=ft.Colors.TRANSPARENT,
+                border=ft.Border(left=ft.BorderSide(1, ft.Colors.WHITE12)),
+            ),
+        )
+        return ft.Row(spacing=0, controls=[drop_zone, ft.Container(width=width, content=block)])
+
+    def _track_label_control(track) -> ft.Control:
+        badge = "V" if track.kind == "video" else "A"
+        label_body = ft.Container(
+            width=timeline_lane_label_w,
+            padding=ft.padding.only(top=4, right=4),
+            content=ft.Column(
+                [
+                    ft.Text(
+                        track.name,
+                        size=11,
+                        no_wrap=True,
+                        weight=ft.FontWeight.BOLD if state.selected_track == track.id else ft.FontWeight.W_500,
+                        color=ft.Colors.WHITE if track.visible else ft.Colors.WHITE54,
                     ),
-                )
-                row.controls.append(ft.Row(spacing=0, controls=[drop_zone, ft.Container(width=width, content=block)]))
-
-                if track.id == primary_video_track_id:
-                    v_start_sec_map[c.id] = v_time
-                    v_start_px_map[c.id] = v_px + 16  # clip starts after drop zone
-                    v_clip_width_px_map[c.id] = width
-                    v_time += c.dur
-                    v_px += 16 + width
-
-            row.controls.append(_end_drop(track.id, height=36 if track.kind == "video" else 28))
-
-            badge = "V" if track.kind == "video" else "A"
-            label_body = ft.Container(
-                width=timeline_lane_label_w,
-                padding=ft.padding.only(top=4, right=4),
-                content=ft.Column(
-                    [
-                        ft.Text(
-                            track.name,
-                            size=11,
-                            no_wrap=True,
-                            weight=ft.FontWeight.BOLD if state.selected_track == track.id else ft.FontWeight.W_500,
-                            color=ft.Colors.WHITE if track.visible else ft.Colors.WHITE54,
-                        ),
-                        ft.Text(
-                            f"{badge}{' M' if track.muted else ''}{' H' if not track.visible else ''}",
-                            size=10,
-                            color=ft.Colors.WHITE70 if track.visible else ft.Colors.WHITE38,
-                        ),
-                    ],
-                    spacing=1,
-                    tight=True,
-                ),
-            )
-            label = ft.GestureDetector(
-                mouse_cursor=ft.MouseCursor.CLICK,
-                on_tap_down=lambda _e, tid=track.id: _select_track_only(tid),
-                content=label_body,
-            )
-            timeline_tracks_col.controls.append(
-                ft.Row(
-                    [
-                        label,
-                        ft.Container(width=timeline_lane_gap_w),
-                        row,
-                    ],
-                    expand=True,
-                    spacing=0,
-                )
+                    ft.Text(
+                        f"{badge}{' M' if track.muted else ''}{' H' if not track.visible else ''}",
+                        size=10,
+                        color=ft.Colors.WHITE70 if track.visible else ft.Colors.WHITE38,
+                    ),
+                ],
+                spacing=1,
+                tight=True,
+            ),
+        )
+        return ft.GestureDetector(
+            mouse_cursor=ft.MouseCursor.CLICK,
+            on_tap_down=lambda _e, tid=track.id: _select_track_only(tid),
+            content=label_body,
+        )
+
+    def _on_lane_scroll(track_id: str, e) -> None:
+        if not _on_timeline_scroll(track_id, e):
+            return
+        lane = timeline_lane_controls.get(track_id)
+        track = _track_obj(track_id)
+        if lane is None or track is None:
+            return
+        if _window_covers(lane["window"], timeline_scroll_px[track_id], _timeline_viewport()):
+            _reprioritize_visuals()
+            return
+        _render_lane(track, lane)
+        _reprioritize_visuals()
+        try:
+            lane["row"].update()
+        except Exception:
+            pass
+
+    def _track_lane(track) -> dict:
+        lane = timeline_lane_controls.get(track.id)
+        if lane is None:
+            row = ft.Row(
+                spacing=timeline_row_spacing,
+                scroll=ft.ScrollMode.AUTO,
+                scroll_interval=50,
+                on_scroll=lambda e, tid=track.id: _on_lane_scroll(tid, e),
             )
+            height = 40 if track.kind == "video" else 34
+            lane = {
+                "row": row,
+                "end": _end_drop(track.id, height=36 if track.kind == "video" else 28),
+                "lead": ft.Container(width=0, height=height),
+                "tail": ft.Container(width=0, height=height),
+                "label_key": None,
+                "layout_key": None,
+                "layout": ([], [], []),
+                "pos": {},
+                "window": None,
+                "keys": set(),
+                "control": ft.Row([ft.Container(), ft.Container(width=timeline_lane_gap_w), row], expand=True, spacing=0),
+            }
+            timeline_lane_controls[track.id] = lane
+        label_key = (track.name, track.kind, bool(track.muted), bool(track.visible), state.selected_track == track.id)
+        if lane["label_key"] != label_key:
+            lane["label_key"] = label_key
+            lane["control"].controls[0] = _track_label_control(track)
+        return lane
+
+    def _lane_layout(track, lane: dict) -> tuple[List[float], List[float], List[int]]:
+        """Pixel starts/ends of each clip's lane control (drop zone + block) in the row."""
+        px_per_sec = float(state.px_per_sec)
+        cached = lane["layout_key"]
+        # Edits always assign a new clip list, so list identity tracks changes.
+        if cached is not None and cached[0] is track.clips and cached[1] == px_per_sec:
+            return lane["layout"]
+        starts: List[float] = []
+        ends: List[float] = []
+        widths: List[int] = []
+        pos: dict[str, tuple[float, float]] = {}
+        x = 0.0
+        for c in track.clips:
+            width = max(70, int(c.dur * px_per_sec))
+            starts.append(x)
+            pos[c.id] = (x, x + timeline_drop_zone_w + width)
+            x += timeline_drop_zone_w + width
+            ends.append(x)
+            widths.append(width)
+            x += timeline_row_spacing
+        lane["layout_key"] = (track.clips, px_per_sec)
+        lane["layout"] = (starts, ends, widths)
+        lane["pos"] = pos
+        return lane["layout"]
+
+    def _viewport_distance(track_id: str, start_px: float, end_px: float) -> float:
+        """Pixels between a laid-out clip and the lane's visible viewport (0 = on screen)."""
+        left = float(timeline_scroll_px.get(track_id, 0.0))
+        right = left + _timeline_viewport()
+        if end_px < left:
+            return left - end_px
+        if start_px > right:
+            return start_px - right
+        return 0.0
+
+    def _reprioritize_visuals() -> None:
+        """Re-rank queued filmstrip/peaks loads by distance of their clips from the viewport."""
+        best: dict[tuple, float] = {}
+        for track_id, clip, *_rest in list(timeline_visual_slots.values()):
+            lane = timeline_lane_controls.get(track_id)
+            span = lane["pos"].get(clip.id) if lane is not None else None
+            if span is None:
+                continue
+            if state.selected_track == track_id and state.selected_clip_id == clip.id:
+                priority = -1.0
+            else:
+                priority = _viewport_distance(track_id, *span)
+            key = ("strip" if _track_kind(track_id) == "video" else "peaks", clip.src)
+            best[key] = min(best.get(key, priority), priority)
+        # Sources with no realized placeholder left wait behind everything in view.
+        timeline_loader.reprioritize(best, default=float("inf"))
+
+    def _evict_clip_control(cache_key: tuple[str, str]) -> None:
+        timeline_clip_controls.pop(cache_key, None)
+        timeline_visual_slots.pop(f"{cache_key[0]}:{cache_key[1]}", None)
+
+    def _render_lane(track, lane: dict) -> None:
+        """Realize the clips of `track` that intersect its scroll window."""
+        starts, ends, widths = _lane_layout(track, lane)
+        _clamp_timeline_scroll(track.id, ends[-1] if ends else 0.0)
+        window = _timeline_window(track.id)
+        lo, hi = visible_span(starts, ends, window[0], window[1])
+        lane["window"] = window
+        lead, tail = span_spacers(starts, ends, lo, hi, timeline_row_spacing)
+
+        row_controls: List[ft.Control] = []
+        if lead > 0:
+            # The spacer stands in for clips [0, lo) and the gaps between them.
+            lane["lead"].width = lead
+            row_controls.append(lane["lead"])
+        keys = set()
+        for i in range(lo, hi):
+            c = track.clips[i]
+            width = widths[i]
+            cache_key = (track.id, c.id)
+            render_key = _clip_render_key(track, c, width)
+            cached = timeline_clip_controls.get(cache_key)
+            if cached is not None and cached[0] == render_key:
+                control = cached[1]
+            else:
+                timeline_visual_slots.pop(f"{track.id}:{c.id}", None)
+                # Nearest to the viewport loads first; `_reprioritize_visuals` re-ranks on scroll.
+                control = _clip_lane_control(track, c, width, visual_priority=_viewport_distance(track.id, starts[i], ends[i]))
+                timeline_clip_controls[cache_key] = (render_key, control)
+            keys.add(cache_key)
+            row_controls.append(control)
+        if tail > 0:
+            lane["tail"].width = tail
+            row_controls.append(lane["tail"])
+        row_controls.append(lane["end"])
+        lane["row"].controls = row_controls
+
+        for cache_key in lane["keys"] - keys:
+            _evict_clip_control(cache_key)
+        lane["keys"] = keys
+
+    def _on_ruler_scroll(e) -> None:
+        if not _on_timeline_scroll(timeline_ruler_scroll_key, e):
+            return
+        if timeline_ruler_key is not None and _window_covers(
+            timeline_ruler_key[-1], timeline_scroll_px[timeline_ruler_scroll_key], _timeline_viewport()
+        ):
+            return
+        _refresh_ruler(_timeline_video_total_sec())
+        try:
+            timeline_ruler_row.update()
+        except Exception:
+            pass
 
-        timeline_video_track = _timeline_video_track()
-        v_total = _fmt_time(total_duration(timeline_video_track.clips))
-        a_total = _fmt_time(total_duration(state.project.primary_audio_track().clips))
-        timeline_info.value = (
-            f"Tracks V:{len(state.project.video_tracks)} A:{len(state.project.audio_tracks)} "
-            f"| Clips:{total_clip_count} | {timeline_video_track.name}:{v_total} "
-            f"| {state.project.primary_audio_track().name}:{a_total}"
+    timeline_ruler_row.scroll_interval = 50
+    timeline_ruler_row.on_scroll = _on_ruler_scroll
+
+    def _ruler_mark(t: float, w: int) -> ft.Control:
+        return ft.Container(
+            width=w,
+            height=18,
+            border=ft.Border(left=ft.BorderSide(1, ft.Colors.WHITE24)),
+            alignment=ft.Alignment(-1, 0),
+            padding=ft.padding.only(left=2),
+            content=ft.Text(_fmt_time(t), size=9, color=ft.Colors.WHITE38),
         )
 
-        total_sec = _timeline_video_total_sec()
+    def _refresh_ruler(total_sec: float) -> None:
+        nonlocal timeline_ruler_key
         step = max(0.1, float(state.snap_grid_sec or 0.5))
+        _clamp_timeline_scroll(timeline_ruler_scroll_key, total_sec * float(state.px_per_sec))
+        window = _timeline_window(timeline_ruler_scroll_key)
+        key = (round(total_sec, 3), step, float(state.px_per_sec))
+        if timeline_ruler_key is not None and timeline_ruler_key[:-1] == key and _window_covers(
+            timeline_ruler_key[-1], timeline_scroll_px.get(timeline_ruler_scroll_key, 0.0), _timeline_viewport()
+        ):
+            return
+        timeline_ruler_key = (*key, window)
+        marks_out: List[ft.Control] = []
         if total_sec <= 0.0:
-            timeline_ruler_row.controls.append(
+            marks_out.append(
                 ft.Container(
                     width=220,
                     height=18,
@@ -2942,38 +3356,88 @@ def main(page: ft.Page) -> None:
                 )
             )
         else:
-            t = 0.0
-            max_marks = 500
-            marks = 0
-            while t <= total_sec + 1e-9 and marks < max_marks:
-                w = max(8, int(step * state.px_per_sec))
-                timeline_ruler_row.controls.append(
-                    ft.Container(
-                        width=w,
-                        height=18,
-                        border=ft.Border(left=ft.BorderSide(1, ft.Colors.WHITE24)),
-                        alignment=ft.Alignment(-1, 0),
-                        padding=ft.padding.only(left=2),
-                        content=ft.Text(_fmt_time(t), size=9, color=ft.Colors.WHITE38),
-                    )
-                )
-                t += step
-                marks += 1
+            w = max(8, int(step * state.px_per_sec))
+            marks = int(total_sec / step + 1e-9) + 1
+            # Marks are uniform, so the visible index range is direct arithmetic.
+            lo = max(0, min(marks, int(window[0] // w)))
+            hi = max(lo, min(marks, int(window[1] // w) + 1))
+            if lo > 0:
+                marks_out.append(ft.Container(width=lo * w, height=18))
+            for k in range(lo, hi):
+                marks_out.append(_ruler_mark(k * step, w))
+            if hi < marks:
+                marks_out.append(ft.Container(width=(marks - hi) * w, height=18))
             # Keep ruler aligned to at least end duration width.
             remaining = max(0, int(total_sec * state.px_per_sec) - int(marks * step * state.px_per_sec))
             if remaining > 0:
-                timeline_ruler_row.controls.append(
+                marks_out.append(
                     ft.Container(
                         width=remaining,
                         height=18,
                         border=ft.Border(left=ft.BorderSide(1, ft.Colors.WHITE24)),
                     )
                 )
+        timeline_ruler_row.controls = marks_out
+
+    def refresh_timeline() -> None:
+        _update_timeline_geometry()
+        update_playhead_ui()
+        ui.invalidate("timeline")
 
+    def _update_timeline_geometry() -> None:
+        """Playhead/razor geometry of the primary video track (every clip, realized or not)."""
         nonlocal timeline_total_sec
+        v_start_sec_map.clear()
+        v_start_px_map.clear()
+        v_clip_width_px_map.clear()
+        v_start_px_list.clear()
+        primary_index = _timeline_video_index()
+        v_px = 0.0
+        for c in primary_index.clips:
+            width = max(70, int(c.dur * state.px_per_sec))
+            v_start_sec_map[c.id] = primary_index.start_of(c.id) or 0.0
+            v_start_px_map[c.id] = v_px + 16  # clip starts after drop zone
+            v_start_px_list.append(v_px + 16)
+            v_clip_width_px_map[c.id] = width
+            v_px += 16 + width
         timeline_total_sec = _timeline_video_total_sec()
-        update_playhead_ui()
-        page.update()
+
+    def _render_timeline() -> None:
+        snap_edges_cb.disabled = not bool(state.snap_enabled)
+        snap_grid_cb.disabled = not bool(state.snap_enabled)
+        snap_grid_dd.disabled = (not bool(state.snap_enabled)) or (not bool(state.snap_to_grid))
+        snap_threshold_slider.disabled = not bool(state.snap_enabled)
+
+        total_clip_count = 0
+        tracks_to_render = [*state.project.video_tracks, *state.project.audio_tracks]
+        lanes: List[ft.Control] = []
+
+        for track in tracks_to_render:
+            lane = _track_lane(track)
+            total_clip_count += len(track.clips)
+            _render_lane(track, lane)
+            lanes.append(lane["control"])
+
+        timeline_tracks_col.controls = lanes
+        live_tracks = {t.id for t in tracks_to_render}
+        for track_id in [k for k in timeline_lane_controls if k not in live_tracks]:
+            for cache_key in timeline_lane_controls.pop(track_id)["keys"]:
+                _evict_clip_control(cache_key)
+            timeline_scroll_px.pop(track_id, None)
+        _reprioritize_visuals()
+
+        timeline_video_track = _timeline_video_track()
+        v_total = _fmt_time(_track_index(timeline_video_track).total)
+        a_total = _fmt_time(_track_index(state.project.primary_audio_track()).total)
+        timeline_info.value = (
+            f"Tracks V:{len(state.project.video_tracks)} A:{len(state.project.audio_tracks)} "
+            f"| Clips:{total_clip_count} | {timeline_video_track.name}:{v_total} "
+            f"| {state.project.primary_audio_track().name}:{a_total}"
+        )
+
+        _refresh_ruler(timeline_total_sec)
+
+    ui.register("timeline", _render_timeline)
 
     def add_video_track_click(_e=None) -> None:
         _history_record("Add video track")
@@ -3161,39 +3625,12 @@ def main(page: ft.Page) -> None:
                 return
             _, ffprobe = bins
 
-            for f in picked:
-                if not f.path:
-                    continue
-                if any(m.path == f.path for m in state.media):
-                    continue
-                try:
-                    info = probe_media(ffprobe, f.path)
-                    if info.duration <= 0.01:
-                        continue
-                    state.media.append(
-                        MediaItem(
-                            path=f.path,
-                            duration=info.duration,
-                            has_video=info.has_video,
-                            has_audio=info.has_audio,
-                            width=info.width,
-                            height=info.height,
-                            fps=info.fps,
-                            video_codec=info.video_codec,
-                            audio_codec=info.audio_codec,
-                            video_bitrate=info.video_bitrate,
-                            audio_bitrate=info.audio_bitrate,
-                            file_size_bytes=info.file_size_bytes,
-                            pixel_format=info.pixel_format,
-                            sample_rate=info.sample_rate,
-                            channels=info.channels,
-                        )
-                    )
-                except Exception as ex:
-                    log.exception("probe failed: %s", ex)
-                    snack(f"อ่านไฟล์ไม่สำเร็จ: {Path(f.path).name}")
-
-            refresh_media()
+            paths = [f.path for f in picked if f.path and not any(m.path == f.path for m in state.media)]
+            _added, failed = await _import_media_paths(paths, ffprobe)
+            if failed:
+                names = ", ".join(Path(p).name for p in failed[:3])
+                more = f" (+{len(failed) - 3})" if len(failed) > 3 else ""
+                snack(f"อ่านไฟล์ไม่สำเร็จ: {names}{more}")
 
         page.run_task(_pick)
 
@@ -3209,7 +3646,7 @@ def main(page: ft.Page) -> None:
             before = _track_clips(t.id)
             if not before:
                 continue
-            after, left_id, _msg = split_clip_at_timeline_sec(before, playhead_sec)
+            after, left_id, _msg = split_clip_at_timeline_sec(before, playhead_sec, index=_track_index(t))
             if after == before:
                 continue
 
@@ -3334,20 +3771,27 @@ def main(page: ft.Page) -> None:
         refresh_timeline()
 
     def save_click(_e):
-        try:
-            if not state.project_path:
-                save_as_click(_e)
-                return
-            path = state.project_path
-            save_project(state.project, path)
-            cfg.add_recent_project(path)
-            cfg.set_last_project_dir(path)
-            _mark_saved()
-            _refresh_recent_menu()
-            snack(f"Saved: {Path(path).name}")
-            page.update()
-        except Exception as ex:
-            snack(f"Save failed: {ex}")
+        if not state.project_path:
+            save_as_click(_e)
+            return
+        path = state.project_path
+        journal = _project_journal()
+        snap = snapshot_project(state.project, journal.last if journal is not None else None)
+
+        async def _save() -> None:
+            try:
+                # Explicit save compacts the autosave journal into the main file.
+                await asyncio.to_thread(journal.compact, snap)
+                with cfg.batch():
+                    cfg.add_recent_project(path)
+                    cfg.set_last_project_dir(path)
+                _mark_saved()
+                _refresh_recent_menu()
+                snack(f"Saved: {Path(path).name}")
+            except Exception as ex:
+                snack(f"Save failed: {ex}")
+
+        page.run_task(_save)
 
     def save_as_click(_e):
         async def _save_as() -> None:
@@ -3356,19 +3800,23 @@ def main(page: ft.Page) -> None:
                 file_name=default_name,
                 initial_directory=_initial_project_dir(),
                 file_type=ft.FilePickerFileType.CUSTOM,
-                allowed_extensions=["json"],
+                allowed_extensions=["json", "minicutz"],
             )
             if not out_path:
                 return
             try:
-                save_project(state.project, out_path)
+                snap = snapshot_project(state.project)
+                await asyncio.to_thread(save_project, project_from_snapshot(snap), out_path)
                 state.project_path = out_path
-                cfg.add_recent_project(out_path)
-                cfg.set_last_project_dir(out_path)
+                journal = _project_journal()
+                if journal is not None:
+                    journal.reset(snap)
+                with cfg.batch():
+                    cfg.add_recent_project(out_path)
+                    cfg.set_last_project_dir(out_path)
                 _mark_saved()
                 _refresh_recent_menu()
                 snack(f"Saved: {Path(out_path).name}")
-                page.update()
             except Exception as ex:
                 snack(f"Save failed: {ex}")
 
@@ -3380,7 +3828,7 @@ def main(page: ft.Page) -> None:
                 allow_multiple=False,
                 initial_directory=_initial_project_dir(),
                 file_type=ft.FilePickerFileType.CUSTOM,
-                allowed_extensions=["json"],
+                allowed_extensions=["json", "minicutz"],
             )
             if not picked or not picked[0].path:
                 return
@@ -3543,6 +3991,43 @@ def main(page: ft.Page) -> None:
                 ft.dropdown.Option(key="veryslow", text="veryslow"),
             ],
         )
+        smart_render_cb = ft.Checkbox(
+            label="Smart render (copy unchanged footage, re-encode only cuts)",
+            value=bool(state.export_smart_render),
+        )
+        parallel_cb = ft.Checkbox(
+            label=f"Parallel export ({os.cpu_count() or 1} CPU cores, splits at hard cuts)",
+            value=bool(state.export_parallel),
+        )
+        segment_cache_cb = ft.Checkbox(
+            label="Incremental export (re-encode only changed parts)",
+            value=bool(state.export_segment_cache),
+        )
+        segment_cache_info = ft.Text("", size=11, color=ft.Colors.WHITE70)
+
+        def _update_segment_cache_info() -> None:
+            used = segment_cache.size_bytes()
+            segment_cache_info.value = f"Cache {_fmt_bytes(used) if used else '0 B'} / {_fmt_bytes(segment_cache.max_bytes)}"
+
+        def _on_clear_segment_cache(_e: ft.ControlEvent) -> None:
+            if export_in_progress:
+                snack("Export is already running")
+                return
+            freed = segment_cache.clear()
+            _update_segment_cache_info()
+            segment_cache_info.update()
+            snack(f"Cleared export cache ({_fmt_bytes(freed) if freed else '0 B'})")
+
+        _update_segment_cache_info()
+        segment_cache_row = ft.Row(
+            [
+                segment_cache_cb,
+                segment_cache_info,
+                ft.TextButton("Clear", icon=ft.Icons.DELETE_SWEEP, on_click=_on_clear_segment_cache),
+            ],
+            spacing=6,
+            wrap=True,
+        )
         settings_hint = ft.Text("0x0 keeps original resolution", size=11, color=ft.Colors.WHITE70)
         settings_preview = ft.Text("", size=11, color=ft.Colors.WHITE70)
 
@@ -3718,6 +4203,9 @@ def main(page: ft.Page) -> None:
             if settings is None:
                 return
             state.export_settings = settings
+            state.export_smart_render = bool(smart_render_cb.value)
+            state.export_parallel = bool(parallel_cb.value)
+            state.export_segment_cache = bool(segment_cache_cb.value)
             try:
                 page.pop_dialog()
             except Exception:
@@ -3750,6 +4238,9 @@ def main(page: ft.Page) -> None:
                     ft.Row([video_codec_dd, audio_codec_dd, bitrate_tf], spacing=8, wrap=True),
                     ft.Row([encode_preset_dd, ft.Container(expand=True), crf_value], wrap=True),
                     crf_slider,
+                    smart_render_cb,
+                    parallel_cb,
+                    segment_cache_row,
                     settings_hint,
                     settings_preview,
                 ],
@@ -3806,6 +4297,9 @@ def main(page: ft.Page) -> None:
                 tracks = list(project_snapshot.tracks)
                 audio_mode = state.export_audio_mode
                 export_settings = ExportSettings.from_dict(settings.to_dict())
+                smart_render = bool(state.export_smart_render)
+                parallel_workers = (os.cpu_count() or 1) if state.export_parallel else 0
+                use_segment_cache = bool(state.export_segment_cache)
                 video_tracks_with_clips = [t for t in project_snapshot.video_tracks if t.clips]
                 visible_video_tracks = [t for t in video_tracks_with_clips if t.visible]
                 progress_track = (
@@ -3833,10 +4327,7 @@ def main(page: ft.Page) -> None:
                     cancel_btn.disabled = True
                     progress_label.value = "Cancelling export..."
                     progress_hint.value = "Waiting for ffmpeg to stop..."
-                    try:
-                        page.update()
-                    except Exception:
-                        pass
+                    ui.invalidate("progress")
 
                 cancel_btn.on_click = _request_cancel_export
                 export_dialog = ft.AlertDialog(
@@ -3885,10 +4376,7 @@ def main(page: ft.Page) -> None:
                         progress_bar.value = ratio
                         progress_label.value = f"Encoding... {pct}%"
                         progress_hint.value = f"{_fmt_time(current_for_ui)} / {_fmt_time(total_for_ui)}"
-                        try:
-                            page.update()
-                        except Exception:
-                            pass
+                        ui.invalidate("progress")
 
                     page.run_task(_apply)
 
@@ -3905,6 +4393,9 @@ def main(page: ft.Page) -> None:
                             on_progress=lambda current, total: _schedule_progress_update(current, total),
                             should_cancel=lambda: bool(cancel_requested),
                             tracks=tracks,
+                            smart_render=smart_render,
+                            parallel_workers=parallel_workers,
+                            segment_cache=segment_cache if use_segment_cache else None,
                         )
                         ok = True
                         cancelled = False
@@ -3942,6 +4433,77 @@ def main(page: ft.Page) -> None:
 
         _open_export_settings_dialog(_run_export_with_settings)
 
+    def _draft_render_range() -> tuple[float, float]:
+        clip = _selected_clip() if _is_selected_video() else None
+        if clip is not None and clip.id in v_start_sec_map:
+            start = v_start_sec_map[clip.id]
+            return start, start + float(clip.dur)
+        return state.playhead_sec - draft_render_pad_sec, state.playhead_sec + draft_render_pad_sec
+
+    def draft_render_click(_e) -> None:
+        nonlocal export_in_progress
+        if export_in_progress:
+            snack("Export is already running")
+            return
+        if not any(t.clips for t in state.project.video_tracks):
+            snack("Timeline is empty")
+            return
+        bins = get_bins()
+        if not bins:
+            return
+        ffmpeg, ffprobe = bins
+
+        project_snapshot = Project.from_dict(state.project.to_dict())
+        start_sec, end_sec = _draft_render_range()
+        audio_mode = state.export_audio_mode
+        base_settings = ExportSettings.from_dict(state.export_settings.to_dict())
+        # Keep only the latest draft; each render gets a fresh name so players never show a stale file.
+        shutil.rmtree(draft_dir, ignore_errors=True)
+        draft_dir.mkdir(parents=True, exist_ok=True)
+        out_path = str(draft_dir / f"draft_{int(time.time() * 1000)}.mp4")
+        export_in_progress = True
+        snack(f"Rendering draft {_fmt_time(max(0.0, start_sec))} - {_fmt_time(max(0.0, end_sec))}...")
+
+        def _do_render() -> None:
+            t0 = time.perf_counter()
+            try:
+                export_range_with_progress(
+                    ffmpeg,
+                    ffprobe,
+                    list(project_snapshot.v_clips),
+                    list(project_snapshot.a_clips),
+                    out_path,
+                    start_sec,
+                    end_sec,
+                    audio_mode=audio_mode,
+                    export_settings=base_settings,
+                    tracks=list(project_snapshot.tracks),
+                    draft=True,
+                )
+                err = ""
+            except Exception as ex:
+                log.exception("draft render failed: %s", ex)
+                err = str(ex)
+            took = time.perf_counter() - t0
+
+            async def _notify() -> None:
+                nonlocal export_in_progress
+                export_in_progress = False
+                if err:
+                    snack(f"Draft render failed: {err}")
+                    return
+                snack(f"Draft ready ({took:.1f}s): {out_path}")
+                try:
+                    opened = page.launch_url(Path(out_path).as_uri())
+                    if asyncio.iscoroutine(opened):
+                        await opened
+                except Exception:
+                    pass
+
+            page.run_task(_notify)
+
+        page.run_thread(_do_render)
+
     def on_audio_mode_change(e: ft.ControlEvent) -> None:
         state.export_audio_mode = str(e.control.value)
 
@@ -3980,6 +4542,12 @@ def main(page: ft.Page) -> None:
             recent_menu,
             ft.Container(expand=True),
             export_audio_mode,
+            ft.OutlinedButton(
+                "Draft",
+                icon=ft.Icons.PREVIEW,
+                tooltip="Fast low-res render of the selected clip or playhead +/-5s (Ctrl+Shift+E)",
+                on_click=draft_render_click,
+            ),
             ft.FilledButton("Export", icon=ft.Icons.OUTPUT, on_click=export_click),
         ],
         alignment=ft.MainAxisAlignment.START,
@@ -4266,7 +4834,7 @@ def main(page: ft.Page) -> None:
             for src in demo_files:
                 if any(m.path == str(src) for m in state.media):
                     continue
-                info = probe_media(ffprobe, str(src))
+                info = probe_media_cached(ffprobe, str(src))
                 state.media.append(
                     MediaItem(
                         path=str(src),
@@ -4446,16 +5014,27 @@ def main(page: ft.Page) -> None:
             if not state.dirty:
                 continue
             path = state.project_path
-            if not path:
+            journal = _project_journal()
+            if not path or journal is None:
                 continue
+            # Snapshot on the UI thread (cheap, shares clips); write in a worker.
+            snap = snapshot_project(state.project, journal.last)
+            _mark_saved()
             try:
-                save_project(state.project, path)
-                cfg.add_recent_project(path)
-                cfg.set_last_project_dir(path)
-                _mark_saved()
+                await asyncio.to_thread(journal.append, snap)
+                if journal.needs_compaction():
+                    await asyncio.to_thread(journal.compact, snap)
+
+                def _remember_project() -> None:
+                    with cfg.batch():
+                        cfg.add_recent_project(path)
+                        cfg.set_last_project_dir(path)
+
+                await asyncio.to_thread(_remember_project)
                 _refresh_recent_menu()
-                page.update()
+                ui.invalidate("toolbar")
             except Exception as ex:
+                _mark_dirty()
                 log.exception("auto-save failed: %s", ex)
                 snack(f"Auto-save failed: {ex}")
 
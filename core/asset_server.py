@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote, unquote
+
+_CHUNK = 256 * 1024
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def link_asset(src: Path, dst: Path) -> bool:
+    """
+    Expose `src` at `dst` without copying it (a hard link).
+
+    An existing `dst` that is already the same file is kept. Returns False
+    when the filesystem cannot link (different volume, FAT, permissions);
+    the caller then needs another way to serve the file.
+    """
+    try:
+        if dst.exists():
+            if os.path.samefile(src, dst):
+                return True
+            dst.unlink()
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        os.link(src, dst)
+        return True
+    except Exception:
+        return False
+
+
+def prune_asset_copies(bucket_dir: Path) -> int:
+    """
+    Delete files in `bucket_dir` that are plain copies rather than links.
+
+    Older builds copied every preview/thumbnail into `assets/`; those copies
+    have a single link and are never requested again under the current
+    naming. Linked files are kept. Returns bytes freed.
+    """
+    freed = 0
+    try:
+        files = [p for p in Path(bucket_dir).iterdir() if p.is_file()]
+    except Exception:
+        return 0
+    for p in files:
+        try:
+            st = p.stat()
+            if st.st_nlink <= 1:
+                p.unlink()
+                freed += st.st_size
+        except Exception:
+            pass
+    return freed
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Inclusive (start, end) for a single `Range: bytes=...` header.
+
+    Returns None when there is no (usable) header and the whole file should
+    be sent. Raises ValueError for a range that cannot be satisfied.
+    """
+    if not header:
+        return None
+    m = _RANGE_RE.match(header.strip())
+    if not m:
+        return None  # multi-range or other units: fall back to the whole file
+    first, last = m.group(1), m.group(2)
+    if not first and not last:
+        return None
+    if not first:
+        n = int(last)
+        if n <= 0:
+            raise ValueError("empty suffix range")
+        return max(0, size - n), size - 1
+    start = int(first)
+    end = size - 1 if not last else min(int(last), size - 1)
+    if start >= size or end < start:
+        raise ValueError("range not satisfiable")
+    return start, end
+
+
+class RangeFileServer:
+    """
+    Tiny HTTP server that streams registered local files with Range support.
+
+    Only files passed to `register` are reachable (by an opaque token), so it
+    is safe to run next to the app. The server starts on first use, on a
+    free port, in a daemon thread.
+
+    `host` is the bind address; URLs use `public_host`, which defaults to
+    `host` (or 127.0.0.1 when binding to all interfaces).
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, public_host: Optional[str] = None) -> None:
+        self.host = host
+        self.port = int(port)
+        if not public_host:
+            public_host = "127.0.0.1" if host in ("", "0.0.0.0", "::") else host
+        self.public_host = public_host
+        self._files: Dict[str, Path] = {}
+        self._lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, path: Path) -> str:
+        """URL that streams `path`."""
+        p = Path(path).resolve()
+        st = p.stat()
+        key = f"{p}|{st.st_mtime_ns}|{st.st_size}"
+        token = hashlib.sha1(key.encode("utf-8", errors="ignore")).hexdigest()[:20]
+        with self._lock:
+            self._files[token] = p
+            self._ensure_started()
+            port = self.port
+        host = f"[{self.public_host}]" if ":" in self.public_host else self.public_host
+        return f"http://{host}:{port}/{token}/{quote(p.name)}"
+
+    def lookup(self, token: str) -> Optional[Path]:
+        with self._lock:
+            return self._files.get(token)
+
+    def close(self) -> None:
+        with self._lock:
+            httpd, self._httpd = self._httpd, None
+        if httpd is not None:
+            httpd.shutdown()
+            httpd.server_close()
+
+    def _ensure_started(self) -> None:
+        if self._httpd is not None:
+            return
+        owner = self
+
+        class _Handler(_RangeHandler):
+            server_owner = owner
+
+        httpd = ThreadingHTTPServer((self.host, self.port), _Handler)
+        httpd.daemon_threads = True
+        self.port = int(httpd.server_address[1])
+        self._httpd = httpd
+        self._thread = threading.Thread(target=httpd.serve_forever, name="minicut-assets", daemon=True)
+        self._thread.start()
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    server_owner: RangeFileServer
+
+    def do_HEAD(self) -> None:
+        self._serve(send_body=False)
+
+    def do_GET(self) -> None:
+        self._serve(send_body=True)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def _serve(self, send_body: bool) -> None:
+        parts = [unquote(p) for p in self.path.split("?", 1)[0].split("/") if p]
+        path = self.server_owner.lookup(parts[0]) if parts else None
+        try:
+            size = path.stat().st_size if path is not None else -1
+        except OSError:
+            size = -1
+        if path is None or size < 0:
+            self.send_error(404)
+            return
+        try:
+            rng = parse_range(self.headers.get("Range"), size)
+        except ValueError:
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self._common_headers()
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        start, end = rng if rng is not None else (0, size - 1)
+        length = max(0, end - start + 1)
+        self.send_response(206 if rng is not None else 200)
+        self._common_headers()
+        self.send_header("Content-Type", mimetypes.guess_type(path.name)[0] or "application/octet-stream")
+        self.send_header("Content-Length", str(length))
+        if rng is not None:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.end_headers()
+        if not send_body or length <= 0:
+            return
+        try:
+            with path.open("rb") as f:
+                f.seek(start)
+                remaining = length
+                while remaining > 0:
+                    chunk = f.read(min(_CHUNK, remaining))
+                    if not chunk:
+                        break
+                    self.wfile.write(chunk)
+                    remaining -= len(chunk)
+        except (BrokenPipeError, ConnectionResetError):
+            # Players drop connections all the time when they seek.
+            pass
+
+    def _common_headers(self) -> None:
+        self.send_header("Accept-Ranges", "bytes")
+        # Flutter web fetches images with XHR, which needs CORS.
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Cache-Control", "no-cache")
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+@dataclass
+class _Job:
+    fn: Callable[[], Any]
+    priority: float
+    seq: int
+    callbacks: List[Callable[[Any], None]] = field(default_factory=list)
+    running: bool = False
+
+
+class PriorityLoader:
+    """
+    Small worker pool that runs keyed jobs, lowest priority value first.
+
+    Requests for a key that is already queued or running are merged: the new
+    callback is attached and the better priority kept, so identical work is
+    done once. Job errors produce a `None` result; callback errors are
+    swallowed. Callbacks run on the worker thread.
+    """
+
+    def __init__(self, workers: int = 2, name: str = "minicut-loader") -> None:
+        self.workers = max(1, int(workers))
+        self.name = name
+        self._cond = threading.Condition()
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._jobs: Dict[Hashable, _Job] = {}
+        self._seq = itertools.count()
+        self._threads: List[threading.Thread] = []
+        self._closed = False
+
+    def request(
+        self,
+        key: Hashable,
+        fn: Callable[[], Any],
+        on_done: Optional[Callable[[Any], None]] = None,
+        priority: float = 0.0,
+    ) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            job = self._jobs.get(key)
+            if job is None:
+                job = _Job(fn=fn, priority=float(priority), seq=next(self._seq))
+                self._jobs[key] = job
+                heapq.heappush(self._heap, (job.priority, job.seq, key))
+            elif not job.running and float(priority) < job.priority:
+                # Re-queue with the better priority; the old heap entry goes stale.
+                job.priority = float(priority)
+                job.seq = next(self._seq)
+                heapq.heappush(self._heap, (job.priority, job.seq, key))
+            if on_done is not None:
+                job.callbacks.append(on_done)
+            self._ensure_threads()
+            self._cond.notify()
+
+    def reprioritize(self, priorities: Dict[Hashable, float], default: Optional[float] = None) -> int:
+        """
+        Replace the priority of queued (not yet running) jobs.
+
+        Keys missing from `priorities` get `default`, or keep their priority
+        when it is None. Unlike `request`, this can also make a job wait
+        longer, e.g. when what it loads scrolled out of view. Returns the
+        number of jobs whose priority changed.
+        """
+        with self._cond:
+            changed = 0
+            for key, job in self._jobs.items():
+                if job.running:
+                    continue
+                new = priorities.get(key, default)
+                if new is None or float(new) == job.priority:
+                    continue
+                job.priority = float(new)
+                job.seq = next(self._seq)
+                changed += 1
+            if changed:
+                self._heap = [(job.priority, job.seq, key) for key, job in self._jobs.items() if not job.running]
+                heapq.heapify(self._heap)
+            return changed
+
+    def is_pending(self, key: Hashable) -> bool:
+        with self._cond:
+            return key in self._jobs
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._jobs)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._heap.clear()
+            self._jobs = {k: j for k, j in self._jobs.items() if j.running}
+            self._cond.notify_all()
+
+    def _ensure_threads(self) -> None:
+        self._threads = [t for t in self._threads if t.is_alive()]
+        while len(self._threads) < self.workers:
+            t = threading.Thread(target=self._worker, name=f"{self.name}-{len(self._threads)}", daemon=True)
+            self._threads.append(t)
+            t.start()
+
+    def _next_job(self) -> Optional[Tuple[Hashable, _Job]]:
+        with self._cond:
+            while True:
+                if self._closed:
+                    return None
+                while self._heap:
+                    _priority, seq, key = heapq.heappop(self._heap)
+                    job = self._jobs.get(key)
+                    if job is None or job.running or job.seq != seq:
+                        continue
+                    job.running = True
+                    return key, job
+                self._cond.wait()
+
+    def _worker(self) -> None:
+        while True:
+            item = self._next_job()
+            if item is None:
+                return
+            key, job = item
+            try:
+                result = job.fn()
+            except Exception:
+                result = None
+            with self._cond:
+                self._jobs.pop(key, None)
+                callbacks = list(job.callbacks)
+            for cb in callbacks:
+                try:
+                    cb(result)
+                except Exception:
+                    pass
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import copy
 import json
 import os
+import tempfile
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 
 def _now_iso() -> str:
@@ -40,11 +44,21 @@ class ConfigStore:
     Simple JSON config store.
 
     Default location: ~/.minicut/config.json
+
+    The parsed file is cached and only re-read when its mtime/size changes.
+    Writes are atomic; inside `batch()` they are deferred and merged into a
+    single write when the outermost batch exits. Safe to share between the
+    UI and worker threads.
     """
 
     def __init__(self, root_dir: Path) -> None:
         self.root_dir = Path(root_dir)
         self.path = self.root_dir / "config.json"
+        self._lock = threading.RLock()
+        self._cache: Optional[Dict[str, Any]] = None
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._dirty = False
+        self._batch_depth = 0
 
     @staticmethod
     def default() -> "ConfigStore":
@@ -52,6 +66,41 @@ class ConfigStore:
         return ConfigStore(Path.home() / ".minicut")
 
     def load(self) -> Dict[str, Any]:
+        with self._lock:
+            return copy.deepcopy(self._data())
+
+    def save(self, data: Dict[str, Any]) -> None:
+        with self._lock:
+            self._cache = copy.deepcopy(data)
+            self._dirty = True
+            if self._batch_depth == 0:
+                self._flush_locked()
+
+    @contextmanager
+    def batch(self) -> Iterator["ConfigStore"]:
+        """Group several updates into one write (other threads wait for the batch)."""
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if self._batch_depth == 0 and self._dirty:
+                    self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._dirty:
+                self._flush_locked()
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = self.path.stat()
+        except Exception:
+            return None
+        return (int(st.st_mtime_ns), int(st.st_size))
+
+    def _read(self) -> Dict[str, Any]:
         try:
             data = json.loads(self.path.read_text(encoding="utf-8"))
             if isinstance(data, dict):
@@ -63,9 +112,47 @@ class ConfigStore:
             return self.default_config()
         return self.default_config()
 
-    def save(self, data: Dict[str, Any]) -> None:
+    def _data(self) -> Dict[str, Any]:
+        """Cached config dict (caller holds the lock and must not keep it)."""
+        if self._dirty and self._cache is not None:
+            return self._cache
+        stamp = self._file_stamp()
+        if self._cache is None or stamp != self._stamp:
+            self._cache = self._read()
+            self._stamp = stamp
+        return self._cache
+
+    def _update(self, fn: Callable[[Dict[str, Any]], None]) -> None:
+        with self._lock:
+            cfg = copy.deepcopy(self._data())
+            fn(cfg)
+            if cfg != self._cache:
+                self.save(cfg)
+
+    def _flush_locked(self) -> None:
         self.root_dir.mkdir(parents=True, exist_ok=True)
-        self.path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        payload = json.dumps(self._cache, ensure_ascii=False, indent=2)
+        tmp_path: Optional[Path] = None
+        try:
+            with tempfile.NamedTemporaryFile(
+                mode="w",
+                encoding="utf-8",
+                delete=False,
+                dir=str(self.root_dir),
+                prefix=f".{self.path.name}.",
+                suffix=".tmp",
+            ) as fp:
+                tmp_path = Path(fp.name)
+                fp.write(payload)
+            os.replace(str(tmp_path), str(self.path))
+        finally:
+            if tmp_path and tmp_path.exists():
+                try:
+                    tmp_path.unlink()
+                except Exception:
+                    pass
+        self._stamp = self._file_stamp()
+        self._dirty = False
 
     def default_config(self) -> Dict[str, Any]:
         return {
@@ -76,8 +163,8 @@ class ConfigStore:
         }
 
     def auto_save_interval_sec(self) -> int:
-        cfg = self.load()
-        raw = cfg.get("auto_save_interval_sec", 60)
+        with self._lock:
+            raw = self._data().get("auto_save_interval_sec", 60)
         try:
             v = int(raw)
         except Exception:
@@ -86,8 +173,8 @@ class ConfigStore:
         return max(10, min(3600, v))
 
     def recent_projects(self, limit: int = 10) -> List[RecentProject]:
-        cfg = self.load()
-        items = cfg.get("recent", [])
+        with self._lock:
+            items = copy.deepcopy(self._data().get("recent", []))
         out: List[RecentProject] = []
         if isinstance(items, list):
             for it in items:
@@ -99,9 +186,10 @@ class ConfigStore:
         return out[: max(0, int(limit))]
 
     def clear_recent_projects(self) -> None:
-        cfg = self.load()
-        cfg["recent"] = []
-        self.save(cfg)
+        def _clear(cfg: Dict[str, Any]) -> None:
+            cfg["recent"] = []
+
+        self._update(_clear)
 
     def remove_recent_project(self, path: str) -> None:
         p = str(path).strip()
@@ -113,14 +201,15 @@ class ConfigStore:
             pass
         key = p.lower() if os.name == "nt" else p
 
-        cfg = self.load()
-        kept: List[RecentProject] = []
-        for rp in self.recent_projects(limit=50):
-            rp_key = rp.path.lower() if os.name == "nt" else rp.path
-            if rp_key != key:
-                kept.append(rp)
-        cfg["recent"] = [x.to_dict() for x in kept[:10]]
-        self.save(cfg)
+        def _remove(cfg: Dict[str, Any]) -> None:
+            kept: List[RecentProject] = []
+            for rp in self.recent_projects(limit=50):
+                rp_key = rp.path.lower() if os.name == "nt" else rp.path
+                if rp_key != key:
+                    kept.append(rp)
+            cfg["recent"] = [x.to_dict() for x in kept[:10]]
+
+        self._update(_remove)
 
     def add_recent_project(self, path: str, name: Optional[str] = None) -> None:
         p = str(path).strip()
@@ -136,18 +225,19 @@ class ConfigStore:
         # Case-insensitive compare on Windows.
         key = p.lower() if os.name == "nt" else p
 
-        cfg = self.load()
-        existing = self.recent_projects(limit=50)
-        kept: List[RecentProject] = []
-        for rp in existing:
-            rp_key = rp.path.lower() if os.name == "nt" else rp.path
-            if rp_key != key:
-                kept.append(rp)
+        def _add(cfg: Dict[str, Any]) -> None:
+            existing = self.recent_projects(limit=50)
+            kept: List[RecentProject] = []
+            for rp in existing:
+                rp_key = rp.path.lower() if os.name == "nt" else rp.path
+                if rp_key != key:
+                    kept.append(rp)
+
+            rp = RecentProject(path=p, name=name or Path(p).stem, last_opened=_now_iso())
+            recent = [rp, *kept][:10]
+            cfg["recent"] = [x.to_dict() for x in recent]
 
-        rp = RecentProject(path=p, name=name or Path(p).stem, last_opened=_now_iso())
-        recent = [rp, *kept][:10]
-        cfg["recent"] = [x.to_dict() for x in recent]
-        self.save(cfg)
+        self._update(_add)
 
     def _normalize_directory(self, value: str) -> str:
         raw = str(value or "").strip()
@@ -165,25 +255,29 @@ class ConfigStore:
         return ""
 
     def last_project_dir(self) -> str:
-        cfg = self.load()
-        return self._normalize_directory(str(cfg.get("last_project_dir", "")))
+        with self._lock:
+            raw = str(self._data().get("last_project_dir", ""))
+        return self._normalize_directory(raw)
 
     def set_last_project_dir(self, path_or_dir: str) -> None:
         normalized = self._normalize_directory(str(path_or_dir or ""))
         if not normalized:
             return
-        cfg = self.load()
-        cfg["last_project_dir"] = normalized
-        self.save(cfg)
+        def _set(cfg: Dict[str, Any]) -> None:
+            cfg["last_project_dir"] = normalized
+
+        self._update(_set)
 
     def last_export_dir(self) -> str:
-        cfg = self.load()
-        return self._normalize_directory(str(cfg.get("last_export_dir", "")))
+        with self._lock:
+            raw = str(self._data().get("last_export_dir", ""))
+        return self._normalize_directory(raw)
 
     def set_last_export_dir(self, path_or_dir: str) -> None:
         normalized = self._normalize_directory(str(path_or_dir or ""))
         if not normalized:
             return
-        cfg = self.load()
-        cfg["last_export_dir"] = normalized
-        self.save(cfg)
+        def _set(cfg: Dict[str, Any]) -> None:
+            cfg["last_export_dir"] = normalized
+
+        self._update(_set)
@@ -1,17 +1,29 @@
 from __future__ import annotations
 
+import bisect
+import hashlib
 import json
 import os
 import re
 import shutil
 import subprocess
-from dataclasses import dataclass
+import tempfile
+import threading
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from dataclasses import asdict, dataclass, replace
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from .model import Clip, ExportSettings, Track, normalize_speed, transition_overlap_sec
+from .media_cache import file_fingerprint
 from .timeline import total_duration
 
+if TYPE_CHECKING:
+    from .probe_cache import ProbeCache
+    from .proxy import ProxyMap
+    from .segment_cache import SegmentCache
+
 
 @dataclass(frozen=True)
 class MediaInfo:
@@ -209,6 +221,97 @@ def probe_media(ffprobe_path: str, src: str) -> MediaInfo:
     )
 
 
+# Process-wide probe cache shared by export builders and app import paths.
+_probe_cache: Optional["ProbeCache"] = None
+
+
+def set_probe_cache(cache: Optional["ProbeCache"]) -> None:
+    """Install (or remove with None) the cache used by `probe_media_cached`."""
+    global _probe_cache
+    _probe_cache = cache
+
+
+def probe_media_cached(ffprobe_path: str, src: str) -> MediaInfo:
+    """`probe_media` through the installed probe cache, if any."""
+    cache = _probe_cache
+    if cache is not None:
+        info = cache.get(src)
+        if info is not None:
+            return info
+    info = probe_media(ffprobe_path, src)
+    if cache is not None:
+        cache.put(src, info)
+    return info
+
+
+# Process-wide proxy mapping. Exports always read the original media, even
+# if a clip was pointed at a proxy file.
+_proxy_map: Optional["ProxyMap"] = None
+
+
+def set_proxy_map(proxies: Optional["ProxyMap"]) -> None:
+    """Install (or remove with None) the proxy mapping used to resolve export sources."""
+    global _proxy_map
+    _proxy_map = proxies
+
+
+def _export_originals(clips: List[Clip]) -> List[Clip]:
+    proxies = _proxy_map
+    if proxies is None or not len(proxies):
+        return clips
+    out: List[Clip] = []
+    for c in clips:
+        src = proxies.original_for(c.src)
+        out.append(c if src == c.src else replace(c, src=src))
+    return out
+
+
+def _export_original_tracks(tracks: Optional[List[Track]]) -> Optional[List[Track]]:
+    if tracks is None or _proxy_map is None:
+        return tracks
+    out: List[Track] = []
+    for t in tracks:
+        clips = _export_originals(list(t.clips))
+        if all(a is b for a, b in zip(clips, t.clips)):
+            out.append(t)
+        else:
+            out.append(Track(id=t.id, name=t.name, kind=t.kind, clips=clips, muted=t.muted, visible=t.visible))
+    return out
+
+
+def probe_media_batch(
+    ffprobe_path: str,
+    srcs: Iterable[str],
+    max_workers: Optional[int] = None,
+) -> Iterator[Tuple[str, Optional[MediaInfo], Optional[Exception]]]:
+    """
+    Probe many files concurrently, yielding `(src, info, error)` as each completes.
+
+    Results arrive in completion order. A failing file yields its exception
+    instead of aborting the batch. Probes go through `probe_media_cached`.
+    """
+    todo: List[str] = []
+    for src in srcs:
+        if src not in todo:
+            todo.append(src)
+    if not todo:
+        return
+
+    workers = max_workers if max_workers is not None else min(8, os.cpu_count() or 1)
+    pool = ThreadPoolExecutor(max_workers=max(1, min(int(workers), len(todo))))
+    try:
+        futures = {pool.submit(probe_media_cached, ffprobe_path, src): src for src in todo}
+        for fut in as_completed(futures):
+            src = futures[fut]
+            try:
+                yield src, fut.result(), None
+            except Exception as ex:
+                yield src, None, ex
+    finally:
+        # Consumers may stop early; don't wait for probes nobody will read.
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
 def parse_ffmpeg_progress_seconds(line: str) -> Optional[float]:
     """
     Parse FFmpeg progress seconds from a stderr/progress line.
@@ -278,18 +381,32 @@ def _atempo_chain_for_speed(speed: float) -> str:
     return ",".join(f"atempo={f:.6f}" for f in factors)
 
 
-def _video_segment_filter(input_idx: int, clip: Clip, out_label: str) -> str:
+def _clip_trim_range(clip: Clip, seeked: bool) -> Tuple[float, float]:
+    """
+    Trim window for a clip in its input's timebase.
+
+    Seeked inputs (`-ss`/`-t` on the input) already start at `clip.in_sec`, so
+    the window is relative to zero.
+    """
+    if seeked:
+        return 0.0, max(0.0, float(clip.out_sec) - float(clip.in_sec))
+    return clip.in_sec, clip.out_sec
+
+
+def _video_segment_filter(input_idx: int, clip: Clip, out_label: str, seeked: bool = False) -> str:
     speed = _clip_speed(clip)
+    start, end = _clip_trim_range(clip, seeked)
     return (
-        f"[{input_idx}:v]trim=start={clip.in_sec}:end={clip.out_sec},"
+        f"[{input_idx}:v]trim=start={start}:end={end},"
         f"{_video_setpts_for_speed(speed)}[{out_label}]"
     )
 
 
-def _audio_segment_filter(input_idx: int, clip: Clip, out_label: str, vol: float) -> str:
+def _audio_segment_filter(input_idx: int, clip: Clip, out_label: str, vol: float, seeked: bool = False) -> str:
     speed = _clip_speed(clip)
+    start, end = _clip_trim_range(clip, seeked)
     parts = [
-        f"[{input_idx}:a]atrim=start={clip.in_sec}:end={clip.out_sec}",
+        f"[{input_idx}:a]atrim=start={start}:end={end}",
         "asetpts=PTS-STARTPTS",
         "aformat=sample_rates=48000:channel_layouts=stereo",
     ]
@@ -300,6 +417,45 @@ def _audio_segment_filter(input_idx: int, clip: Clip, out_label: str, vol: float
     return ",".join(parts)
 
 
+class _ExportInputs:
+    """
+    Collect ffmpeg `-i` inputs for an export graph.
+
+    Default mode opens each unique source once and cuts segments with
+    trim/atrim. Input-seek mode opens one input per clip with accurate
+    `-ss`/`-t`, so decode cost follows the edited duration instead of how far
+    into the source a clip starts.
+    """
+
+    def __init__(self, input_seek: bool = False) -> None:
+        self.input_seek = bool(input_seek)
+        self._args: List[str] = []
+        self._src_to_idx: Dict[str, int] = {}
+        self._count = 0
+
+    def add_source(self, src: str) -> None:
+        """Register a whole source (no-op in input-seek mode)."""
+        if self.input_seek or src in self._src_to_idx:
+            return
+        self._src_to_idx[src] = self._count
+        self._count += 1
+        self._args += ["-i", src]
+
+    def for_clip(self, clip: Clip) -> int:
+        """Input index that carries `clip`; call once per clip segment."""
+        if not self.input_seek:
+            self.add_source(clip.src)
+            return self._src_to_idx[clip.src]
+        span = max(0.0, float(clip.out_sec) - float(clip.in_sec))
+        idx = self._count
+        self._count += 1
+        self._args += ["-ss", f"{float(clip.in_sec):.6f}", "-t", f"{span:.6f}", "-i", clip.src]
+        return idx
+
+    def args(self) -> List[str]:
+        return list(self._args)
+
+
 def _clip_has_audio(clip: Clip, source_info: Optional[MediaInfo] = None) -> bool:
     """
     Effective audio availability for a clip.
@@ -440,6 +596,46 @@ def _xfade_name(kind: str) -> str:
     return "fade"
 
 
+def _concat_segments(
+    parts: List[str],
+    video_segs: List[str],
+    audio_segs: Optional[List[str]],
+    out_v: str,
+    out_a: Optional[str],
+) -> Tuple[str, Optional[str]]:
+    """
+    Join segments with one flat `concat` node (video and audio interleaved).
+    """
+    if len(video_segs) == 1:
+        return video_segs[0], (audio_segs[0] if audio_segs else None)
+    if audio_segs is not None and out_a is not None:
+        pads = "".join(f"[{v}][{a}]" for v, a in zip(video_segs, audio_segs))
+        parts.append(f"{pads}concat=n={len(video_segs)}:v=1:a=1[{out_v}][{out_a}]")
+        return out_v, out_a
+    pads = "".join(f"[{v}]" for v in video_segs)
+    parts.append(f"{pads}concat=n={len(video_segs)}:v=1:a=0[{out_v}]")
+    return out_v, None
+
+
+def _split_trims(
+    parts: List[str],
+    label: str,
+    windows: List[Tuple[str, float, float]],
+    audio: bool,
+) -> None:
+    """Split one segment label into trimmed sub-segments `(out_label, start, end)`."""
+    split = "asplit" if audio else "split"
+    trim = "atrim" if audio else "trim"
+    setpts = "asetpts" if audio else "setpts"
+    if len(windows) == 1:
+        src_labels = [label]
+    else:
+        src_labels = [f"{label}_s{k}" for k in range(len(windows))]
+        parts.append(f"[{label}]{split}={len(windows)}{''.join(f'[{x}]' for x in src_labels)}")
+    for src, (out, start, end) in zip(src_labels, windows):
+        parts.append(f"[{src}]{trim}=start={start:.6f}:end={end:.6f},{setpts}=PTS-STARTPTS[{out}]")
+
+
 def _build_transition_chain(
     parts: List[str],
     clips: List[Clip],
@@ -448,6 +644,11 @@ def _build_transition_chain(
 ) -> Tuple[str, Optional[str], float]:
     """
     Build a mixed hard-cut/transition chain and return final labels plus duration.
+
+    Each clip is split into head/body/tail sub-trims; xfade/acrossfade only see
+    the overlap window of adjacent clips, and bodies plus transition pieces are
+    joined by one flat `concat`. Output labels derive from the input labels so
+    several tracks can share one graph.
     """
     if not clips:
         raise ValueError("Timeline ว่าง")
@@ -456,43 +657,134 @@ def _build_transition_chain(
     if audio_labels is not None and len(audio_labels) != len(clips):
         raise ValueError("audio labels mismatch")
 
-    curr_v = video_labels[0]
-    curr_a = audio_labels[0] if audio_labels else None
-    curr_total = float(clips[0].dur)
-
-    for i in range(1, len(clips)):
-        next_v = video_labels[i]
-        next_a = audio_labels[i] if audio_labels else None
-        overlap = transition_overlap_sec(clips[i - 1], clips[i])
+    eps = 1e-6
+    heads = [0.0] + [transition_overlap_sec(clips[i - 1], clips[i]) for i in range(1, len(clips))]
+    tails = [*heads[1:], 0.0]
+    if any(heads[i] + tails[i] > float(c.dur) - eps for i, c in enumerate(clips) if heads[i] > 0.0 or tails[i] > 0.0):
+        # In/out transitions overlap inside one clip; local windows cannot be
+        # separated, so chain through the accumulated timeline instead.
+        return _build_accumulated_chain(parts, clips, video_labels, audio_labels)
+
+    seq_v: List[str] = []
+    seq_a: Optional[List[str]] = [] if audio_labels else None
+    prev_tail_v = ""
+    prev_tail_a = ""
+    total = 0.0
+    for i, c in enumerate(clips):
+        dur = float(c.dur)
+        head = heads[i]
+        tail = tails[i]
+        total += dur - head
+        v = video_labels[i]
+        a = audio_labels[i] if audio_labels else None
+        if head <= 0.0 and tail <= 0.0:
+            seq_v.append(v)
+            if seq_a is not None and a is not None:
+                seq_a.append(a)
+            continue
 
-        if overlap > 0.0:
-            trans = getattr(clips[i], "transition_in", None)
+        v_windows: List[Tuple[str, float, float]] = []
+        a_windows: List[Tuple[str, float, float]] = []
+        body_start = head
+        body_end = dur - tail
+        if head > 0.0:
+            v_windows.append((f"{v}_h", 0.0, head))
+            if a is not None:
+                a_windows.append((f"{a}_h", 0.0, head))
+        has_body = body_end - body_start > eps
+        if has_body:
+            v_windows.append((f"{v}_b", body_start, body_end))
+            if a is not None:
+                a_windows.append((f"{a}_b", body_start, body_end))
+        if tail > 0.0:
+            v_windows.append((f"{v}_t", body_end, dur))
+            if a is not None:
+                a_windows.append((f"{a}_t", body_end, dur))
+        _split_trims(parts, v, v_windows, audio=False)
+        if a is not None:
+            _split_trims(parts, a, a_windows, audio=True)
+
+        if head > 0.0:
+            trans = getattr(c, "transition_in", None)
             xfade = _xfade_name(getattr(trans, "kind", "fade"))
-            out_v = f"vx{i}"
-            offset = max(0.0, curr_total - overlap)
+            out_v = f"{v}_x"
             parts.append(
-                f"[{curr_v}][{next_v}]xfade=transition={xfade}:duration={overlap:.6f}:offset={offset:.6f}[{out_v}]"
+                f"[{prev_tail_v}][{v}_h]xfade=transition={xfade}:duration={head:.6f}:offset=0.000000[{out_v}]"
             )
-            curr_v = out_v
+            seq_v.append(out_v)
+            if seq_a is not None and a is not None:
+                out_a = f"{a}_x"
+                parts.append(f"[{prev_tail_a}][{a}_h]acrossfade=d={head:.6f}[{out_a}]")
+                seq_a.append(out_a)
+        if has_body:
+            seq_v.append(f"{v}_b")
+            if seq_a is not None and a is not None:
+                seq_a.append(f"{a}_b")
+        if tail > 0.0:
+            prev_tail_v = f"{v}_t"
+            prev_tail_a = f"{a}_t" if a is not None else ""
+
+    out_v, out_a = _concat_segments(
+        parts,
+        seq_v,
+        seq_a,
+        f"{video_labels[-1]}_cat",
+        f"{audio_labels[-1]}_cat" if audio_labels else None,
+    )
+    return out_v, out_a, max(0.0, total)
 
-            if curr_a is not None and next_a is not None:
-                out_a = f"ax{i}"
-                parts.append(f"[{curr_a}][{next_a}]acrossfade=d={overlap:.6f}[{out_a}]")
-                curr_a = out_a
 
-            curr_total = curr_total + float(clips[i].dur) - overlap
-        else:
-            out_v = f"vc{i}"
-            parts.append(f"[{curr_v}][{next_v}]concat=n=2:v=1:a=0[{out_v}]")
-            curr_v = out_v
+def _build_accumulated_chain(
+    parts: List[str],
+    clips: List[Clip],
+    video_labels: List[str],
+    audio_labels: Optional[List[str]],
+) -> Tuple[str, Optional[str], float]:
+    """
+    Fallback chain that xfades each transition against the accumulated timeline.
 
-            if curr_a is not None and next_a is not None:
-                out_a = f"ac{i}"
-                parts.append(f"[{curr_a}][{next_a}]concat=n=2:v=0:a=1[{out_a}]")
-                curr_a = out_a
+    Consecutive hard cuts are still joined by a single N-way `concat` node.
+    """
+    run_v: List[str] = [video_labels[0]]
+    run_a: Optional[List[str]] = [audio_labels[0]] if audio_labels else None
+    curr_total = float(clips[0].dur)
 
+    def _flush(i: int) -> Tuple[str, Optional[str]]:
+        return _concat_segments(
+            parts,
+            run_v,
+            run_a,
+            f"{video_labels[i]}_cat",
+            f"{audio_labels[i]}_cat" if audio_labels else None,
+        )
+
+    for i in range(1, len(clips)):
+        overlap = transition_overlap_sec(clips[i - 1], clips[i])
+        if overlap <= 0.0:
+            run_v.append(video_labels[i])
+            if run_a is not None and audio_labels:
+                run_a.append(audio_labels[i])
             curr_total = curr_total + float(clips[i].dur)
+            continue
+
+        curr_v, curr_a = _flush(i - 1)
+        trans = getattr(clips[i], "transition_in", None)
+        xfade = _xfade_name(getattr(trans, "kind", "fade"))
+        out_v = f"{video_labels[i]}_x"
+        offset = max(0.0, curr_total - overlap)
+        parts.append(
+            f"[{curr_v}][{video_labels[i]}]xfade=transition={xfade}:duration={overlap:.6f}:offset={offset:.6f}[{out_v}]"
+        )
+        run_v = [out_v]
+
+        if curr_a is not None and audio_labels:
+            out_a = f"{audio_labels[i]}_x"
+            parts.append(f"[{curr_a}][{audio_labels[i]}]acrossfade=d={overlap:.6f}[{out_a}]")
+            run_a = [out_a]
+
+        curr_total = curr_total + float(clips[i].dur) - overlap
 
+    curr_v, curr_a = _flush(len(clips) - 1)
     return curr_v, curr_a, max(0.0, curr_total)
 
 
@@ -502,6 +794,7 @@ def build_export_command(
     out_path: str,
     export_settings: Optional[ExportSettings] = None,
     ffprobe_path: Optional[str] = None,
+    input_seek: bool = False,
 ) -> List[str]:
     """
     Build an ffmpeg command to concatenate trimmed segments.
@@ -509,27 +802,26 @@ def build_export_command(
     Legacy MVP export path.
     - If `ffprobe_path` is provided, source stream presence is verified and
       missing audio streams are replaced with generated silence.
+    - `input_seek=True` opens one seeked input per clip instead of one input
+      per unique source.
     """
     if not clips:
         raise ValueError("Timeline ว่าง")
 
-    # One input per unique source
     srcs: List[str] = []
-    src_to_idx: Dict[str, int] = {}
     for c in clips:
-        if c.src not in src_to_idx:
-            src_to_idx[c.src] = len(srcs)
+        if c.src not in srcs:
             srcs.append(c.src)
 
-    args: List[str] = [ffmpeg_path, "-y"]
+    inputs = _ExportInputs(input_seek=input_seek)
     for s in srcs:
-        args += ["-i", s]
+        inputs.add_source(s)
 
     infos: Dict[str, MediaInfo] = {}
     if ffprobe_path:
         for s in srcs:
             try:
-                infos[s] = probe_media(ffprobe_path, s)
+                infos[s] = probe_media_cached(ffprobe_path, s)
             except Exception:
                 # Preserve old behavior if probe fails for any source.
                 pass
@@ -538,13 +830,14 @@ def build_export_command(
     parts: List[str] = []
     v_labels: List[str] = []
     a_labels: List[str] = []
+    seeked = inputs.input_seek
     for i, c in enumerate(clips):
-        idx = src_to_idx[c.src]
+        idx = inputs.for_clip(c)
         v = f"v{i}"
         a = f"a{i}"
         v_labels.append(v)
         a_labels.append(a)
-        parts.append(_video_segment_filter(idx, c, v))
+        parts.append(_video_segment_filter(idx, c, v, seeked=seeked))
         vol = max(0.0, float(getattr(c, "volume", 1.0) or 1.0))
         muted = bool(getattr(c, "muted", False))
         has_audio = _clip_has_audio(c, infos.get(c.src))
@@ -554,7 +847,7 @@ def build_export_command(
                 f"atrim=start=0:end={c.dur},asetpts=PTS-STARTPTS[{a}]"
             )
         else:
-            parts.append(_audio_segment_filter(idx, c, a, vol))
+            parts.append(_audio_segment_filter(idx, c, a, vol, seeked=seeked))
     final_v, final_a, _total = _build_transition_chain(parts, clips, v_labels, a_labels)
     _append_final_video_filter(parts, final_v, settings)
     if final_a is None:
@@ -562,6 +855,7 @@ def build_export_command(
     parts.append(f"[{final_a}]asetpts=PTS-STARTPTS[a]")
     filter_complex = ";".join(parts)
 
+    args: List[str] = [ffmpeg_path, "-y", *inputs.args()]
     args += [
         "-filter_complex",
         filter_complex,
@@ -581,6 +875,7 @@ def export_timeline(
     out_path: str,
     export_settings: Optional[ExportSettings] = None,
     ffprobe_path: Optional[str] = None,
+    input_seek: bool = False,
 ) -> None:
     cmd = build_export_command(
         ffmpeg_path,
@@ -588,6 +883,7 @@ def export_timeline(
         out_path,
         export_settings=export_settings,
         ffprobe_path=ffprobe_path,
+        input_seek=input_seek,
     )
     subprocess.run(cmd, check=True)
 
@@ -599,6 +895,7 @@ def _build_export_command_tracks(
     out_path: str,
     audio_mode: str = "mix",
     export_settings: Optional[ExportSettings] = None,
+    input_seek: bool = False,
 ) -> List[str]:
     """
     Build command for project tracks (multiple video/audio tracks).
@@ -621,25 +918,24 @@ def _build_export_command_tracks(
     base_track = base_candidates[0]
 
     srcs: List[str] = []
-    src_to_idx: Dict[str, int] = {}
     for t in all_tracks:
         for c in t.clips:
-            if c.src not in src_to_idx:
-                src_to_idx[c.src] = len(srcs)
+            if c.src not in srcs:
                 srcs.append(c.src)
 
     infos: Dict[str, MediaInfo] = {}
     for s in srcs:
-        infos[s] = probe_media(ffprobe_path, s)
+        infos[s] = probe_media_cached(ffprobe_path, s)
 
     for t in video_tracks:
         for c in t.clips:
             if not infos[c.src].has_video:
                 raise ValueError(f"{t.name} requires video stream: {Path(c.src).name}")
 
-    args: List[str] = [ffmpeg_path, "-y"]
+    inputs = _ExportInputs(input_seek=input_seek)
     for s in srcs:
-        args += ["-i", s]
+        inputs.add_source(s)
+    seeked = inputs.input_seek
 
     parts: List[str] = []
     video_outputs: List[Tuple[Track, str, Optional[str], float]] = []
@@ -651,12 +947,12 @@ def _build_export_command_tracks(
         v_labels: List[str] = []
         a_labels: List[str] = []
         for i, c in enumerate(t.clips):
-            idx = src_to_idx[c.src]
+            idx = inputs.for_clip(c)
             v = f"tv{ti}_{i}"
             a = f"ta{ti}_{i}"
             v_labels.append(v)
             a_labels.append(a)
-            parts.append(_video_segment_filter(idx, c, v))
+            parts.append(_video_segment_filter(idx, c, v, seeked=seeked))
 
             vol = max(0.0, float(getattr(c, "volume", 1.0) or 1.0))
             muted = bool(getattr(c, "muted", False)) or bool(t.muted) or (not t.visible)
@@ -667,7 +963,7 @@ def _build_export_command_tracks(
                     f"atrim=start=0:end={c.dur},asetpts=PTS-STARTPTS[{a}]"
                 )
             else:
-                parts.append(_audio_segment_filter(idx, c, a, vol))
+                parts.append(_audio_segment_filter(idx, c, a, vol, seeked=seeked))
 
         out_v, out_a, t_dur = _build_transition_chain(parts, t.clips, v_labels, a_labels)
         video_outputs.append((t, out_v, out_a, t_dur))
@@ -693,7 +989,7 @@ def _build_export_command_tracks(
         segs: List[str] = []
         t_total = 0.0
         for i, c in enumerate(t.clips):
-            idx = src_to_idx[c.src]
+            idx = inputs.for_clip(c)
             a = f"au{ai}_{i}"
             vol = max(0.0, float(getattr(c, "volume", 1.0) or 1.0))
             muted = bool(getattr(c, "muted", False)) or bool(t.muted) or (not t.visible)
@@ -704,7 +1000,7 @@ def _build_export_command_tracks(
                     f"atrim=start=0:end={c.dur},asetpts=PTS-STARTPTS[{a}]"
                 )
             else:
-                parts.append(_audio_segment_filter(idx, c, a, vol))
+                parts.append(_audio_segment_filter(idx, c, a, vol, seeked=seeked))
             segs.append(f"[{a}]")
             t_total += float(c.dur)
 
@@ -749,6 +1045,7 @@ def _build_export_command_tracks(
             parts.append(f"{''.join(mix_inputs)}amix=inputs={len(mix_inputs)}:duration=first:dropout_transition=2[a]")
 
     filter_complex = ";".join(parts)
+    args: List[str] = [ffmpeg_path, "-y", *inputs.args()]
     args += [
         "-filter_complex",
         filter_complex,
@@ -771,6 +1068,7 @@ def build_export_command_project(
     audio_mode: str = "mix",  # "mix" | "a1_only" | "v1_only"
     export_settings: Optional[ExportSettings] = None,
     tracks: Optional[List[Track]] = None,
+    input_seek: bool = False,
 ) -> List[str]:
     """
     Build an ffmpeg command to export a project with separate V1/A1 tracks.
@@ -779,7 +1077,16 @@ def build_export_command_project(
     - V1 is a linear concat of trimmed segments (no gaps).
     - A1 is a linear concat of trimmed audio segments (no gaps).
     - Output duration follows V1 (video timeline).
+
+    `input_seek=True` opens one `-ss`/`-t` input per clip so long sources are
+    not decoded from zero for clips taken late in the file.
+
+    Clip sources that are registered proxies (see `set_proxy_map`) are
+    swapped back to their originals.
     """
+    v_clips = _export_originals(v_clips)
+    a_clips = _export_originals(a_clips)
+    tracks = _export_original_tracks(tracks)
     if tracks is not None:
         return _build_export_command_tracks(
             ffmpeg_path=ffmpeg_path,
@@ -788,32 +1095,32 @@ def build_export_command_project(
             out_path=out_path,
             audio_mode=audio_mode,
             export_settings=export_settings,
+            input_seek=input_seek,
         )
 
     if not v_clips:
         raise ValueError("V1 ว่าง")
 
-    # One input per unique source across both tracks
+    # One input per unique source across both tracks (or per clip when seeking)
     srcs: List[str] = []
-    src_to_idx: Dict[str, int] = {}
     for c in [*v_clips, *a_clips]:
-        if c.src not in src_to_idx:
-            src_to_idx[c.src] = len(srcs)
+        if c.src not in srcs:
             srcs.append(c.src)
 
     # Probe stream presence for each unique source
     infos: Dict[str, MediaInfo] = {}
     for s in srcs:
-        infos[s] = probe_media(ffprobe_path, s)
+        infos[s] = probe_media_cached(ffprobe_path, s)
 
     for c in v_clips:
         if not infos[c.src].has_video:
             raise ValueError(f"V1 ต้องเป็นไฟล์ที่มี video stream: {Path(c.src).name}")
 
     settings = _normalize_export_settings(export_settings)
-    args: List[str] = [ffmpeg_path, "-y"]
+    inputs = _ExportInputs(input_seek=input_seek)
     for s in srcs:
-        args += ["-i", s]
+        inputs.add_source(s)
+    seeked = inputs.input_seek
 
     parts: List[str] = []
 
@@ -822,10 +1129,10 @@ def build_export_command_project(
     v_video_labels: List[str] = []
     v_audio_labels: List[str] = []
     for i, c in enumerate(v_clips):
-        idx = src_to_idx[c.src]
+        idx = inputs.for_clip(c)
         v = f"v{i}"
         v_video_labels.append(v)
-        parts.append(_video_segment_filter(idx, c, v))
+        parts.append(_video_segment_filter(idx, c, v, seeked=seeked))
 
         if need_v1_audio:
             a = f"va{i}"
@@ -834,7 +1141,7 @@ def build_export_command_project(
             muted = bool(getattr(c, "muted", False))
             has_audio = _clip_has_audio(c, infos[c.src])
             if has_audio and not muted:
-                parts.append(_audio_segment_filter(idx, c, a, vol))
+                parts.append(_audio_segment_filter(idx, c, a, vol, seeked=seeked))
             else:
                 # Silence segment matching the clip duration.
                 parts.append(
@@ -858,7 +1165,7 @@ def build_export_command_project(
     if have_a1:
         a_seg_labels: List[str] = []
         for j, c in enumerate(a_clips):
-            idx = src_to_idx[c.src]
+            idx = inputs.for_clip(c)
             a = f"a{j}"
             vol = max(0.0, float(getattr(c, "volume", 1.0) or 1.0))
             muted = bool(getattr(c, "muted", False))
@@ -869,7 +1176,7 @@ def build_export_command_project(
                     f"atrim=start=0:end={c.dur},asetpts=PTS-STARTPTS[{a}]"
                 )
             else:
-                parts.append(_audio_segment_filter(idx, c, a, vol))
+                parts.append(_audio_segment_filter(idx, c, a, vol, seeked=seeked))
             a_seg_labels.append(f"[{a}]")
         parts.append(f"{''.join(a_seg_labels)}concat=n={len(a_clips)}:v=0:a=1[a_a1]")
 
@@ -895,6 +1202,7 @@ def build_export_command_project(
 
     filter_complex = ";".join(parts)
 
+    args: List[str] = [ffmpeg_path, "-y", *inputs.args()]
     args += [
         "-filter_complex",
         filter_complex,
@@ -917,6 +1225,7 @@ def export_project(
     audio_mode: str = "mix",
     export_settings: Optional[ExportSettings] = None,
     tracks: Optional[List[Track]] = None,
+    input_seek: bool = False,
 ) -> None:
     cmd = build_export_command_project(
         ffmpeg_path,
@@ -927,6 +1236,7 @@ def export_project(
         audio_mode=audio_mode,
         export_settings=export_settings,
         tracks=tracks,
+        input_seek=input_seek,
     )
     subprocess.run(cmd, check=True)
 
@@ -947,42 +1257,61 @@ def _export_total_duration(v_clips: List[Clip], tracks: Optional[List[Track]]) -
     return max(0.0, total_duration(v_clips))
 
 
-def export_project_with_progress(
-    ffmpeg_path: str,
-    ffprobe_path: str,
-    v_clips: List[Clip],
-    a_clips: List[Clip],
-    out_path: str,
-    audio_mode: str = "mix",
-    export_settings: Optional[ExportSettings] = None,
-    on_progress: Optional[Callable[[float, float], None]] = None,
-    should_cancel: Optional[Callable[[], bool]] = None,
-    tracks: Optional[List[Track]] = None,
-) -> None:
+class _ProgressReporter:
     """
-    Export project and report progress as (current_sec, total_sec).
+    Monotonic, throttled (current_sec, total_sec) reporting for exports.
 
-    `on_progress` is best-effort and called on the caller thread. It should be
-    lightweight and non-blocking.
+    Callback errors are swallowed; progress is best-effort UI feedback.
     """
-    cmd = build_export_command_project(
-        ffmpeg_path,
-        ffprobe_path,
-        v_clips,
-        a_clips,
-        out_path,
-        audio_mode=audio_mode,
-        export_settings=export_settings,
-        tracks=tracks,
-    )
 
-    total_sec = _export_total_duration(v_clips, tracks)
-    if on_progress:
+    def __init__(self, total_sec: float, on_progress: Optional[Callable[[float, float], None]]) -> None:
+        self.total_sec = max(0.0, float(total_sec))
+        self.on_progress = on_progress
+        self.last_reported = 0.0
+
+    def _emit(self, current_sec: float) -> None:
+        if not self.on_progress:
+            return
         try:
-            on_progress(0.0, total_sec)
+            self.on_progress(current_sec, self.total_sec)
         except Exception:
             pass
 
+    def start(self) -> None:
+        self._emit(0.0)
+
+    def update(self, sec: float) -> None:
+        current_sec = max(0.0, float(sec))
+        if self.total_sec > 0:
+            current_sec = min(self.total_sec, current_sec)
+
+        # Keep progress monotonic.
+        if current_sec + 1e-6 < self.last_reported:
+            return
+
+        should_emit = current_sec >= self.last_reported + 0.05
+        if self.total_sec > 0 and current_sec >= self.total_sec - 1e-6:
+            should_emit = True
+
+        if should_emit and self.on_progress:
+            self.last_reported = current_sec
+            self._emit(current_sec)
+
+    def finish(self) -> None:
+        self._emit(self.total_sec)
+
+
+def _run_ffmpeg_with_progress(
+    cmd: List[str],
+    on_seconds: Optional[Callable[[float], None]] = None,
+    should_cancel: Optional[Callable[[], bool]] = None,
+) -> None:
+    """
+    Run one ffmpeg command, feeding parsed output seconds to `on_seconds`.
+
+    Raises ExportCancelled when `should_cancel` fires and CalledProcessError on
+    a non-zero exit.
+    """
     # Ask FFmpeg to emit machine-readable progress lines.
     run_cmd = [*cmd[:-1], "-progress", "pipe:2", "-nostats", cmd[-1]]
     proc = subprocess.Popen(
@@ -995,7 +1324,6 @@ def export_project_with_progress(
         bufsize=1,
     )
 
-    last_reported = 0.0
     cancelled = False
 
     def _cancel_proc() -> None:
@@ -1026,25 +1354,8 @@ def export_project_with_progress(
             sec = parse_ffmpeg_progress_seconds(line)
             if sec is None:
                 continue
-
-            current_sec = max(0.0, sec)
-            if total_sec > 0:
-                current_sec = min(total_sec, current_sec)
-
-            # Keep progress monotonic.
-            if current_sec + 1e-6 < last_reported:
-                continue
-
-            should_emit = current_sec >= last_reported + 0.05
-            if total_sec > 0 and current_sec >= total_sec - 1e-6:
-                should_emit = True
-
-            if should_emit and on_progress:
-                last_reported = current_sec
-                try:
-                    on_progress(current_sec, total_sec)
-                except Exception:
-                    pass
+            if on_seconds:
+                on_seconds(sec)
 
     if cancelled:
         try:
@@ -1061,8 +1372,1060 @@ def export_project_with_progress(
     if ret != 0:
         raise subprocess.CalledProcessError(ret, run_cmd)
 
-    if on_progress:
+
+@dataclass(frozen=True)
+class SmartRenderPiece:
+    """
+    One output piece of a smart-render plan.
+
+    `copy=True` pieces are GOP-aligned and stream-copied; others are re-encoded.
+    """
+
+    src: str
+    start: float
+    end: float
+    copy: bool
+
+    @property
+    def dur(self) -> float:
+        return max(0.0, float(self.end) - float(self.start))
+
+
+# Source codec -> encoder that can produce concat-compatible boundary pieces.
+_SMART_RENDER_ENCODERS = {"h264": "libx264", "hevc": "libx265"}
+
+
+def probe_keyframes(ffprobe_path: str, src: str) -> List[float]:
+    """Return sorted keyframe timestamps (seconds) of the first video stream."""
+    cmd = [
+        ffprobe_path,
+        "-v",
+        "error",
+        "-select_streams",
+        "v:0",
+        "-show_entries",
+        "packet=pts_time,flags",
+        "-of",
+        "csv=print_section=0",
+        src,
+    ]
+    p = subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8", errors="replace", check=True)
+    out: List[float] = []
+    for line in (p.stdout or "").splitlines():
+        fields = line.strip().split(",")
+        if len(fields) < 2 or "K" not in fields[1]:
+            continue
         try:
-            on_progress(total_sec, total_sec)
-        except Exception:
-            pass
+            out.append(float(fields[0]))
+        except ValueError:
+            continue
+    return sorted(set(out))
+
+
+def smart_render_supported(
+    clips: List[Clip],
+    infos: Dict[str, MediaInfo],
+    export_settings: Optional[ExportSettings] = None,
+) -> bool:
+    """
+    True when `clips` can be smart-rendered without changing the output.
+
+    Requires plain hard cuts at 1.0x, untouched audio, and sources that share
+    codec parameters matching the export encoder (no scaling).
+    """
+    if not clips:
+        return False
+    settings = _normalize_export_settings(export_settings)
+    if settings.format not in ("mp4", "mov"):
+        return False
+
+    first = infos.get(clips[0].src)
+    if first is None or not first.has_video or not first.has_audio:
+        return False
+    if _SMART_RENDER_ENCODERS.get(first.video_codec) != settings.video_codec:
+        return False
+    if settings.width > 0 and (settings.width, settings.height) != (first.width, first.height):
+        return False
+    if first.audio_codec != "aac" or settings.audio_codec != "aac":
+        return False
+
+    prev: Optional[Clip] = None
+    for c in clips:
+        info = infos.get(c.src)
+        if info is None:
+            return False
+        if abs(_clip_speed(c) - 1.0) > 1e-9:
+            return False
+        if abs(max(0.0, float(getattr(c, "volume", 1.0) or 1.0)) - 1.0) > 1e-9:
+            return False
+        if bool(getattr(c, "muted", False)) or not _clip_has_audio(c, info):
+            return False
+        if prev is not None and transition_overlap_sec(prev, c) > 0.0:
+            return False
+        if (info.video_codec, info.width, info.height, info.pixel_format) != (
+            first.video_codec,
+            first.width,
+            first.height,
+            first.pixel_format,
+        ):
+            return False
+        if abs(float(info.fps) - float(first.fps)) > 1e-3:
+            return False
+        if (info.audio_codec, info.sample_rate, info.channels) != (
+            first.audio_codec,
+            first.sample_rate,
+            first.channels,
+        ):
+            return False
+        prev = c
+    return True
+
+
+def plan_smart_render(
+    clips: List[Clip],
+    keyframes: Dict[str, List[float]],
+    min_copy_sec: float = 1.0,
+) -> List[SmartRenderPiece]:
+    """
+    Split clips into re-encoded head/tail pieces and stream-copied interiors.
+
+    The interior runs from the first keyframe at/after `in_sec` to the last
+    keyframe at/before `out_sec`. Clips whose interior would be shorter than
+    `min_copy_sec` are re-encoded whole.
+    """
+    eps = 1e-3
+    pieces: List[SmartRenderPiece] = []
+    for c in clips:
+        start = float(c.in_sec)
+        end = float(c.out_sec)
+        kfs = keyframes.get(c.src) or []
+        i = bisect.bisect_left(kfs, start - eps)
+        j = bisect.bisect_right(kfs, end + eps) - 1
+        if i >= len(kfs) or j < 0 or j < i:
+            pieces.append(SmartRenderPiece(src=c.src, start=start, end=end, copy=False))
+            continue
+
+        k1 = max(start, kfs[i])
+        k2 = min(end, kfs[j])
+        if k2 - k1 < float(min_copy_sec):
+            pieces.append(SmartRenderPiece(src=c.src, start=start, end=end, copy=False))
+            continue
+
+        if k1 - start > eps:
+            pieces.append(SmartRenderPiece(src=c.src, start=start, end=k1, copy=False))
+        pieces.append(SmartRenderPiece(src=c.src, start=k1, end=k2, copy=True))
+        if end - k2 > eps:
+            pieces.append(SmartRenderPiece(src=c.src, start=k2, end=end, copy=False))
+    return pieces
+
+
+def _smart_render_piece_command(
+    ffmpeg_path: str,
+    piece: SmartRenderPiece,
+    info: MediaInfo,
+    settings: ExportSettings,
+    out_path: str,
+) -> List[str]:
+    args: List[str] = [
+        ffmpeg_path,
+        "-y",
+        "-ss",
+        f"{piece.start:.6f}",
+        "-i",
+        piece.src,
+        "-t",
+        f"{piece.dur:.6f}",
+        "-map",
+        "0:v:0",
+        "-map",
+        "0:a:0",
+    ]
+    if piece.copy:
+        args += ["-c", "copy", "-avoid_negative_ts", "make_zero"]
+    else:
+        # Boundary pieces must match the copied stream's parameters so the
+        # concat demuxer can join them without re-encoding.
+        args += [
+            "-c:v",
+            settings.video_codec,
+            "-crf",
+            str(settings.crf),
+            "-preset",
+            settings.preset,
+            "-pix_fmt",
+            info.pixel_format or "yuv420p",
+        ]
+        if info.fps > 0:
+            args += ["-r", f"{info.fps:.6f}"]
+        args += ["-c:a", "aac", "-b:a", settings.audio_bitrate]
+        if info.sample_rate > 0:
+            args += ["-ar", str(info.sample_rate)]
+        if info.channels > 0:
+            args += ["-ac", str(info.channels)]
+    # MPEG-TS carries codec headers in-band, so pieces with different encoder
+    # headers still join cleanly.
+    args += ["-f", "mpegts", out_path]
+    return args
+
+
+def _write_concat_list(paths: List[Path], list_path: Path) -> None:
+    lines = []
+    for p in paths:
+        escaped = str(Path(p).resolve()).replace("\\", "/").replace("'", "'\\''")
+        lines.append(f"file '{escaped}'")
+    list_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _concat_demuxer_command(
+    ffmpeg_path: str,
+    list_path: str,
+    out_path: str,
+    settings: ExportSettings,
+) -> List[str]:
+    args: List[str] = [
+        ffmpeg_path,
+        "-y",
+        "-f",
+        "concat",
+        "-safe",
+        "0",
+        "-i",
+        list_path,
+        "-c",
+        "copy",
+    ]
+    if settings.format in ("mp4", "mov"):
+        args += ["-bsf:a", "aac_adtstoasc", "-movflags", "+faststart"]
+    args += ["-f", settings.format, out_path]
+    return args
+
+
+def _smart_render_clips(
+    v_clips: List[Clip],
+    a_clips: List[Clip],
+    audio_mode: str,
+    tracks: Optional[List[Track]],
+) -> Optional[List[Clip]]:
+    """
+    Clips of the single audible video track when nothing else affects output.
+    """
+    if audio_mode not in ("mix", "v1_only"):
+        return None
+    if tracks is None:
+        if a_clips and audio_mode == "mix":
+            return None
+        return list(v_clips) or None
+
+    video = [t for t in tracks if isinstance(t, Track) and t.kind == "video" and t.clips]
+    audible = [
+        t for t in tracks if isinstance(t, Track) and t.kind == "audio" and t.clips and t.visible and not t.muted
+    ]
+    if len(video) != 1:
+        return None
+    base = video[0]
+    if not base.visible or base.muted:
+        return None
+    if audible and audio_mode == "mix":
+        return None
+    return list(base.clips)
+
+
+def _export_smart_render(
+    ffmpeg_path: str,
+    ffprobe_path: str,
+    clips: List[Clip],
+    infos: Dict[str, MediaInfo],
+    out_path: str,
+    settings: ExportSettings,
+    reporter: _ProgressReporter,
+    should_cancel: Optional[Callable[[], bool]],
+) -> None:
+    keyframes: Dict[str, List[float]] = {}
+    for c in clips:
+        if c.src not in keyframes:
+            keyframes[c.src] = probe_keyframes(ffprobe_path, c.src)
+    pieces = plan_smart_render(clips, keyframes)
+
+    out_dir = Path(out_path).resolve().parent
+    work_dir = Path(tempfile.mkdtemp(prefix=".minicut_smart_", dir=str(out_dir)))
+    try:
+        piece_paths: List[Path] = []
+        done = 0.0
+        for n, piece in enumerate(pieces):
+            piece_path = work_dir / f"piece_{n:05d}.ts"
+            cmd = _smart_render_piece_command(ffmpeg_path, piece, infos[piece.src], settings, str(piece_path))
+            base = done
+            _run_ffmpeg_with_progress(
+                cmd,
+                on_seconds=lambda sec, base=base, dur=piece.dur: reporter.update(base + min(dur, sec)),
+                should_cancel=should_cancel,
+            )
+            done += piece.dur
+            reporter.update(done)
+            piece_paths.append(piece_path)
+
+        list_path = work_dir / "concat.txt"
+        _write_concat_list(piece_paths, list_path)
+        _run_ffmpeg_with_progress(
+            _concat_demuxer_command(ffmpeg_path, str(list_path), out_path, settings),
+            should_cancel=should_cancel,
+        )
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _clip_timeline_spans(clips: List[Clip], with_transitions: bool = True) -> List[Tuple[float, float]]:
+    """(start, end) timeline seconds per clip, matching `_build_transition_chain`."""
+    spans: List[Tuple[float, float]] = []
+    end = 0.0
+    for i, c in enumerate(clips):
+        start = end
+        if with_transitions and i > 0:
+            start = max(0.0, end - transition_overlap_sec(clips[i - 1], c))
+        end = start + float(c.dur)
+        spans.append((start, end))
+    return spans
+
+
+def _slice_clips(
+    clips: List[Clip],
+    start_sec: float,
+    end_sec: float,
+    with_transitions: bool = True,
+) -> List[Clip]:
+    """
+    Trim a linear clip chain to the timeline window [start_sec, end_sec).
+
+    The first kept clip loses its `transition_in`; callers only cut where no
+    transition overlap straddles the window edges.
+    """
+    eps = 1e-6
+    out: List[Clip] = []
+    for c, (s, e) in zip(clips, _clip_timeline_spans(clips, with_transitions=with_transitions)):
+        if e <= start_sec + eps or s >= end_sec - eps:
+            continue
+        a = max(start_sec, s)
+        b = min(end_sec, e)
+        speed = _clip_speed(c)
+        nc = replace(
+            c,
+            in_sec=float(c.in_sec) + (a - s) * speed,
+            out_sec=float(c.in_sec) + (b - s) * speed,
+        )
+        if not out and nc.transition_in is not None:
+            nc = replace(nc, transition_in=None)
+        out.append(nc)
+    return out
+
+
+def _slice_tracks(tracks: List[Track], start_sec: float, end_sec: float) -> List[Track]:
+    return [
+        Track(
+            id=t.id,
+            name=t.name,
+            kind=t.kind,
+            clips=_slice_clips(t.clips, start_sec, end_sec, with_transitions=(t.kind == "video")),
+            muted=t.muted,
+            visible=t.visible,
+        )
+        for t in tracks
+    ]
+
+
+def _parallel_base_clips(v_clips: List[Clip], tracks: Optional[List[Track]]) -> Tuple[List[Clip], List[List[Clip]]]:
+    """Base video chain used for partitioning plus the other video chains."""
+    if tracks is None:
+        return list(v_clips), []
+    video = [t for t in tracks if isinstance(t, Track) and t.kind == "video" and t.clips]
+    visible = [t for t in video if t.visible]
+    if not visible:
+        return [], []
+    base = visible[0]
+    return list(base.clips), [list(t.clips) for t in video if t is not base]
+
+
+def _hard_cut_points(base_clips: List[Clip], other_video_chains: Optional[List[List[Clip]]] = None) -> List[float]:
+    """
+    Timeline seconds where the export can be split into independent pieces:
+    cuts of `base_clips` without a transition, outside any transition overlap
+    on `other_video_chains`.
+    """
+    spans = _clip_timeline_spans(base_clips)
+    return [spans[i][0] for i in _hard_cut_indices(base_clips, other_video_chains)]
+
+
+def _hard_cut_indices(base_clips: List[Clip], other_video_chains: Optional[List[List[Clip]]] = None) -> List[int]:
+    """Indices i of `base_clips` whose start is a `_hard_cut_points` cut."""
+    spans = _clip_timeline_spans(base_clips)
+    busy: List[Tuple[float, float]] = []
+    for chain in other_video_chains or []:
+        for i, (s, _e) in enumerate(_clip_timeline_spans(chain)):
+            if i == 0:
+                continue
+            overlap = transition_overlap_sec(chain[i - 1], chain[i])
+            if overlap > 0.0:
+                busy.append((s - 0.05, s + overlap + 0.05))
+
+    candidates: List[int] = []
+    for i in range(1, len(base_clips)):
+        if transition_overlap_sec(base_clips[i - 1], base_clips[i]) > 0.0:
+            continue
+        t = spans[i][0]
+        if any(a <= t <= b for a, b in busy):
+            continue
+        candidates.append(i)
+    return candidates
+
+
+def plan_parallel_chunks(
+    base_clips: List[Clip],
+    chunks: int,
+    other_video_chains: Optional[List[List[Clip]]] = None,
+    min_chunk_sec: float = 2.0,
+) -> List[Tuple[float, float]]:
+    """
+    Partition the timeline into up to `chunks` windows split at hard cuts.
+
+    Only cut points of `base_clips` without a transition are used, skipping any
+    that fall inside a transition overlap on `other_video_chains`.
+    """
+    spans = _clip_timeline_spans(base_clips)
+    total = spans[-1][1] if spans else 0.0
+    if chunks <= 1 or total <= 0.0:
+        return [(0.0, total)] if total > 0.0 else []
+
+    candidates = _hard_cut_points(base_clips, other_video_chains)
+    cuts: List[float] = []
+    last = 0.0
+    for k in range(1, int(chunks)):
+        target = total * k / float(chunks)
+        usable = [t for t in candidates if t >= last + min_chunk_sec and t <= total - min_chunk_sec]
+        if not usable:
+            break
+        best = min(usable, key=lambda t: abs(t - target))
+        if best in cuts:
+            continue
+        cuts.append(best)
+        last = best
+
+    edges = [0.0, *cuts, total]
+    return [(edges[i], edges[i + 1]) for i in range(len(edges) - 1)]
+
+
+def _render_commands(
+    cmds: List[List[str]],
+    durations: List[float],
+    workers: int,
+    reporter: _ProgressReporter,
+    should_cancel: Optional[Callable[[], bool]],
+    base_sec: float = 0.0,
+    on_rendered: Optional[Callable[[int], None]] = None,
+) -> None:
+    """
+    Run independent ffmpeg commands on up to `workers` threads.
+
+    Progress is `base_sec` plus the seconds done across commands. The first
+    failure stops the rest and is re-raised; cancellation raises
+    ExportCancelled. `on_rendered(n)` runs on the worker once command n
+    succeeded.
+    """
+    done_secs = [0.0] * len(cmds)
+    stop = threading.Event()
+
+    def _render(n: int) -> None:
+        if stop.is_set():
+            raise ExportCancelled("Export cancelled")
+
+        def _on_seconds(sec: float) -> None:
+            done_secs[n] = min(durations[n], max(0.0, sec))
+
+        _run_ffmpeg_with_progress(cmds[n], on_seconds=_on_seconds, should_cancel=stop.is_set)
+        done_secs[n] = durations[n]
+        if on_rendered is not None:
+            on_rendered(n)
+
+    error: Optional[BaseException] = None
+    cancelled = False
+    with ThreadPoolExecutor(max_workers=max(1, int(workers))) as pool:
+        pending = {pool.submit(_render, n) for n in range(len(cmds))}
+        while pending:
+            finished, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                exc = fut.exception()
+                if exc is not None and error is None and not isinstance(exc, ExportCancelled):
+                    # One failed piece dooms the export; stop the others.
+                    error = exc
+                    stop.set()
+            if should_cancel and not stop.is_set():
+                try:
+                    if bool(should_cancel()):
+                        cancelled = True
+                        stop.set()
+                except Exception:
+                    pass
+            reporter.update(base_sec + sum(done_secs))
+
+    if error is not None:
+        raise error
+    if cancelled:
+        raise ExportCancelled("Export cancelled")
+
+
+# Pieces joined by the concat demuxer (parallel chunks, cached segments) are
+# Matroska with PCM audio: per-piece AAC would add encoder priming/padding at
+# every join, so audio is encoded once in the final pass.
+_SEGMENT_EXT = "mkv"
+
+
+def _segment_encode_args(settings: ExportSettings) -> List[str]:
+    args = _build_output_encode_args(settings)
+    cut = args.index("-c:a")
+    return [*args[:cut], "-c:a", "pcm_s16le", "-f", "matroska"]
+
+
+def _as_segment_command(cmd: List[str], settings: ExportSettings) -> List[str]:
+    """Swap the output encode args of an export command for `_segment_encode_args`."""
+    tail = _build_output_encode_args(settings)
+    n = len(tail)
+    if cmd[-1 - n : -1] != tail:
+        raise ValueError("unexpected export command layout")
+    return [*cmd[: -1 - n], *_segment_encode_args(settings), cmd[-1]]
+
+
+def _segment_concat_command(ffmpeg_path: str, list_path: str, out_path: str, settings: ExportSettings) -> List[str]:
+    """Join `_segment_encode_args` pieces: copy the video, encode the PCM audio once."""
+    args: List[str] = [
+        ffmpeg_path,
+        "-y",
+        "-f",
+        "concat",
+        "-safe",
+        "0",
+        "-i",
+        list_path,
+        "-c:v",
+        "copy",
+        "-c:a",
+        settings.audio_codec,
+        "-b:a",
+        settings.audio_bitrate,
+    ]
+    if settings.format in ("mp4", "mov"):
+        args += ["-movflags", "+faststart"]
+    args += ["-f", settings.format, out_path]
+    return args
+
+
+def _export_parallel_chunks(
+    ffmpeg_path: str,
+    ffprobe_path: str,
+    v_clips: List[Clip],
+    a_clips: List[Clip],
+    windows: List[Tuple[float, float]],
+    out_path: str,
+    audio_mode: str,
+    settings: ExportSettings,
+    tracks: Optional[List[Track]],
+    workers: int,
+    reporter: _ProgressReporter,
+    should_cancel: Optional[Callable[[], bool]],
+) -> None:
+    out_dir = Path(out_path).resolve().parent
+    work_dir = Path(tempfile.mkdtemp(prefix=".minicut_parallel_", dir=str(out_dir)))
+    try:
+        chunk_paths: List[Path] = []
+        cmds: List[List[str]] = []
+        for n, (t0, t1) in enumerate(windows):
+            chunk_path = work_dir / f"chunk_{n:05d}.{_SEGMENT_EXT}"
+            chunk_paths.append(chunk_path)
+            # Per-clip seeked inputs keep late chunks from decoding sources from zero.
+            cmds.append(
+                _as_segment_command(
+                    build_export_command_project(
+                        ffmpeg_path,
+                        ffprobe_path,
+                        _slice_clips(v_clips, t0, t1),
+                        _slice_clips(a_clips, t0, t1, with_transitions=False),
+                        str(chunk_path),
+                        audio_mode=audio_mode,
+                        export_settings=settings,
+                        tracks=_slice_tracks(tracks, t0, t1) if tracks is not None else None,
+                        input_seek=True,
+                    ),
+                    settings,
+                )
+            )
+
+        _render_commands(cmds, [max(0.0, t1 - t0) for t0, t1 in windows], workers, reporter, should_cancel)
+
+        list_path = work_dir / "concat.txt"
+        _write_concat_list(chunk_paths, list_path)
+        _run_ffmpeg_with_progress(
+            _segment_concat_command(ffmpeg_path, str(list_path), out_path, settings),
+            should_cancel=should_cancel,
+        )
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+# Between short clips, roughly one hard cut in this many becomes a segment edge.
+_SEGMENT_CUT_SPREAD = 4
+
+
+def _clip_content_hash(clip: Clip) -> int:
+    sig = f"{clip.src}|{float(clip.in_sec):.6f}|{float(clip.out_sec):.6f}|{_clip_speed(clip)}"
+    return zlib.crc32(sig.encode("utf-8", errors="ignore"))
+
+
+def plan_segments(
+    base_clips: List[Clip],
+    other_video_chains: Optional[List[List[Clip]]] = None,
+    min_segment_sec: float = 2.0,
+) -> List[Tuple[float, float]]:
+    """
+    Split the timeline at hard cuts into cacheable segments.
+
+    Whether a hard cut becomes an edge depends only on the two clips that
+    meet there: it does when both last at least `min_segment_sec`, or when
+    the content hash of the clip after it selects it (about one cut in
+    `_SEGMENT_CUT_SPREAD`), which groups runs of short clips. An edit
+    therefore only regroups the segments around the edited clip; the
+    others keep their content and cache keys.
+    """
+    spans = _clip_timeline_spans(base_clips)
+    total = spans[-1][1] if spans else 0.0
+    if total <= 0.0:
+        return []
+    edges = [0.0]
+    for i in _hard_cut_indices(base_clips, other_video_chains):
+        prev, nxt = base_clips[i - 1], base_clips[i]
+        long_pair = float(prev.dur) >= min_segment_sec and float(nxt.dur) >= min_segment_sec
+        if long_pair or _clip_content_hash(nxt) % _SEGMENT_CUT_SPREAD == 0:
+            edges.append(spans[i][0])
+    edges.append(total)
+    return [(edges[k], edges[k + 1]) for k in range(len(edges) - 1)]
+
+
+_SEGMENT_KEY_VERSION = 2
+def _segment_key(
+    v_clips: List[Clip],
+    a_clips: List[Clip],
+    tracks: Optional[List[Track]],
+    audio_mode: str,
+    settings: ExportSettings,
+    fingerprints: Dict[str, str],
+) -> str:
+    """
+    Content hash of one sliced segment: source fingerprints, trims, speed,
+    volume, transitions and export settings. Clip ids and the segment's
+    timeline position are left out, so moving an unchanged stretch keeps it.
+    """
+
+    def _src(src: str) -> str:
+        fp = fingerprints.get(src)
+        if fp is None:
+            fp = file_fingerprint(Path(src)) or src
+            fingerprints[src] = fp
+        return fp
+
+    def _clips(clips: List[Clip]) -> List[List[object]]:
+        return [
+            [
+                _src(c.src),
+                round(float(c.in_sec), 6),
+                round(float(c.out_sec), 6),
+                _clip_speed(c),
+                round(float(c.volume), 6),
+                bool(c.muted),
+                bool(c.has_audio),
+                [c.transition_in.kind, round(float(c.transition_in.duration), 6)] if c.transition_in is not None else None,
+            ]
+            for c in clips
+        ]
+
+    payload: Dict[str, object] = {
+        "v": _SEGMENT_KEY_VERSION,
+        "audio_mode": audio_mode,
+        "settings": asdict(settings),
+    }
+    if tracks is None:
+        payload["video"] = _clips(v_clips)
+        payload["audio"] = _clips(a_clips)
+    else:
+        payload["tracks"] = [[t.kind, bool(t.muted), bool(t.visible), _clips(t.clips)] for t in tracks]
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8", errors="ignore")).hexdigest()
+
+
+def _export_segments(
+    ffmpeg_path: str,
+    ffprobe_path: str,
+    v_clips: List[Clip],
+    a_clips: List[Clip],
+    windows: List[Tuple[float, float]],
+    out_path: str,
+    audio_mode: str,
+    settings: ExportSettings,
+    tracks: Optional[List[Track]],
+    cache: "SegmentCache",
+    workers: int,
+    reporter: _ProgressReporter,
+    should_cancel: Optional[Callable[[], bool]],
+) -> None:
+    """
+    Export through `cache`: reuse segments whose key is already rendered,
+    render the rest (publishing each as soon as it is done, so an interrupted
+    export resumes from there) and join everything with the concat demuxer.
+    """
+    ext = _SEGMENT_EXT
+    fingerprints: Dict[str, str] = {}
+    seg_paths: List[Path] = []
+    todo: List[Tuple[str, Path]] = []
+    cmds: List[List[str]] = []
+    durations: List[float] = []
+    cached_sec = 0.0
+    for t0, t1 in windows:
+        sv = _slice_clips(v_clips, t0, t1)
+        sa = _slice_clips(a_clips, t0, t1, with_transitions=False)
+        st = _slice_tracks(tracks, t0, t1) if tracks is not None else None
+        key = _segment_key(sv, sa, st, audio_mode, settings, fingerprints)
+        hit = cache.get(key, ext)
+        if hit is not None:
+            seg_paths.append(hit)
+            cached_sec += max(0.0, t1 - t0)
+            continue
+        seg_paths.append(cache.path_for(key, ext))
+        if any(k == key for k, _p in todo):
+            continue  # the same content twice on the timeline renders once
+        part = cache.part_path(key, ext)
+        todo.append((key, part))
+        durations.append(max(0.0, t1 - t0))
+        cmds.append(
+            _as_segment_command(
+                build_export_command_project(
+                    ffmpeg_path,
+                    ffprobe_path,
+                    sv,
+                    sa,
+                    str(part),
+                    audio_mode=audio_mode,
+                    export_settings=settings,
+                    tracks=st,
+                    input_seek=True,
+                ),
+                settings,
+            )
+        )
+
+    def _publish(n: int) -> None:
+        key, part = todo[n]
+        cache.publish(key, ext, part)
+
+    reporter.update(cached_sec)
+    try:
+        if cmds:
+            _render_commands(cmds, durations, workers, reporter, should_cancel, base_sec=cached_sec, on_rendered=_publish)
+    finally:
+        for _key, part in todo:
+            try:
+                if part.exists():
+                    part.unlink()
+            except Exception:
+                pass
+
+    out_dir = Path(out_path).resolve().parent
+    work_dir = Path(tempfile.mkdtemp(prefix=".minicut_segments_", dir=str(out_dir)))
+    try:
+        list_path = work_dir / "concat.txt"
+        _write_concat_list(seg_paths, list_path)
+        _run_ffmpeg_with_progress(
+            _segment_concat_command(ffmpeg_path, str(list_path), out_path, settings),
+            should_cancel=should_cancel,
+        )
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    cache.evict(keep=seg_paths)
+
+
+def export_project_with_progress(
+    ffmpeg_path: str,
+    ffprobe_path: str,
+    v_clips: List[Clip],
+    a_clips: List[Clip],
+    out_path: str,
+    audio_mode: str = "mix",
+    export_settings: Optional[ExportSettings] = None,
+    on_progress: Optional[Callable[[float, float], None]] = None,
+    should_cancel: Optional[Callable[[], bool]] = None,
+    tracks: Optional[List[Track]] = None,
+    input_seek: bool = False,
+    smart_render: bool = False,
+    parallel_workers: int = 0,
+    segment_cache: Optional["SegmentCache"] = None,
+) -> None:
+    """
+    Export project and report progress as (current_sec, total_sec).
+
+    `on_progress` is best-effort and called on the caller thread. It should be
+    lightweight and non-blocking.
+
+    `smart_render=True` stream-copies GOP-aligned clip interiors and
+    re-encodes only cut boundaries when the timeline allows it (see
+    `smart_render_supported`); otherwise the regular full re-encode is used.
+
+    `parallel_workers > 1` splits the timeline at hard cuts and renders the
+    chunks in that many concurrent ffmpeg processes before joining them with
+    the concat demuxer. Timelines without usable cut points export normally.
+
+    With a `segment_cache` the timeline is rendered as segments split at
+    every hard cut (see `plan_segments`); segments rendered by an earlier
+    export of the same content are reused, so a re-export only encodes what
+    changed. `parallel_workers` then sets how many segments render at once.
+    """
+    # Smart render stream-copies from the sources, so resolve proxies up front.
+    v_clips = _export_originals(v_clips)
+    a_clips = _export_originals(a_clips)
+    tracks = _export_original_tracks(tracks)
+    if smart_render:
+        smart_clips = _smart_render_clips(v_clips, a_clips, audio_mode, tracks)
+        if smart_clips:
+            infos: Dict[str, MediaInfo] = {}
+            for c in smart_clips:
+                if c.src not in infos:
+                    infos[c.src] = probe_media_cached(ffprobe_path, c.src)
+            if smart_render_supported(smart_clips, infos, export_settings):
+                reporter = _ProgressReporter(total_duration(smart_clips), on_progress)
+                reporter.start()
+                _export_smart_render(
+                    ffmpeg_path,
+                    ffprobe_path,
+                    smart_clips,
+                    infos,
+                    out_path,
+                    _normalize_export_settings(export_settings),
+                    reporter,
+                    should_cancel,
+                )
+                reporter.finish()
+                return
+
+    if segment_cache is not None:
+        base_clips, other_chains = _parallel_base_clips(v_clips, tracks)
+        windows = plan_segments(base_clips, other_chains)
+        if windows:
+            reporter = _ProgressReporter(_export_total_duration(v_clips, tracks), on_progress)
+            reporter.start()
+            _export_segments(
+                ffmpeg_path,
+                ffprobe_path,
+                list(v_clips),
+                list(a_clips),
+                windows,
+                out_path,
+                audio_mode,
+                _normalize_export_settings(export_settings),
+                list(tracks) if tracks is not None else None,
+                segment_cache,
+                max(1, int(parallel_workers or 0)),
+                reporter,
+                should_cancel,
+            )
+            reporter.finish()
+            return
+
+    if int(parallel_workers or 0) > 1:
+        base_clips, other_chains = _parallel_base_clips(v_clips, tracks)
+        windows = plan_parallel_chunks(base_clips, int(parallel_workers), other_chains)
+        if len(windows) > 1:
+            reporter = _ProgressReporter(_export_total_duration(v_clips, tracks), on_progress)
+            reporter.start()
+            _export_parallel_chunks(
+                ffmpeg_path,
+                ffprobe_path,
+                list(v_clips),
+                list(a_clips),
+                windows,
+                out_path,
+                audio_mode,
+                _normalize_export_settings(export_settings),
+                list(tracks) if tracks is not None else None,
+                int(parallel_workers),
+                reporter,
+                should_cancel,
+            )
+            reporter.finish()
+            return
+
+    cmd = build_export_command_project(
+        ffmpeg_path,
+        ffprobe_path,
+        v_clips,
+        a_clips,
+        out_path,
+        audio_mode=audio_mode,
+        export_settings=export_settings,
+        tracks=tracks,
+        input_seek=input_seek,
+    )
+
+    reporter = _ProgressReporter(_export_total_duration(v_clips, tracks), on_progress)
+    reporter.start()
+    _run_ffmpeg_with_progress(cmd, on_seconds=reporter.update, should_cancel=should_cancel)
+    reporter.finish()
+
+
+DRAFT_HEIGHT = 360
+
+
+def draft_export_settings(
+    base: Optional[ExportSettings] = None,
+    height: int = DRAFT_HEIGHT,
+    source_size: Optional[Tuple[int, int]] = None,
+) -> ExportSettings:
+    """
+    Review-quality settings: `height` lines, x264 `ultrafast` and a high CRF.
+
+    The aspect ratio is that of `base` when it has a fixed size, else of
+    `source_size` (the source frame size), else 16:9.
+    """
+    h = max(90, int(height) // 2 * 2)
+    aspect = 16.0 / 9.0
+    if base is not None and int(base.width or 0) > 0 and int(base.height or 0) > 0:
+        aspect = float(base.width) / float(base.height)
+    elif source_size is not None and int(source_size[0] or 0) > 0 and int(source_size[1] or 0) > 0:
+        aspect = float(source_size[0]) / float(source_size[1])
+    w = max(16, int(round(h * aspect / 2.0)) * 2)
+    return ExportSettings(
+        width=w,
+        height=h,
+        video_codec="libx264",
+        crf=30,
+        audio_codec="aac",
+        audio_bitrate="96k",
+        format="mp4",
+        preset="ultrafast",
+    )
+
+
+def range_window(
+    v_clips: List[Clip],
+    tracks: Optional[List[Track]],
+    start_sec: float,
+    end_sec: float,
+) -> Tuple[float, float]:
+    """
+    Clamp [start_sec, end_sec) to the timeline and widen it so neither edge
+    falls inside a transition; a transition is always rendered whole.
+    """
+    total = _export_total_duration(v_clips, tracks)
+    a = max(0.0, min(float(start_sec), float(end_sec)))
+    b = min(total, max(float(start_sec), float(end_sec)))
+    if b <= a:
+        return 0.0, 0.0
+
+    if tracks is None:
+        chains = [list(v_clips)]
+    else:
+        chains = [list(t.clips) for t in tracks if isinstance(t, Track) and t.kind == "video" and t.clips]
+    overlaps: List[Tuple[float, float]] = []
+    for chain in chains:
+        for i, (s, _e) in enumerate(_clip_timeline_spans(chain)):
+            if i == 0:
+                continue
+            overlap = transition_overlap_sec(chain[i - 1], chain[i])
+            if overlap > 0.0:
+                # Small margin so the sliced neighbours keep the full overlap.
+                overlaps.append((max(0.0, s - 0.05), min(total, s + overlap + 0.05)))
+
+    # Widening can land inside another track's transition; repeat until stable.
+    changed = True
+    while changed:
+        changed = False
+        for s, e in overlaps:
+            if s < a < e:
+                a = s
+                changed = True
+            if s < b < e:
+                b = e
+                changed = True
+    return a, b
+
+
+def slice_project(
+    v_clips: List[Clip],
+    a_clips: List[Clip],
+    tracks: Optional[List[Track]],
+    start_sec: float,
+    end_sec: float,
+) -> Tuple[List[Clip], List[Clip], Optional[List[Track]]]:
+    """Trim the whole project to the timeline window [start_sec, end_sec)."""
+    return (
+        _slice_clips(v_clips, start_sec, end_sec),
+        _slice_clips(a_clips, start_sec, end_sec, with_transitions=False),
+        _slice_tracks(tracks, start_sec, end_sec) if tracks is not None else None,
+    )
+
+
+def _source_frame_size(ffprobe_path: str, v_clips: List[Clip], tracks: Optional[List[Track]]) -> Optional[Tuple[int, int]]:
+    """Frame size of the first clip on the base video chain, if it can be probed."""
+    base_clips, _other = _parallel_base_clips(v_clips, tracks)
+    if not base_clips:
+        return None
+    try:
+        info = probe_media_cached(ffprobe_path, base_clips[0].src)
+    except Exception:
+        return None
+    if not info.has_video or not info.width or not info.height:
+        return None
+    return int(info.width), int(info.height)
+
+
+def export_range_with_progress(
+    ffmpeg_path: str,
+    ffprobe_path: str,
+    v_clips: List[Clip],
+    a_clips: List[Clip],
+    out_path: str,
+    start_sec: float,
+    end_sec: float,
+    audio_mode: str = "mix",
+    export_settings: Optional[ExportSettings] = None,
+    on_progress: Optional[Callable[[float, float], None]] = None,
+    should_cancel: Optional[Callable[[], bool]] = None,
+    tracks: Optional[List[Track]] = None,
+    draft: bool = False,
+) -> Tuple[float, float]:
+    """
+    Export only the timeline range [start_sec, end_sec).
+
+    The clips are trimmed to the window (see `range_window`) before the filter
+    graph is built and every input is seeked, so the cost depends on the
+    range, not on the project length. `draft=True` swaps in
+    `draft_export_settings`, sized to the project's aspect ratio (the export
+    settings, or the first video clip's frame when they keep the source
+    size). Returns the window actually rendered.
+    """
+    v_clips = _export_originals(v_clips)
+    a_clips = _export_originals(a_clips)
+    tracks = _export_original_tracks(tracks)
+    t0, t1 = range_window(v_clips, tracks, start_sec, end_sec)
+    if t1 <= t0:
+        raise ValueError("Export range is empty")
+    sv, sa, st = slice_project(v_clips, a_clips, tracks, t0, t1)
+    settings = export_settings
+    if draft:
+        settings = draft_export_settings(export_settings, source_size=_source_frame_size(ffprobe_path, v_clips, tracks))
+    export_project_with_progress(
+        ffmpeg_path,
+        ffprobe_path,
+        sv,
+        sa,
+        out_path,
+        audio_mode=audio_mode,
+        export_settings=settings,
+        on_progress=on_progress,
+        should_cancel=should_cancel,
+        tracks=st,
+        input_seek=True,
+    )
+    return t0, t1
@@ -1,7 +1,106 @@
 from __future__ import annotations
 
+import json
+import sys
+import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from .model import Clip, Project, Track
+
+DEFAULT_HISTORY_BYTES = 64 * 1024 * 1024
+DEFAULT_COALESCE_SEC = 1.5
+
+# Rough per-object costs used by the memory budget (CPython, 64-bit).
+_PTR_BYTES = 8
+_TRACK_BYTES = 200
+
+
+@dataclass(frozen=True)
+class TrackSnapshot:
+    id: str
+    name: str
+    kind: str
+    muted: bool
+    visible: bool
+    clips: Tuple[Clip, ...]
+
+    def matches(self, track: Track) -> bool:
+        if (
+            self.name != track.name
+            or self.kind != track.kind
+            or self.muted != bool(track.muted)
+            or self.visible != bool(track.visible)
+            or len(self.clips) != len(track.clips)
+        ):
+            return False
+        return all(a is b for a, b in zip(self.clips, track.clips))
+
+
+@dataclass(frozen=True)
+class ProjectSnapshot:
+    """
+    Structurally shared project state.
+
+    Timeline edits never mutate a `Clip` in place (they build new clips with
+    `dataclasses.replace`), so snapshots hold references to the live clip
+    objects and reuse whole track snapshots that did not change since the
+    previous one. A step therefore costs roughly the clips it touched.
+    """
+
+    fps: int
+    tracks: Tuple[TrackSnapshot, ...]
+
+
+def snapshot_project(project: Project, previous: Optional[ProjectSnapshot] = None) -> ProjectSnapshot:
+    prev_tracks = {t.id: t for t in previous.tracks} if previous is not None else {}
+    out: List[TrackSnapshot] = []
+    for t in project.tracks:
+        old = prev_tracks.get(t.id)
+        if old is not None and old.matches(t):
+            out.append(old)
+            continue
+        out.append(
+            TrackSnapshot(
+                id=str(t.id),
+                name=str(t.name),
+                kind=str(t.kind),
+                muted=bool(t.muted),
+                visible=bool(t.visible),
+                clips=tuple(t.clips),
+            )
+        )
+    return ProjectSnapshot(fps=int(project.fps), tracks=tuple(out))
+
+
+def restore_project(project: Project, snapshot: ProjectSnapshot) -> List[str]:
+    """
+    Patch `project` in place to match `snapshot`.
+
+    Only tracks that differ are touched; unchanged `Track` objects (and their
+    clip lists) are kept as they are. Returns the ids of tracks that were
+    added, changed or removed.
+    """
+    existing = {t.id: t for t in project.tracks}
+    wanted = {ts.id for ts in snapshot.tracks}
+    changed: List[str] = [tid for tid in existing if tid not in wanted]
+    tracks: List[Track] = []
+    for ts in snapshot.tracks:
+        t = existing.get(ts.id)
+        if t is None:
+            t = Track(id=ts.id, name=ts.name, kind=ts.kind, clips=list(ts.clips), muted=ts.muted, visible=ts.visible)
+            changed.append(ts.id)
+        elif not ts.matches(t):
+            t.name = ts.name
+            t.kind = ts.kind
+            t.muted = ts.muted
+            t.visible = ts.visible
+            t.clips = list(ts.clips)
+            changed.append(ts.id)
+        tracks.append(t)
+    project.fps = int(snapshot.fps)
+    project.tracks = tracks
+    return changed
 
 
 @dataclass(frozen=True)
@@ -10,26 +109,99 @@ class HistoryEntry:
     Snapshot of editor state used for Undo/Redo.
 
     Notes:
-        - Store Project as a plain dict (Project.to_dict()) to keep this module
-          independent from the UI layer and avoid accidental mutation.
+        - `project` is a `ProjectSnapshot` (see `snapshot_project`) or, for
+          callers that need a detached copy, a plain `Project.to_dict()`.
         - Selection is stored as raw ids; the UI should validate existence after restore.
     """
 
     label: str
-    project: Dict[str, Any]
+    project: Any
     selected_track: Optional[str] = None  # "v" | "a" | None
     selected_clip_id: Optional[str] = None
 
 
+def _clip_bytes(c: Clip) -> int:
+    try:
+        return sys.getsizeof(c) + sys.getsizeof(c.__dict__) + sys.getsizeof(c.src) + sys.getsizeof(c.id)
+    except Exception:
+        return 512
+
+
+def _entry_bytes(entry: HistoryEntry, neighbour: Optional[HistoryEntry]) -> int:
+    """
+    Approximate memory held by `entry` beyond what it shares with `neighbour`.
+    """
+    proj = entry.project
+    if not isinstance(proj, ProjectSnapshot):
+        try:
+            return len(json.dumps(proj, default=str))
+        except Exception:
+            return sys.getsizeof(proj)
+
+    near = neighbour.project if neighbour is not None and isinstance(neighbour.project, ProjectSnapshot) else None
+    near_tracks: Dict[str, TrackSnapshot] = {t.id: t for t in near.tracks} if near is not None else {}
+    total = sys.getsizeof(proj.tracks)
+    for ts in proj.tracks:
+        other = near_tracks.get(ts.id)
+        if other is ts:
+            continue
+        total += _TRACK_BYTES + _PTR_BYTES * len(ts.clips)
+        shared = {id(c) for c in other.clips} if other is not None else set()
+        total += sum(_clip_bytes(c) for c in ts.clips if id(c) not in shared)
+    return total
+
+
 class HistoryManager:
-    def __init__(self, limit: int = 50) -> None:
-        self.limit = max(1, int(limit))
+    """
+    Undo/Redo stacks bounded by an approximate memory budget.
+
+    `limit` optionally caps the number of undo steps as well (0 = no cap).
+
+    Records made with the same `coalesce_key` (e.g. "volume" + clip id) less
+    than `coalesce_sec` apart merge into the first one, so a burst of slider
+    nudges is a single undo step back to the state before the burst.
+    """
+
+    def __init__(
+        self,
+        limit: int = 0,
+        max_bytes: int = DEFAULT_HISTORY_BYTES,
+        coalesce_sec: float = DEFAULT_COALESCE_SEC,
+    ) -> None:
+        self.limit = max(0, int(limit))
+        self.max_bytes = max(0, int(max_bytes))
+        self.coalesce_sec = max(0.0, float(coalesce_sec))
         self._undo: List[HistoryEntry] = []
         self._redo: List[HistoryEntry] = []
+        self._undo_bytes: List[int] = []
+        self._redo_bytes: List[int] = []
+        self._burst_key: Optional[Hashable] = None
+        self._burst_at = 0.0
 
     def clear(self) -> None:
         self._undo.clear()
         self._redo.clear()
+        self._undo_bytes.clear()
+        self._redo_bytes.clear()
+        self.seal()
+
+    def seal(self) -> None:
+        """End the current coalescing burst; the next record starts a new step."""
+        self._burst_key = None
+
+    def extend(self, coalesce_key: Optional[Hashable], now: Optional[float] = None) -> bool:
+        """
+        True if a record with `coalesce_key` would merge into the newest step.
+
+        Extends the burst window, so callers can skip building the snapshot.
+        """
+        if coalesce_key is None or self._burst_key is None or not self._undo:
+            return False
+        t = time.monotonic() if now is None else float(now)
+        if coalesce_key != self._burst_key or t - self._burst_at > self.coalesce_sec:
+            return False
+        self._burst_at = t
+        return True
 
     def can_undo(self) -> bool:
         return bool(self._undo)
@@ -43,32 +215,70 @@ class HistoryManager:
     def peek_redo_label(self) -> str:
         return self._redo[-1].label if self._redo else ""
 
-    def record(self, entry: HistoryEntry) -> None:
+    def peek_undo_project(self) -> Any:
+        """Project state of the newest undo step (useful as `previous` for snapshots)."""
+        return self._undo[-1].project if self._undo else None
+
+    @property
+    def used_bytes(self) -> int:
+        return sum(self._undo_bytes) + sum(self._redo_bytes)
+
+    def record(
+        self,
+        entry: HistoryEntry,
+        coalesce_key: Optional[Hashable] = None,
+        now: Optional[float] = None,
+    ) -> bool:
         """
         Record a new undo step.
 
         Call this *before* applying a mutation. Recording clears the redo stack.
+        Returns False when the entry was merged into the newest step instead.
         """
 
-        self._undo.append(entry)
-        if len(self._undo) > self.limit:
-            self._undo = self._undo[-self.limit :]
+        if self.extend(coalesce_key, now):
+            return False
+        self._push_undo(entry)
         self._redo.clear()
+        self._redo_bytes.clear()
+        self._trim()
+        self._burst_key = coalesce_key
+        self._burst_at = time.monotonic() if now is None else float(now)
+        return True
 
     def undo(self, current: HistoryEntry) -> Optional[HistoryEntry]:
         if not self._undo:
             return None
+        self.seal()
         entry = self._undo.pop()
+        self._undo_bytes.pop()
         # Keep the same label so redo describes the same operation.
-        self._redo.append(HistoryEntry(label=entry.label, project=current.project, selected_track=current.selected_track, selected_clip_id=current.selected_clip_id))
+        redo_entry = HistoryEntry(label=entry.label, project=current.project, selected_track=current.selected_track, selected_clip_id=current.selected_clip_id)
+        self._redo_bytes.append(_entry_bytes(redo_entry, self._redo[-1] if self._redo else entry))
+        self._redo.append(redo_entry)
         return entry
 
     def redo(self, current: HistoryEntry) -> Optional[HistoryEntry]:
         if not self._redo:
             return None
+        self.seal()
         entry = self._redo.pop()
-        self._undo.append(HistoryEntry(label=entry.label, project=current.project, selected_track=current.selected_track, selected_clip_id=current.selected_clip_id))
-        if len(self._undo) > self.limit:
-            self._undo = self._undo[-self.limit :]
+        self._redo_bytes.pop()
+        self._push_undo(HistoryEntry(label=entry.label, project=current.project, selected_track=current.selected_track, selected_clip_id=current.selected_clip_id))
+        self._trim()
         return entry
 
+    def _push_undo(self, entry: HistoryEntry) -> None:
+        self._undo_bytes.append(_entry_bytes(entry, self._undo[-1] if self._undo else None))
+        self._undo.append(entry)
+
+    def _trim(self) -> None:
+        while self._undo and (
+            (self.limit and len(self._undo) > self.limit)
+            or (self.max_bytes and len(self._undo) > 1 and self.used_bytes > self.max_bytes)
+        ):
+            self._undo.pop(0)
+            self._undo_bytes.pop(0)
+            if self._undo:
+                # The new oldest step no longer shares anything with the dropped one.
+                self._undo_bytes[0] = _entry_bytes(self._undo[0], None)
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import hashlib
+import subprocess
+from pathlib import Path
+from typing import List, Optional
+
+
+def file_fingerprint(src_path: Path) -> Optional[str]:
+    """`path|mtime_ns|size` of a source file; None when it can't be stat'ed."""
+    try:
+        st = src_path.stat()
+        return f"{src_path.resolve()}|{st.st_mtime_ns}|{st.st_size}"
+    except Exception:
+        return None
+
+
+def cache_file_path(cache_dir: Path, key: str, suffix: str = ".png") -> Path:
+    """Hashed file name for `key` in `cache_dir` (created if missing)."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha1(key.encode("utf-8", errors="ignore")).hexdigest()[:24]
+    return cache_dir / f"{digest}{suffix}"
+
+
+def run_ffmpeg(cmd: List[str]) -> bool:
+    """Run an ffmpeg command quietly; True on success."""
+    try:
+        subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            check=True,
+        )
+        return True
+    except Exception:
+        return False
@@ -15,6 +15,10 @@ def new_id() -> str:
 MIN_CLIP_SPEED = 0.25
 MAX_CLIP_SPEED = 4.0
 
+# Project file schema written by `Project.to_dict()`. Files without a
+# "version" key are the older verbose formats and are still readable.
+PROJECT_SCHEMA_VERSION = 2
+
 
 def normalize_speed(value: Any, default: float = 1.0) -> float:
     try:
@@ -31,6 +35,9 @@ class Transition:
     kind: str = "fade"  # fade | crossfade | dissolve
     duration: float = 0.5
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "duration": self.duration}
+
     @staticmethod
     def from_dict(d: Dict[str, Any]) -> Optional["Transition"]:
         if not isinstance(d, dict):
@@ -127,7 +134,56 @@ class Clip:
         return Path(self.src).name
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        t = self.transition_in
+        return {
+            "id": self.id,
+            "src": self.src,
+            "in_sec": self.in_sec,
+            "out_sec": self.out_sec,
+            "speed": self.speed,
+            "volume": self.volume,
+            "muted": self.muted,
+            "has_audio": self.has_audio,
+            "transition_in": t.to_dict() if t is not None else None,
+        }
+
+    def to_compact(self, src_index: int) -> Dict[str, Any]:
+        """Schema v2 clip: `src` is an index into the project's sources, defaults are omitted."""
+        d: Dict[str, Any] = {"id": self.id, "src": src_index, "in": self.in_sec, "out": self.out_sec}
+        if self.speed != 1.0:
+            d["speed"] = self.speed
+        if self.volume != 1.0:
+            d["volume"] = self.volume
+        if self.muted:
+            d["muted"] = True
+        if not self.has_audio:
+            d["has_audio"] = False
+        t = self.transition_in
+        if t is not None:
+            d["transition"] = [t.kind, t.duration]
+        return d
+
+    @staticmethod
+    def from_compact(d: Dict[str, Any], sources: List[str]) -> "Clip":
+        if len(d) == 4:
+            # Fast path: nothing but defaults beyond id/src/in/out.
+            return Clip(str(d["id"]), sources[d["src"]], float(d["in"]), float(d["out"]))
+        speed = d.get("speed")
+        raw_t = d.get("transition")
+        transition_in = None
+        if raw_t:
+            transition_in = Transition.from_dict({"kind": raw_t[0], "duration": raw_t[1]})
+        return Clip(
+            id=str(d["id"]),
+            src=sources[int(d["src"])],
+            in_sec=float(d["in"]),
+            out_sec=float(d["out"]),
+            speed=1.0 if speed is None else normalize_speed(speed, default=1.0),
+            volume=float(d.get("volume", 1.0) or 1.0),
+            muted=bool(d.get("muted", False)),
+            has_audio=bool(d.get("has_audio", True)),
+            transition_in=transition_in,
+        )
 
     @staticmethod
     def from_dict(d: Dict[str, Any]) -> "Clip":
@@ -172,6 +228,21 @@ class Track:
             "visible": bool(self.visible),
         }
 
+    def to_compact(self, sources: Dict[str, int]) -> Dict[str, Any]:
+        """Schema v2 track; registers clip sources in `sources` (path -> index)."""
+        clips = []
+        for c in self.clips:
+            idx = sources.get(c.src)
+            if idx is None:
+                idx = sources[c.src] = len(sources)
+            clips.append(c.to_compact(idx))
+        d: Dict[str, Any] = {"id": self.id, "name": self.name, "kind": self.kind, "clips": clips}
+        if self.muted:
+            d["muted"] = True
+        if not self.visible:
+            d["visible"] = False
+        return d
+
     @staticmethod
     def from_dict(d: Dict[str, Any]) -> "Track":
         tid = str(d.get("id") or new_id())
@@ -260,19 +331,47 @@ class Project:
             self.v_clips = list(v_clips or [])
             self.a_clips = list(a_clips or [])
 
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(self, legacy: bool = False) -> Dict[str, Any]:
+        """
+        Serialize the project.
+
+        By default this is the compact versioned schema (sources table, clip
+        defaults omitted). `legacy=True` writes the older verbose format,
+        including the `v_clips`/`a_clips` keys read by older app builds/tools.
+        """
+        if legacy:
+            return {
+                "fps": self.fps,
+                "tracks": [t.to_dict() for t in self.tracks],
+                "v_clips": [c.to_dict() for c in self.v_clips],
+                "a_clips": [c.to_dict() for c in self.a_clips],
+            }
+        sources: Dict[str, int] = {}
+        tracks = [t.to_compact(sources) for t in self.tracks]
         return {
+            "version": PROJECT_SCHEMA_VERSION,
             "fps": self.fps,
-            "tracks": [t.to_dict() for t in self.tracks],
-            # Keep legacy keys for compatibility with older app builds/tools.
-            "v_clips": [c.to_dict() for c in self.v_clips],
-            "a_clips": [c.to_dict() for c in self.a_clips],
+            "sources": list(sources),
+            "tracks": tracks,
         }
 
     @staticmethod
     def from_dict(d: Dict[str, Any]) -> "Project":
         fps = int(d.get("fps", 30))
 
+        if isinstance(d.get("version"), int) and d["version"] >= 2:
+            if d["version"] > PROJECT_SCHEMA_VERSION:
+                raise ValueError(f"Project file version {d['version']} is newer than supported ({PROJECT_SCHEMA_VERSION})")
+            sources = [str(x) for x in d.get("sources", [])]
+            tracks: List[Track] = []
+            for t in d.get("tracks", []):
+                if not isinstance(t, dict):
+                    continue
+                clips = [Clip.from_compact(c, sources) for c in t.get("clips", [])]
+                tracks.append(Track.from_dict({**t, "clips": []}))
+                tracks[-1].clips = clips
+            return Project(fps=fps, tracks=tracks)
+
         # New multi-track format.
         if isinstance(d.get("tracks"), list):
             return Project(
@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import mmap
+import struct
+import subprocess
+import sys
+from array import array
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .media_cache import cache_file_path, file_fingerprint
+
+# File layout (little endian):
+#   header:  magic(4) version(u16) level_count(u16) sample_rate(u32)
+#   levels:  level_count x [samples_per_peak(u32) peak_count(u32) offset(u64)]
+#   data:    per level, peak_count x [min(i16) max(i16)]
+_MAGIC = b"MCPK"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHI")
+_LEVEL = struct.Struct("<IIQ")
+
+PEAK_SAMPLE_RATE = 8000
+PEAK_BASE_SPP = 64
+PEAK_LEVEL_FACTOR = 4
+PEAK_LEVELS = 6
+
+
+def _reduce_pairs(pairs: array, factor: int) -> array:
+    """Merge every `factor` (min, max) pairs into one."""
+    out = array("h")
+    n = len(pairs) // 2
+    step = 2 * factor
+    for i in range(0, n * 2, step):
+        mins = pairs[i : i + step : 2]
+        maxs = pairs[i + 1 : i + step : 2]
+        out.append(min(mins))
+        out.append(max(maxs))
+    return out
+
+
+def build_peak_levels(
+    samples: array,
+    samples_per_peak: int = PEAK_BASE_SPP,
+    factor: int = PEAK_LEVEL_FACTOR,
+    levels: int = PEAK_LEVELS,
+) -> List[Tuple[int, array]]:
+    """
+    Build (samples_per_peak, interleaved min/max pairs) mipmap levels from
+    16-bit mono samples. Level 0 is the finest.
+    """
+    spp = max(1, int(samples_per_peak))
+    base = array("h")
+    _append_peaks(base, samples, spp)
+    return _levels_from_base(base, spp, factor, levels)
+
+
+def _levels_from_base(base: array, spp: int, factor: int, levels: int) -> List[Tuple[int, array]]:
+    out: List[Tuple[int, array]] = [(spp, base)]
+    factor = max(2, int(factor))
+    for _ in range(1, max(1, int(levels))):
+        prev_spp, prev = out[-1]
+        if len(prev) <= 2:
+            break
+        out.append((prev_spp * factor, _reduce_pairs(prev, factor)))
+    return out
+
+
+def write_peaks_file(path: Path, sample_rate: int, levels: List[Tuple[int, array]]) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    offset = _HEADER.size + _LEVEL.size * len(levels)
+    table = []
+    for spp, pairs in levels:
+        count = len(pairs) // 2
+        table.append((spp, count, offset))
+        offset += count * 4
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, len(levels), int(sample_rate)))
+        for spp, count, off in table:
+            f.write(_LEVEL.pack(spp, count, off))
+        for _spp, pairs in levels:
+            data = array("h", pairs)
+            if sys.byteorder == "big":
+                data.byteswap()
+            data.tofile(f)
+    tmp.replace(path)
+
+
+class WaveformPeaks:
+    """
+    Memory-mapped reader for a peaks file.
+
+    `envelope()` renders any segment at any width from the coarsest level that
+    still has at least one peak per output column.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._file = self.path.open("rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, level_count, sample_rate = _HEADER.unpack_from(self._mmap, 0)
+            if magic != _MAGIC or version != _VERSION or level_count <= 0:
+                raise ValueError("Not a peaks file")
+            self.sample_rate = int(sample_rate)
+            self.levels: List[Tuple[int, memoryview]] = []
+            self._views: List[memoryview] = []
+            for i in range(level_count):
+                spp, count, off = _LEVEL.unpack_from(self._mmap, _HEADER.size + i * _LEVEL.size)
+                raw = memoryview(self._mmap)[off : off + count * 4]
+                self._views.append(raw)
+                if sys.byteorder == "big":
+                    swapped = array("h", raw.tobytes())
+                    swapped.byteswap()
+                    view = memoryview(swapped)
+                else:
+                    view = raw.cast("h")
+                    self._views.append(view)
+                self.levels.append((int(spp), view))
+        except Exception:
+            self.close()
+            raise
+
+    @property
+    def duration(self) -> float:
+        spp, view = self.levels[0]
+        return (len(view) // 2) * spp / float(self.sample_rate or 1)
+
+    def envelope(self, start_sec: float, duration_sec: float, width: int) -> List[Tuple[float, float]]:
+        """(min, max) per output column, normalized to -1..1."""
+        width = max(1, int(width))
+        dur = max(0.0, float(duration_sec))
+        if dur <= 0.0:
+            return [(0.0, 0.0)] * width
+        samples_per_col = dur * self.sample_rate / width
+        spp, view = self.levels[0]
+        for lvl_spp, lvl_view in self.levels:
+            if lvl_spp <= samples_per_col:
+                spp, view = lvl_spp, lvl_view
+        count = len(view) // 2
+        start = max(0.0, float(start_sec)) * self.sample_rate / spp
+        per_col = samples_per_col / spp
+        out: List[Tuple[float, float]] = []
+        for col in range(width):
+            a = int(start + col * per_col)
+            b = max(a + 1, int(start + (col + 1) * per_col))
+            a = min(a, count)
+            b = min(b, count)
+            if a >= b:
+                out.append((0.0, 0.0))
+                continue
+            lo = min(view[2 * a : 2 * b : 2])
+            hi = max(view[2 * a + 1 : 2 * b : 2])
+            out.append((lo / 32768.0, hi / 32767.0))
+        return out
+
+    def close(self) -> None:
+        self.levels = []
+        # Exported views must be released before the map can close.
+        for view in reversed(getattr(self, "_views", [])):
+            try:
+                view.release()
+            except Exception:
+                pass
+        self._views = []
+        try:
+            if getattr(self, "_mmap", None) is not None:
+                self._mmap.close()
+        except Exception:
+            pass
+        try:
+            self._file.close()
+        except Exception:
+            pass
+
+
+def generate_peaks(
+    ffmpeg_path: str,
+    src: str,
+    cache_dir: Path,
+    sample_rate: int = PEAK_SAMPLE_RATE,
+    samples_per_peak: int = PEAK_BASE_SPP,
+) -> Optional[str]:
+    """
+    Decode a source's audio once into a cached multi-resolution peaks file.
+    """
+    src_path = Path(src)
+    if not src_path.exists():
+        return None
+
+    fp = file_fingerprint(src_path)
+    if not fp:
+        return None
+
+    out = cache_file_path(cache_dir, f"peaks|{fp}|{sample_rate}|{samples_per_peak}", ".peaks")
+    try:
+        if out.exists() and out.stat().st_size > 0:
+            return str(out)
+    except Exception:
+        pass
+
+    cmd = [
+        ffmpeg_path,
+        "-v",
+        "error",
+        "-i",
+        str(src_path),
+        "-vn",
+        "-ac",
+        "1",
+        "-ar",
+        str(int(sample_rate)),
+        "-f",
+        "s16le",
+        "-",
+    ]
+    spp = max(1, int(samples_per_peak))
+    block = spp * 2
+    base = array("h")
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except Exception:
+        return None
+    try:
+        pending = b""
+        assert proc.stdout is not None
+        while True:
+            chunk = proc.stdout.read(block * 4096)
+            if not chunk:
+                break
+            pending += chunk
+            usable = len(pending) - (len(pending) % block)
+            if usable:
+                _append_peaks(base, _samples_from_s16le(pending[:usable]), spp)
+                pending = pending[usable:]
+        usable = len(pending) - (len(pending) % 2)
+        if usable:
+            _append_peaks(base, _samples_from_s16le(pending[:usable]), spp)
+        ret = proc.wait()
+    except Exception:
+        try:
+            proc.kill()
+        except Exception:
+            pass
+        return None
+    if ret != 0 or not base:
+        return None
+
+    try:
+        write_peaks_file(out, sample_rate, _levels_from_base(base, spp, PEAK_LEVEL_FACTOR, PEAK_LEVELS))
+    except Exception:
+        return None
+    return str(out)
+
+
+def _samples_from_s16le(raw: bytes) -> array:
+    samples = array("h")
+    samples.frombytes(raw)
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return samples
+
+
+def _append_peaks(base: array, samples: array, spp: int) -> None:
+    for i in range(0, len(samples), spp):
+        chunk = samples[i : i + spp]
+        base.append(min(chunk))
+        base.append(max(chunk))
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from typing import Optional
+
+
+class PlaybackClock:
+    """
+    Predictive playhead clock for one playing clip (timeline-relative seconds).
+
+    The position is extrapolated from the last anchor and a monotonic
+    timestamp, so the UI can tick every frame without asking the player.
+    `due(now)` says when the player should be polled again: the interval
+    starts short and doubles while reports agree with the prediction (up to
+    `max_interval`), and drops back after a correction.
+
+    Drift above `drift_threshold` is slewed out by running the clock a bit
+    faster/slower for `slew_sec`, so the playhead never steps backwards;
+    drift above `jump_threshold` (a seek or a stall) re-anchors directly.
+    Until the player reports movement the clock holds still for up to
+    `startup_sec`, instead of racing ahead of a backend that is buffering.
+    """
+
+    def __init__(
+        self,
+        duration: float,
+        min_interval: float = 0.25,
+        max_interval: float = 2.0,
+        drift_threshold: float = 0.06,
+        jump_threshold: float = 0.5,
+        slew_sec: float = 0.5,
+        startup_sec: float = 0.35,
+        startup_poll: float = 0.05,
+    ) -> None:
+        self.duration = max(0.0, float(duration))
+        self.min_interval = max(0.01, float(min_interval))
+        self.max_interval = max(self.min_interval, float(max_interval))
+        self.drift_threshold = max(0.0, float(drift_threshold))
+        self.jump_threshold = max(self.drift_threshold, float(jump_threshold))
+        self.slew_sec = max(0.01, float(slew_sec))
+        self.startup_sec = max(0.0, float(startup_sec))
+        self.startup_poll = max(0.01, float(startup_poll))
+        self.syncs = 0
+        self.start(0.0, 0.0)
+
+    def start(self, rel: float, now: float) -> None:
+        self._origin_rel = self._clamp(rel)
+        self._origin_wall = float(now)
+        self._rate = 1.0
+        self._slew_until: Optional[float] = None
+        self._startup_until: Optional[float] = float(now) + self.startup_sec if self.startup_sec > 0 else None
+        self._interval = self.min_interval
+        self._next_sync = float(now)
+        self._last_reported: Optional[float] = None
+
+    @property
+    def in_startup(self) -> bool:
+        return self._startup_until is not None
+
+    def position(self, now: float) -> float:
+        now = float(now)
+        if self._startup_until is not None:
+            if now < self._startup_until:
+                return self._origin_rel
+            # The player never reported movement; run on the wall clock from here.
+            self._anchor(self._origin_rel, self._startup_until)
+            self._startup_until = None
+        if self._slew_until is not None and now >= self._slew_until:
+            self._anchor(self._extrapolate(self._slew_until), self._slew_until)
+        return self._extrapolate(now)
+
+    def due(self, now: float) -> bool:
+        return float(now) >= self._next_sync
+
+    def sync(self, reported: Optional[float], now: float) -> float:
+        """Fold a player position report (None = unavailable) into the clock."""
+        now = float(now)
+        self.syncs += 1
+        predicted = self.position(now)
+        if reported is None:
+            self._next_sync = now + self._interval
+            return predicted
+        reported = self._clamp(reported)
+        stale = self._last_reported is not None and reported <= self._last_reported + 0.001
+        self._last_reported = reported
+
+        if self._startup_until is not None:
+            if reported > self._origin_rel + 0.015:
+                self._startup_until = None
+                self._anchor(reported, now)
+                self._interval = self.min_interval
+                self._next_sync = now + self._interval
+                return reported
+            self._next_sync = now + self.startup_poll
+            return predicted
+
+        if stale:
+            # A frozen report usually means a slow backend, not a paused one;
+            # keep the local clock and look again soon.
+            self._interval = self.min_interval
+        else:
+            drift = reported - predicted
+            if abs(drift) >= self.jump_threshold:
+                self._anchor(reported, now)
+                self._interval = self.min_interval
+            elif abs(drift) > self.drift_threshold:
+                self._anchor(predicted, now)
+                self._rate = max(0.5, min(1.5, 1.0 + drift / self.slew_sec))
+                self._slew_until = now + self.slew_sec
+                self._interval = self.min_interval
+            else:
+                self._interval = min(self.max_interval, self._interval * 2.0)
+        self._next_sync = now + self._interval
+        return self.position(now)
+
+    def _anchor(self, rel: float, now: float) -> None:
+        self._origin_rel = self._clamp(rel)
+        self._origin_wall = float(now)
+        self._rate = 1.0
+        self._slew_until = None
+
+    def _extrapolate(self, now: float) -> float:
+        return self._clamp(self._origin_rel + max(0.0, now - self._origin_wall) * self._rate)
+
+    def _clamp(self, rel: float) -> float:
+        return max(0.0, min(self.duration, float(rel)))
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, fields
+from pathlib import Path
+from typing import Dict, Optional
+
+from .ffmpeg import MediaInfo
+from .media_cache import file_fingerprint
+
+_SCHEMA_VERSION = 1
+_MEDIA_INFO_FIELDS = {f.name for f in fields(MediaInfo)}
+
+
+class ProbeCache:
+    """
+    Persistent MediaInfo cache backed by SQLite.
+
+    Default location: ~/.minicut/probe_cache.sqlite3
+
+    Entries are keyed by resolved path and validated against the path+mtime+size
+    fingerprint used by thumbnails, so edited or replaced files are re-probed
+    automatically. All errors degrade to cache misses.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = Path(db_path)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @staticmethod
+    def default() -> "ProbeCache":
+        return ProbeCache(Path.home() / ".minicut" / "probe_cache.sqlite3")
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._conn is not None:
+            return self._conn
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=5.0, check_same_thread=False)
+            version = int(conn.execute("PRAGMA user_version").fetchone()[0])
+            if version != _SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS probe")
+                conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS probe ("
+                "path TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, info TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.commit()
+            self._conn = conn
+        except Exception:
+            self._conn = None
+        return self._conn
+
+    def get(self, src: str) -> Optional[MediaInfo]:
+        """Cached MediaInfo for `src`, or None when missing or stale."""
+        src_path = Path(src)
+        fp = file_fingerprint(src_path)
+        info: Optional[MediaInfo] = None
+        if fp:
+            with self._lock:
+                conn = self._connect()
+                row = None
+                if conn is not None:
+                    try:
+                        row = conn.execute(
+                            "SELECT fingerprint, info FROM probe WHERE path = ?",
+                            (str(src_path.resolve()),),
+                        ).fetchone()
+                    except Exception:
+                        row = None
+            if row is not None and row[0] == fp:
+                try:
+                    data = json.loads(row[1])
+                    info = MediaInfo(**{k: v for k, v in data.items() if k in _MEDIA_INFO_FIELDS})
+                except Exception:
+                    info = None
+        with self._lock:
+            if info is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return info
+
+    def put(self, src: str, info: MediaInfo) -> None:
+        src_path = Path(src)
+        fp = file_fingerprint(src_path)
+        if not fp:
+            return
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO probe (path, fingerprint, info, updated_at) VALUES (?, ?, ?, ?)",
+                    (str(src_path.resolve()), fp, json.dumps(asdict(info)), time.time()),
+                )
+                conn.commit()
+            except Exception:
+                pass
+
+    def invalidate(self, src: str) -> None:
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute("DELETE FROM probe WHERE path = ?", (str(Path(src).resolve()),))
+                conn.commit()
+            except Exception:
+                pass
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute("DELETE FROM probe")
+                conn.commit()
+            except Exception:
+                pass
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                except Exception:
+                    pass
+                self._conn = None
@@ -2,23 +2,49 @@ from __future__ import annotations
 
 import json
 import os
+import struct
 import tempfile
+import threading
+import zlib
 from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from .model import Project
+from .history import ProjectSnapshot, TrackSnapshot
+from .model import PROJECT_SCHEMA_VERSION, Clip, Project, Track
 
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_VERSION = 1
 
-def save_project(project: Project, path: str) -> None:
+# .minicutz container (little endian):
+#   magic(4) header_len(u32) header(zlib JSON) blocks...
+# The header holds fps, the sources table and per-track metadata with the
+# offset/length of that track's block; each block is zlib-compressed JSON of
+# the track's compact (schema v2) clips, decoded on first access.
+CONTAINER_SUFFIX = ".minicutz"
+_CONTAINER_MAGIC = b"MCZ1"
+_CONTAINER_HEAD = struct.Struct("<4sI")
+
+
+def save_project(project: Project, path: str, legacy: bool = False) -> None:
+    """
+    Write `project` atomically in the compact schema.
+
+    Paths ending in `.minicutz` get the compressed container instead.
+    `legacy=True` writes the older verbose JSON format for tools that still
+    read `v_clips`/`a_clips`.
+    """
     p = Path(path)
     p.parent.mkdir(parents=True, exist_ok=True)
-    payload = json.dumps(project.to_dict(), ensure_ascii=False, indent=2)
+    if p.suffix.lower() == CONTAINER_SUFFIX and not legacy:
+        payload = _container_bytes(project)
+    else:
+        payload = json.dumps(project.to_dict(legacy=legacy), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
 
     # Atomic write: auto-save shouldn't risk corrupting the project file.
     tmp_path: Path | None = None
     try:
         with tempfile.NamedTemporaryFile(
-            mode="w",
-            encoding="utf-8",
+            mode="wb",
             delete=False,
             dir=str(p.parent),
             prefix=f".{p.name}.",
@@ -40,7 +66,348 @@ def save_project(project: Project, path: str) -> None:
                 pass
 
 
-def load_project(path: str) -> Project:
+def load_project(path: str, replay_journal: bool = True) -> Project:
+    """
+    Load a JSON project or a `.minicutz` container (detected by content).
+
+    Container tracks are decoded lazily; see `LazyTrack`.
+    """
     p = Path(path)
-    data = json.loads(p.read_text(encoding="utf-8"))
-    return Project.from_dict(data)
+    raw = p.read_bytes()
+    if raw[:4] == _CONTAINER_MAGIC:
+        project = _project_from_container(raw)
+    else:
+        project = Project.from_dict(json.loads(raw.decode("utf-8")))
+    if replay_journal:
+        project = _replay_journal(project, p)
+    return project
+
+
+def convert_project(src_path: str, dst_path: str, legacy: bool = False) -> None:
+    """
+    Convert between project JSON and `.minicutz` (format chosen by `dst_path`'s suffix).
+
+    Journaled autosave edits of the source are folded into the output.
+    """
+    save_project(load_project(src_path), dst_path, legacy=legacy)
+
+
+class LazyTrack(Track):
+    """
+    Track read from a `.minicutz` container.
+
+    Name/kind/flags and `clip_count` are available straight from the header;
+    the clip block is decompressed and decoded on first access to `clips`.
+    Assigning `clips` works like on a plain `Track`, and passing `clips`
+    instead of `load` builds an already loaded track, so the `Track`
+    signature (`dataclasses.replace`, copying) keeps working.
+    """
+
+    def __init__(
+        self,
+        id: str,
+        name: str,
+        kind: str,
+        clips: Optional[List[Clip]] = None,
+        muted: bool = False,
+        visible: bool = True,
+        load: Optional[Callable[[], List[Clip]]] = None,
+        clip_count: int = 0,
+    ) -> None:
+        self._load: Optional[Callable[[], List[Clip]]] = load if clips is None else None
+        self._clips: Optional[List[Clip]] = None
+        self._lock = threading.Lock()
+        self.clip_count = int(clip_count)
+        Track.__init__(self, id=id, name=name, kind=kind, clips=clips, muted=muted, visible=visible)  # type: ignore[arg-type]
+
+    def __reduce__(self):
+        # The lock and loader can't be copied or pickled; hand over the clips.
+        return (LazyTrack, (self.id, self.name, self.kind, list(self.clips), self.muted, self.visible))
+
+    @property
+    def loaded(self) -> bool:
+        return self._load is None
+
+    @property  # type: ignore[override]
+    def clips(self) -> List[Clip]:
+        if self._load is not None:
+            with self._lock:
+                if self._load is not None:
+                    self._clips = self._load()
+                    self._load = None
+        return self._clips  # type: ignore[return-value]
+
+    @clips.setter
+    def clips(self, value: Optional[List[Clip]]) -> None:
+        if value is None and self._load is not None:
+            return  # dataclass __init__ placeholder; keep the block lazy
+        self._clips = list(value or [])
+        self._load = None
+        self.clip_count = len(self._clips)
+
+
+def _container_bytes(project: Project) -> bytes:
+    sources: Dict[str, int] = {}
+    blocks: List[bytes] = []
+    metas: List[Dict[str, Any]] = []
+    for t in project.tracks:
+        d = t.to_compact(sources)
+        clips = d.pop("clips")
+        block = zlib.compress(json.dumps(clips, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 6)
+        d["clip_count"] = len(clips)
+        d["length"] = len(block)
+        metas.append(d)
+        blocks.append(block)
+
+    offset = 0
+    for d in metas:
+        d["offset"] = offset
+        offset += d["length"]
+    header = {"version": PROJECT_SCHEMA_VERSION, "fps": project.fps, "sources": list(sources), "tracks": metas}
+    head = zlib.compress(json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 6)
+    return b"".join([_CONTAINER_HEAD.pack(_CONTAINER_MAGIC, len(head)), head, *blocks])
+
+
+def _project_from_container(raw: bytes) -> Project:
+    magic, head_len = _CONTAINER_HEAD.unpack_from(raw, 0)
+    if magic != _CONTAINER_MAGIC:
+        raise ValueError("Not a MiniCut container")
+    start = _CONTAINER_HEAD.size
+    header = json.loads(zlib.decompress(raw[start : start + head_len]).decode("utf-8"))
+    version = int(header.get("version", 0))
+    if version > PROJECT_SCHEMA_VERSION:
+        raise ValueError(f"Project file version {version} is newer than supported ({PROJECT_SCHEMA_VERSION})")
+    sources = [str(x) for x in header.get("sources", [])]
+    data_start = start + head_len
+
+    def _block_loader(offset: int, length: int) -> Callable[[], List[Clip]]:
+        block = raw[data_start + offset : data_start + offset + length]
+
+        def _load() -> List[Clip]:
+            rows = json.loads(zlib.decompress(block).decode("utf-8"))
+            return [Clip.from_compact(c, sources) for c in rows]
+
+        return _load
+
+    tracks: List[Track] = []
+    for meta in header.get("tracks", []):
+        if not isinstance(meta, dict):
+            continue
+        plain = Track.from_dict({**meta, "clips": []})
+        tracks.append(
+            LazyTrack(
+                id=plain.id,
+                name=plain.name,
+                kind=plain.kind,
+                load=_block_loader(int(meta["offset"]), int(meta["length"])),
+                clip_count=int(meta.get("clip_count", 0)),
+                muted=plain.muted,
+                visible=plain.visible,
+            )
+        )
+
+    return _adopt_tracks(int(header.get("fps", 30)), tracks)
+
+
+def _adopt_tracks(fps: int, tracks: List[Track]) -> Project:
+    # The Project constructor copies Track objects (reading their clips), which
+    # would decode every lazy track; adopt them as they are instead.
+    project = Project(fps=fps, tracks=[])
+    project.tracks = list(tracks)
+    project._ensure_minimum_tracks()
+    project._normalize_track_order()
+    return project
+
+
+def journal_path(project_path: str) -> Path:
+    p = Path(project_path)
+    return p.with_name(p.name + JOURNAL_SUFFIX)
+
+
+def has_journal(project_path: str) -> bool:
+    """True if `project_path` has journaled edits that `load_project` would replay."""
+    return bool(_read_journal(Path(project_path)))
+
+
+def project_from_snapshot(snapshot: ProjectSnapshot) -> Project:
+    return Project(
+        fps=snapshot.fps,
+        tracks=[
+            Track(id=ts.id, name=ts.name, kind=ts.kind, clips=list(ts.clips), muted=ts.muted, visible=ts.visible)
+            for ts in snapshot.tracks
+        ],
+    )
+
+
+def _base_fingerprint(project_path: Path) -> Optional[Dict[str, int]]:
+    try:
+        st = project_path.stat()
+    except Exception:
+        return None
+    return {"size": int(st.st_size), "mtime_ns": int(st.st_mtime_ns)}
+
+
+def _read_journal(project_path: Path) -> List[Dict[str, Any]]:
+    """
+    Journal records that apply to the current main file.
+
+    A journal written against an older version of the main file is ignored,
+    and a torn last line (crash mid-append) ends the replay.
+    """
+    return [rec for _line, rec in _journal_entries(project_path)]
+
+
+def _journal_entries(project_path: Path) -> List[Tuple[str, Dict[str, Any]]]:
+    """(raw line, record) pairs of the valid journal prefix, header excluded."""
+    try:
+        lines = journal_path(str(project_path)).read_text(encoding="utf-8").splitlines()
+    except Exception:
+        return []
+    if not lines:
+        return []
+    try:
+        header = json.loads(lines[0])
+    except Exception:
+        return []
+    if not isinstance(header, dict) or header.get("journal") != JOURNAL_VERSION:
+        return []
+    if header.get("base") != _base_fingerprint(project_path):
+        return []
+
+    entries: List[Tuple[str, Dict[str, Any]]] = []
+    for line in lines[1:]:
+        try:
+            rec = json.loads(line)
+        except Exception:
+            break
+        if not isinstance(rec, dict):
+            break
+        entries.append((line, rec))
+    return entries
+
+
+def _replay_journal(project: Project, project_path: Path) -> Project:
+    records = _read_journal(project_path)
+    if not records:
+        return project
+    fps = project.fps
+    tracks: Dict[str, Track] = {t.id: t for t in project.tracks}
+    order: List[str] = list(tracks)
+    for rec in records:
+        changed = rec.get("tracks")
+        if isinstance(changed, dict):
+            tracks.update({str(k): Track.from_dict(v) for k, v in changed.items() if isinstance(v, dict)})
+        if isinstance(rec.get("order"), list):
+            order = [str(x) for x in rec["order"]]
+        fps = int(rec.get("fps", fps))
+    return _adopt_tracks(fps, [tracks[tid] for tid in order if tid in tracks])
+
+
+class ProjectJournal:
+    """
+    Append-only autosave journal kept next to a project file.
+
+    `append()` writes one JSON line holding only the tracks that changed since
+    the previous append (snapshot tracks are compared by identity, see
+    `snapshot_project`). `compact()` folds everything into the main JSON and
+    drops the journal. Both are safe to call from a worker thread.
+    """
+
+    def __init__(self, project_path: str, compact_every: int = 30, compact_bytes: int = 4 * 1024 * 1024) -> None:
+        self.project_path = Path(project_path)
+        self.path = journal_path(project_path)
+        self.compact_every = max(1, int(compact_every))
+        self.compact_bytes = max(0, int(compact_bytes))
+        self.last: Optional[ProjectSnapshot] = None
+        self._records = 0
+        self._lock = threading.Lock()
+
+    def reset(self, snapshot: Optional[ProjectSnapshot]) -> None:
+        """Use `snapshot` (e.g. the freshly loaded project) as the journal baseline."""
+        with self._lock:
+            self.last = snapshot
+            self._records = self._repair_unlocked()
+
+    def _repair_unlocked(self) -> int:
+        """
+        Cut the journal back to its valid prefix and return its record count.
+
+        Appending after a torn last line would glue the new record onto it,
+        and replay stops there, so every later autosave would be lost.
+        """
+        entries = _journal_entries(self.project_path)
+        if not entries:
+            return 0  # the next append starts a fresh journal
+        try:
+            raw = self.path.read_text(encoding="utf-8")
+            first = raw.split("\n", 1)[0]
+            good = "\n".join([first, *(line for line, _rec in entries)]) + "\n"
+            if raw != good:
+                tmp = self.path.with_name(self.path.name + ".tmp")
+                tmp.write_text(good, encoding="utf-8")
+                os.replace(tmp, self.path)
+        except Exception:
+            # Start over with a full snapshot rather than append to a bad tail.
+            self.last = None
+            return 0
+        return len(entries)
+
+    def append(self, snapshot: ProjectSnapshot) -> int:
+        """Journal the tracks that changed since the last append. Returns bytes written."""
+        with self._lock:
+            prev = {ts.id: ts for ts in self.last.tracks} if self.last is not None else {}
+            changed = {ts.id: _track_snapshot_dict(ts) for ts in snapshot.tracks if prev.get(ts.id) is not ts}
+            order = [ts.id for ts in snapshot.tracks]
+            if not changed and self.last is not None and order == [ts.id for ts in self.last.tracks] and snapshot.fps == self.last.fps:
+                return 0
+            rec = json.dumps({"fps": snapshot.fps, "order": order, "tracks": changed}, ensure_ascii=False, separators=(",", ":"))
+
+            lines: List[str] = []
+            if self._records == 0 or not self.path.exists():
+                header = {"journal": JOURNAL_VERSION, "base": _base_fingerprint(self.project_path)}
+                lines.append(json.dumps(header, separators=(",", ":")))
+                mode = "w"
+            else:
+                mode = "a"
+            lines.append(rec)
+            data = "\n".join(lines) + "\n"
+            with self.path.open(mode, encoding="utf-8") as fp:
+                fp.write(data)
+                fp.flush()
+                try:
+                    os.fsync(fp.fileno())
+                except Exception:
+                    pass
+            self.last = snapshot
+            self._records += 1
+            return len(data.encode("utf-8"))
+
+    def needs_compaction(self) -> bool:
+        if self._records >= self.compact_every:
+            return True
+        try:
+            return bool(self.compact_bytes) and self.path.stat().st_size >= self.compact_bytes
+        except Exception:
+            return False
+
+    def compact(self, snapshot: ProjectSnapshot) -> None:
+        """Write the full project to the main file and drop the journal."""
+        with self._lock:
+            save_project(project_from_snapshot(snapshot), str(self.project_path))
+            self._discard_unlocked()
+            self.last = snapshot
+
+    def discard(self) -> None:
+        with self._lock:
+            self._discard_unlocked()
+
+    def _discard_unlocked(self) -> None:
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+        self._records = 0
+
+
+def _track_snapshot_dict(ts: TrackSnapshot) -> Dict[str, Any]:
+    return Track(id=ts.id, name=ts.name, kind=ts.kind, clips=list(ts.clips), muted=ts.muted, visible=ts.visible).to_dict()
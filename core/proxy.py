@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from .media_cache import file_fingerprint, run_ffmpeg
+
+if TYPE_CHECKING:
+    from .ffmpeg import MediaInfo
+
+PROXY_HEIGHT = 540
+
+
+@dataclass(frozen=True)
+class ProxyPolicy:
+    """
+    Which sources are heavy enough to be edited through a proxy.
+
+    A source qualifies when it has video and exceeds any limit: frame size,
+    bitrate, or a codec that is expensive to decode/seek (long-GOP HEVC,
+    AV1, VP9, intermediate codecs).
+    """
+
+    max_width: int = 1920
+    max_height: int = 1080
+    max_video_bitrate: int = 25_000_000
+    heavy_codecs: Tuple[str, ...] = ("hevc", "h265", "av1", "vp9", "prores", "dnxhd", "cfhd")
+
+    def needs_proxy(self, info: "MediaInfo") -> bool:
+        if not info.has_video:
+            return False
+        if int(info.width or 0) > self.max_width or int(info.height or 0) > self.max_height:
+            return True
+        if int(info.video_bitrate or 0) > self.max_video_bitrate:
+            return True
+        return str(info.video_codec or "").strip().lower() in self.heavy_codecs
+
+
+def proxy_path(cache_dir: Path, src: str, height: int = PROXY_HEIGHT) -> Optional[Path]:
+    """Cache location of the proxy for `src` (keyed like thumbnails: path|mtime|size)."""
+    fp = file_fingerprint(Path(src))
+    if not fp:
+        return None
+    digest = hashlib.sha1(f"proxy|{fp}|{int(height)}".encode("utf-8", errors="ignore")).hexdigest()[:24]
+    return cache_dir / f"{digest}.mp4"
+
+
+def build_proxy_command(ffmpeg_path: str, src: str, out_path: str, height: int = PROXY_HEIGHT) -> List[str]:
+    """
+    Small H.264 proxy with a short GOP and no B-frames, so any frame is a
+    cheap seek away, plus faststart for browser playback. Timestamps and
+    duration follow the source, so clip in/out points apply unchanged.
+    """
+    h = max(90, int(height) // 2 * 2)
+    return [
+        ffmpeg_path,
+        "-y",
+        "-i",
+        str(src),
+        "-map",
+        "0:v:0",
+        "-map",
+        "0:a:0?",
+        "-vf",
+        f"scale=-2:'min({h},ih)':flags=bicubic",
+        "-c:v",
+        "libx264",
+        "-preset",
+        "veryfast",
+        "-tune",
+        "fastdecode",
+        "-crf",
+        "26",
+        "-g",
+        "12",
+        "-bf",
+        "0",
+        "-pix_fmt",
+        "yuv420p",
+        "-c:a",
+        "aac",
+        "-b:a",
+        "128k",
+        "-movflags",
+        "+faststart",
+        "-f",
+        "mp4",
+        str(out_path),
+    ]
+
+
+def generate_proxy(ffmpeg_path: str, src: str, cache_dir: Path, height: int = PROXY_HEIGHT) -> Optional[str]:
+    """
+    Create (or reuse) the cached proxy for `src`. Returns its path, or None.
+
+    The proxy is written to a temporary name and moved into place, so a
+    half-written file is never picked up as a finished proxy.
+    """
+    out = proxy_path(cache_dir, src, height)
+    if out is None:
+        return None
+    try:
+        if out.exists() and out.stat().st_size > 0:
+            return str(out)
+    except Exception:
+        pass
+    try:
+        out.parent.mkdir(parents=True, exist_ok=True)
+    except Exception:
+        return None
+    tmp = out.with_name(f"{out.stem}.{os.getpid()}.{threading.get_ident()}.part")
+    ok = run_ffmpeg(build_proxy_command(ffmpeg_path, src, str(tmp), height))
+    try:
+        if ok and tmp.exists() and tmp.stat().st_size > 0:
+            os.replace(tmp, out)
+            return str(out)
+    except Exception:
+        pass
+    try:
+        if tmp.exists():
+            tmp.unlink()
+    except Exception:
+        pass
+    return None
+
+
+class ProxyMap:
+    """
+    Thread-safe original <-> proxy mapping.
+
+    Clips always reference originals; preview code asks `proxy_for` and
+    export code asks `original_for` (which also repairs a clip that somehow
+    points at a proxy file).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._proxy: Dict[str, str] = {}
+        self._original: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._proxy)
+
+    def register(self, original: str, proxy: str) -> None:
+        with self._lock:
+            old = self._proxy.pop(original, None)
+            if old is not None:
+                self._original.pop(old, None)
+            self._proxy[original] = proxy
+            self._original[proxy] = original
+
+    def remove(self, original: str) -> None:
+        with self._lock:
+            proxy = self._proxy.pop(original, None)
+            if proxy is not None:
+                self._original.pop(proxy, None)
+
+    def proxy_for(self, src: str) -> Optional[str]:
+        with self._lock:
+            return self._proxy.get(src)
+
+    def original_for(self, src: str) -> str:
+        with self._lock:
+            return self._original.get(src, src)
+
+    def media_src(self, src: str) -> str:
+        """Path to decode for previews: the proxy when one is ready, else `src`."""
+        return self.proxy_for(src) or src
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set
+
+DEFAULT_FRAME_SEC = 1.0 / 60.0
+
+
+class FrameScheduler:
+    """
+    Coalesces UI updates into at most one commit per frame.
+
+    Handlers mark regions (timeline, inspector, ...) dirty with `invalidate`.
+    The first mark schedules a flush via `schedule(callback, delay_sec)`. The
+    flush runs the renderer of every dirty region in registration order and
+    then calls `commit` (e.g. `page.update`) once. A region without a
+    renderer is updated by its caller; marking it only requests the commit.
+
+    Calling `flush` directly commits early (the scheduled flush then does
+    nothing). Safe to call from any thread.
+    """
+
+    def __init__(
+        self,
+        commit: Callable[[], None],
+        schedule: Callable[[Callable[[], None], float], None],
+        frame_sec: float = DEFAULT_FRAME_SEC,
+        clock: Callable[[], float] = time.monotonic,
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ) -> None:
+        self._commit = commit
+        self._schedule = schedule
+        self.frame_sec = max(0.0, float(frame_sec))
+        self._clock = clock
+        self._on_error = on_error
+        self._lock = threading.RLock()
+        self._order: List[str] = []
+        self._renderers: Dict[str, Optional[Callable[[], None]]] = {}
+        self._dirty: Set[str] = set()
+        self._scheduled = False
+        self._last_commit: Optional[float] = None
+        self.commits = 0
+
+    def register(self, region: str, renderer: Optional[Callable[[], None]] = None) -> None:
+        with self._lock:
+            if region not in self._renderers:
+                self._order.append(region)
+            self._renderers[region] = renderer
+
+    def is_dirty(self, region: str) -> bool:
+        with self._lock:
+            return region in self._dirty
+
+    def invalidate(self, *regions: str) -> None:
+        with self._lock:
+            self._dirty.update(regions)
+            if self._scheduled:
+                return
+            self._scheduled = True
+            delay = 0.0
+            if self._last_commit is not None:
+                delay = max(0.0, self._last_commit + self.frame_sec - self._clock())
+        self._schedule(self.flush, delay)
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._scheduled and not self._dirty:
+                # Already flushed early by the caller; nothing left to send.
+                return
+        # Renderers may invalidate other regions (the timeline moves the
+        # playhead); a few passes fold those into this same commit.
+        for _ in range(3):
+            todo = self._take()
+            if not todo:
+                break
+            for region in todo:
+                self._render(region)
+        with self._lock:
+            self._dirty = {r for r in self._dirty if self._renderers.get(r) is not None}
+            again = bool(self._dirty)
+            self._scheduled = again
+            self._last_commit = self._clock()
+            self.commits += 1
+        try:
+            self._commit()
+        except Exception as ex:
+            self._report("commit", ex)
+        if again:
+            self._schedule(self.flush, self.frame_sec)
+
+    def _take(self) -> List[str]:
+        with self._lock:
+            todo = [r for r in self._order if r in self._dirty and self._renderers.get(r) is not None]
+            self._dirty.difference_update(todo)
+            return todo
+
+    def _render(self, region: str) -> None:
+        renderer = self._renderers.get(region)
+        if renderer is None:
+            return
+        try:
+            renderer()
+        except Exception as ex:
+            self._report(region, ex)
+
+    def _report(self, region: str, ex: Exception) -> None:
+        if self._on_error is not None:
+            try:
+                self._on_error(region, ex)
+            except Exception:
+                pass
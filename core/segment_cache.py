@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+DEFAULT_SEGMENT_CACHE_BYTES = 10 * 1024 * 1024 * 1024
+
+
+class SegmentCache:
+    """
+    Content-addressed store of rendered export segments.
+
+    Default location: ~/.minicut/segments
+
+    A segment file is named after its key (a hash of everything that affects
+    its pixels and samples), so an unchanged stretch of the timeline is found
+    again on the next export. Files are only published complete (rendered to
+    a `.part` name, then renamed), which also makes interrupted exports
+    resumable. Eviction is LRU by file mtime, which `get` refreshes, and keeps
+    the cache under `max_bytes`.
+    """
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_SEGMENT_CACHE_BYTES) -> None:
+        self.root = Path(root)
+        self.max_bytes = max(0, int(max_bytes))
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def default() -> "SegmentCache":
+        return SegmentCache(Path.home() / ".minicut" / "segments")
+
+    def path_for(self, key: str, ext: str) -> Path:
+        return self.root / key[:2] / f"{key}.{ext}"
+
+    def get(self, key: str, ext: str) -> Optional[Path]:
+        p = self.path_for(key, ext)
+        try:
+            if p.stat().st_size > 0:
+                os.utime(p)
+                with self._lock:
+                    self.hits += 1
+                return p
+        except Exception:
+            pass
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def part_path(self, key: str, ext: str) -> Path:
+        """Scratch path to render `key` into before `publish`."""
+        p = self.path_for(key, ext)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        return p.with_name(f"{key}.{os.getpid()}.{threading.get_ident()}.part.{ext}")
+
+    def publish(self, key: str, ext: str, part: Path) -> Path:
+        dst = self.path_for(key, ext)
+        os.replace(part, dst)
+        return dst
+
+    def size_bytes(self) -> int:
+        """Bytes used by published segments."""
+        total = 0
+        try:
+            files = list(self.root.glob("*/*"))
+        except Exception:
+            return 0
+        for p in files:
+            if ".part." in p.name:
+                continue
+            try:
+                total += p.stat().st_size
+            except Exception:
+                pass
+        return total
+
+    def clear(self) -> int:
+        """Delete every published segment. Returns bytes freed."""
+        freed = 0
+        try:
+            files = list(self.root.glob("*/*"))
+        except Exception:
+            return 0
+        for p in files:
+            if ".part." in p.name:
+                continue  # may belong to a running export
+            try:
+                freed += self._unlink(p, p.stat().st_size)
+            except Exception:
+                pass
+        return freed
+
+    def evict(self, keep: Iterable[Path] = ()) -> int:
+        """Drop least recently used segments until under `max_bytes`. Returns bytes freed."""
+        pinned = {Path(p).resolve() for p in keep}
+        entries: List[Tuple[float, int, Path]] = []
+        total = 0
+        stale_before = time.time() - 24 * 3600
+        try:
+            files = list(self.root.glob("*/*"))
+        except Exception:
+            return 0
+        freed = 0
+        for p in files:
+            try:
+                st = p.stat()
+            except Exception:
+                continue
+            if ".part." in p.name:
+                # Leftovers of a crashed render; fresh ones may still be in use.
+                if st.st_mtime < stale_before:
+                    freed += self._unlink(p, st.st_size)
+                continue
+            total += st.st_size
+            entries.append((st.st_mtime, st.st_size, p))
+        entries.sort()
+        for _mtime, size, p in entries:
+            if not self.max_bytes or total <= self.max_bytes:
+                break
+            if p.resolve() in pinned:
+                continue
+            n = self._unlink(p, size)
+            total -= n
+            freed += n
+        return freed
+
+    @staticmethod
+    def _unlink(p: Path, size: int) -> int:
+        try:
+            p.unlink()
+            return size
+        except Exception:
+            return 0
@@ -13,6 +13,7 @@ ACTION_SAVE = "save"
 ACTION_UNDO = "undo"
 ACTION_REDO = "redo"
 ACTION_EXPORT = "export"
+ACTION_DRAFT_RENDER = "draft_render"
 ACTION_IMPORT = "import"
 ACTION_DUPLICATE = "duplicate"
 ACTION_ZOOM_IN = "zoom_in"
@@ -73,6 +74,8 @@ def resolve_shortcut_action(
         return ACTION_REDO
     if primary_mod and k == "s":
         return ACTION_SAVE
+    if primary_mod and shift and k == "e":
+        return ACTION_DRAFT_RENDER
     if primary_mod and k == "e":
         return ACTION_EXPORT
     if primary_mod and k == "i":
@@ -121,6 +124,7 @@ def shortcut_legend() -> List[Tuple[str, str]]:
         ("Ctrl/Cmd + Y", "Redo"),
         ("Ctrl/Cmd + Shift + Z", "Redo"),
         ("Ctrl/Cmd + E", "Export"),
+        ("Ctrl/Cmd + Shift + E", "Draft render around playhead / selected clip"),
         ("Ctrl/Cmd + I", "Import files"),
         ("Ctrl/Cmd + D", "Duplicate selected clip"),
         ("F1 or ?", "Show shortcuts help"),
@@ -1,38 +1,12 @@
 from __future__ import annotations
 
-import hashlib
-import subprocess
+import json
+import math
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 
-
-def _file_fingerprint(src_path: Path) -> Optional[str]:
-    try:
-        st = src_path.stat()
-        return f"{src_path.resolve()}|{st.st_mtime_ns}|{st.st_size}"
-    except Exception:
-        return None
-
-
-def _cache_png_path(cache_dir: Path, key: str) -> Path:
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    digest = hashlib.sha1(key.encode("utf-8", errors="ignore")).hexdigest()[:24]
-    return cache_dir / f"{digest}.png"
-
-
-def _run_ffmpeg(cmd: list[str]) -> bool:
-    try:
-        subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-            check=True,
-        )
-        return True
-    except Exception:
-        return False
+from .media_cache import cache_file_path, file_fingerprint, run_ffmpeg
 
 
 def generate_thumbnail(
@@ -49,7 +23,7 @@ def generate_thumbnail(
     if not src_path.exists():
         return None
 
-    fp = _file_fingerprint(src_path)
+    fp = file_fingerprint(src_path)
     if not fp:
         return None
 
@@ -59,7 +33,7 @@ def generate_thumbnail(
         t = 0.0
     w = max(16, int(width or 320))
 
-    out = _cache_png_path(cache_dir, f"thumb|{fp}|{t:.3f}|{w}")
+    out = cache_file_path(cache_dir, f"thumb|{fp}|{t:.3f}|{w}")
     try:
         if out.exists() and out.stat().st_size > 0:
             return str(out)
@@ -79,7 +53,7 @@ def generate_thumbnail(
         f"scale={w}:-1:flags=lanczos",
         str(out),
     ]
-    if not _run_ffmpeg(cmd):
+    if not run_ffmpeg(cmd):
         try:
             if out.exists():
                 out.unlink()
@@ -109,7 +83,7 @@ def generate_waveform(
     if not src_path.exists():
         return None
 
-    fp = _file_fingerprint(src_path)
+    fp = file_fingerprint(src_path)
     if not fp:
         return None
 
@@ -128,7 +102,7 @@ def generate_waveform(
     h = max(12, int(height or 48))
     color = str(color_hex or "0x84D1FF")
 
-    out = _cache_png_path(cache_dir, f"wave|{fp}|{t:.3f}|{dur:.3f}|{w}|{h}|{color}")
+    out = cache_file_path(cache_dir, f"wave|{fp}|{t:.3f}|{dur:.3f}|{w}|{h}|{color}")
     try:
         if out.exists() and out.stat().st_size > 0:
             return str(out)
@@ -151,7 +125,7 @@ def generate_waveform(
         filter_expr,
         str(out),
     ]
-    if not _run_ffmpeg(cmd):
+    if not run_ffmpeg(cmd):
         try:
             if out.exists():
                 out.unlink()
@@ -163,3 +137,171 @@ def generate_waveform(
     except Exception:
         return None
 
+
+
+_FILMSTRIP_VERSION = 1
+
+
+@dataclass(frozen=True)
+class FilmstripIndex:
+    """
+    Per-source filmstrip: frames sampled every `interval_sec`, tiled row-major
+    into sprite sheets of `cols` x `rows` tiles of `tile_w` x `tile_h` pixels.
+    """
+
+    interval_sec: float
+    tile_w: int
+    tile_h: int
+    cols: int
+    rows: int
+    frame_count: int
+    sheets: Tuple[str, ...]
+
+    def frame_at(self, sec: float) -> Tuple[str, int, int]:
+        """Sheet path and tile (x, y) offset of the frame nearest to `sec`."""
+        try:
+            t = max(0.0, float(sec))
+        except Exception:
+            t = 0.0
+        idx = int(round(t / self.interval_sec)) if self.interval_sec > 0 else 0
+        idx = max(0, min(self.frame_count - 1, idx))
+        per_sheet = self.cols * self.rows
+        sheet = min(len(self.sheets) - 1, idx // per_sheet)
+        cell = idx - sheet * per_sheet
+        return self.sheets[sheet], (cell % self.cols) * self.tile_w, (cell // self.cols) * self.tile_h
+
+    def to_dict(self) -> dict:
+        return {
+            "version": _FILMSTRIP_VERSION,
+            "interval_sec": self.interval_sec,
+            "tile_w": self.tile_w,
+            "tile_h": self.tile_h,
+            "cols": self.cols,
+            "rows": self.rows,
+            "frame_count": self.frame_count,
+            "sheets": [Path(p).name for p in self.sheets],
+        }
+
+    @staticmethod
+    def from_dict(d: dict, sheet_dir: Path) -> Optional["FilmstripIndex"]:
+        try:
+            if int(d.get("version", 0)) != _FILMSTRIP_VERSION:
+                return None
+            sheets = tuple(str(sheet_dir / str(name)) for name in d.get("sheets", []))
+            out = FilmstripIndex(
+                interval_sec=float(d["interval_sec"]),
+                tile_w=int(d["tile_w"]),
+                tile_h=int(d["tile_h"]),
+                cols=int(d["cols"]),
+                rows=int(d["rows"]),
+                frame_count=int(d["frame_count"]),
+                sheets=sheets,
+            )
+        except Exception:
+            return None
+        if not out.sheets or out.frame_count <= 0 or out.interval_sec <= 0:
+            return None
+        if not all(Path(p).exists() for p in out.sheets):
+            return None
+        return out
+
+
+def generate_filmstrip(
+    ffmpeg_path: str,
+    src: str,
+    cache_dir: Path,
+    duration: Optional[float] = None,
+    interval_sec: float = 1.0,
+    tile_width: int = 160,
+    cols: int = 10,
+    rows: int = 10,
+    max_frames: int = 1200,
+) -> Optional[FilmstripIndex]:
+    """
+    Generate (or reuse) tiled sprite sheets covering a whole source in one
+    decode pass, plus a small JSON index for frame lookups.
+
+    When `duration` is known the interval grows so long sources stay within
+    `max_frames`; it also bounds the frame count used by lookups.
+    """
+    src_path = Path(src)
+    if not src_path.exists():
+        return None
+
+    fp = file_fingerprint(src_path)
+    if not fp:
+        return None
+
+    try:
+        dur = max(0.0, float(duration)) if duration is not None else 0.0
+    except Exception:
+        dur = 0.0
+    interval = max(0.1, float(interval_sec or 1.0))
+    if dur > 0 and max_frames > 0:
+        interval = max(interval, dur / float(max_frames))
+    tw = max(16, int(tile_width or 160))
+    tw -= tw % 2
+    th = max(10, int(round(tw * 9 / 16)))
+    th -= th % 2
+    cols = max(1, int(cols))
+    rows = max(1, int(rows))
+
+    key = f"strip|{fp}|{interval:.4f}|{tw}x{th}|{cols}x{rows}"
+    index_path = cache_file_path(cache_dir, key, ".json")
+    stem = index_path.stem
+    try:
+        cached = FilmstripIndex.from_dict(json.loads(index_path.read_text(encoding="utf-8")), cache_dir)
+        if cached is not None:
+            return cached
+    except Exception:
+        pass
+
+    filter_expr = (
+        f"fps=1/{interval:.6f},"
+        f"scale={tw}:{th}:force_original_aspect_ratio=decrease:flags=bilinear,"
+        f"pad={tw}:{th}:(ow-iw)/2:(oh-ih)/2:color=black,"
+        f"tile={cols}x{rows}"
+    )
+    pattern = cache_dir / f"{stem}_%04d.jpg"
+    cmd = [
+        ffmpeg_path,
+        "-y",
+        "-i",
+        str(src_path),
+        "-an",
+        "-vf",
+        filter_expr,
+        "-vsync",
+        "vfr",
+        "-q:v",
+        "5",
+        str(pattern),
+    ]
+    ok = run_ffmpeg(cmd)
+    sheets: List[Path] = sorted(cache_dir.glob(f"{stem}_*.jpg"))
+    if not ok or not sheets:
+        for sp in sheets:
+            try:
+                sp.unlink()
+            except Exception:
+                pass
+        return None
+
+    capacity = len(sheets) * cols * rows
+    frame_count = capacity
+    if dur > 0:
+        frame_count = max(1, min(capacity, int(math.floor(dur / interval)) + 1))
+    index = FilmstripIndex(
+        interval_sec=interval,
+        tile_w=tw,
+        tile_h=th,
+        cols=cols,
+        rows=rows,
+        frame_count=frame_count,
+        sheets=tuple(str(p) for p in sheets),
+    )
+    try:
+        index_path.write_text(json.dumps(index.to_dict()), encoding="utf-8")
+    except Exception:
+        pass
+    return index
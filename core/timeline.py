@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
 from dataclasses import replace
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from .model import Clip, Transition, new_id, normalize_speed, transition_overlap_sec
 
@@ -87,13 +88,146 @@ def insert_clip_before(
     return _normalize_transitions(out)
 
 
-def find_clip(clips: List[Clip], clip_id: str) -> Optional[Clip]:
+class TimelineIndex:
+    """
+    Start/end times of a clip list with O(log n) time -> clip lookups.
+
+    Starts are prefix sums of clip durations minus transition overlaps, so they
+    agree with `total_duration` and the export. Timeline edits return new lists
+    that reuse untouched `Clip` objects, so `update()` only recomputes from the
+    first position whose clip changed; an unchanged list object is a no-op.
+    """
+
+    def __init__(self, clips: Optional[List[Clip]] = None) -> None:
+        self.clips: List[Clip] = []
+        self.starts: List[float] = []
+        self.ends: List[float] = []
+        self._durs: List[float] = []
+        self._pos: Dict[str, int] = {}
+        self._source: Optional[List[Clip]] = None
+        self.update(clips or [])
+
+    def update(self, clips: List[Clip]) -> "TimelineIndex":
+        if clips is self._source and len(clips) == len(self.clips):
+            return self
+        old = self.clips
+        new = list(clips)
+        first = 0
+        limit = min(len(old), len(new))
+        while first < limit and old[first] is new[first]:
+            first += 1
+
+        for c in old[first:]:
+            if self._pos.get(c.id, -1) >= first:
+                del self._pos[c.id]
+        del self.starts[first:]
+        del self.ends[first:]
+        del self._durs[first:]
+
+        for i in range(first, len(new)):
+            c = new[i]
+            dur = float(c.dur)
+            if i == 0:
+                start = 0.0
+            else:
+                start = self.ends[i - 1] - transition_overlap_sec(new[i - 1], c)
+            self.starts.append(start)
+            self.ends.append(start + dur)
+            self._durs.append(dur)
+            self._pos[c.id] = i
+
+        self.clips = new
+        self._source = clips
+        return self
+
+    def __len__(self) -> int:
+        return len(self.clips)
+
+    @property
+    def total(self) -> float:
+        return max(0.0, self.ends[-1]) if self.ends else 0.0
+
+    def position_of(self, clip_id: str) -> Optional[int]:
+        return self._pos.get(clip_id)
+
+    def get(self, clip_id: str) -> Optional[Clip]:
+        i = self._pos.get(clip_id)
+        return self.clips[i] if i is not None else None
+
+    def start_of(self, clip_id: str) -> Optional[float]:
+        i = self._pos.get(clip_id)
+        return self.starts[i] if i is not None else None
+
+    def dur_at(self, index: int) -> float:
+        return self._durs[index]
+
+    def locate(self, timeline_sec: float) -> Optional[Tuple[int, float]]:
+        """
+        (index, seconds into that clip) for a global time, or None if out of
+        range. Inside a transition the incoming clip wins.
+        """
+        if not self.clips:
+            return None
+        t = float(timeline_sec)
+        if t < 0.0 or t > self.ends[-1] + 1e-9:
+            return None
+        i = max(0, bisect_right(self.starts, t) - 1)
+        rel = max(0.0, min(self._durs[i], t - self.starts[i]))
+        return i, rel
+
+    def edge_points(self) -> List[float]:
+        points: List[float] = [0.0]
+        for start, end in zip(self.starts, self.ends):
+            points.append(start)
+            points.append(end)
+        return points
+
+
+def find_clip(clips: List[Clip], clip_id: str, index: Optional[TimelineIndex] = None) -> Optional[Clip]:
+    if index is not None:
+        return index.update(clips).get(clip_id)
     for c in clips:
         if c.id == clip_id:
             return c
     return None
 
 
+def visible_span(starts: List[float], ends: List[float], left: float, right: float) -> Tuple[int, int]:
+    """
+    Index range [lo, hi) of laid-out items that intersect the window [left, right).
+
+    `starts` and `ends` must both be ascending (items laid out side by side).
+    """
+    if right <= left:
+        return 0, 0
+    lo = bisect_right(ends, left)
+    hi = bisect_left(starts, right)
+    return lo, max(lo, hi)
+
+
+def span_spacers(starts: List[float], ends: List[float], lo: int, hi: int, gap: float) -> Tuple[float, float]:
+    """
+    Widths of the spacers that stand in for items [0, lo) and [hi, n) when
+    only the `visible_span` items are realized; items sit `gap` apart.
+
+    0.0 means no spacer. A window past the last item (`lo == n`) puts all
+    items into the lead spacer.
+    """
+    n = len(starts)
+    if n == 0:
+        return 0.0, 0.0
+    lo = max(0, min(int(lo), n))
+    hi = max(lo, min(int(hi), n))
+    if lo >= n:
+        lead = ends[-1]
+    elif lo > 0:
+        lead = starts[lo] - gap
+    else:
+        lead = 0.0
+    tail = ends[-1] - starts[hi] if hi < n else 0.0
+    return lead, tail
+
+
 def split_clip(
     clips: List[Clip],
     clip_id: str,
@@ -151,28 +285,23 @@ def split_clip_at_timeline_sec(
     clips: List[Clip],
     timeline_sec: float,
     min_piece_sec: float = 0.08,
+    index: Optional[TimelineIndex] = None,
 ) -> Tuple[List[Clip], Optional[str], str]:
     """
-    Split the clip that intersects a global linear timeline time.
+    Split the clip that intersects a global timeline time.
 
-    The timeline is treated as a simple sum of clip durations (no gaps).
+    Clip starts account for transition overlaps (see `TimelineIndex`); pass a
+    kept-up-to-date `index` to skip rebuilding it.
     """
     if not clips:
         return clips, None, "Track is empty"
 
-    t = float(timeline_sec)
-    if t < 0.0:
+    idx = index.update(clips) if index is not None else TimelineIndex(clips)
+    hit = idx.locate(timeline_sec)
+    if hit is None:
         return clips, None, "Split position is out of range"
-
-    acc = 0.0
-    for c in clips:
-        start = acc
-        end = acc + float(c.dur)
-        if t <= end + 1e-9:
-            rel = t - start
-            return split_clip(clips, c.id, rel, min_piece_sec=min_piece_sec)
-        acc = end
-    return clips, None, "Split position is out of range"
+    i, rel = hit
+    return split_clip(clips, idx.clips[i].id, rel, min_piece_sec=min_piece_sec)
 
 
 def move_clip_before(clips: List[Clip], moving_id: str, target_id: str) -> List[Clip]:
@@ -0,0 +1,113 @@
+import os
+import tempfile
+import unittest
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from core.asset_server import RangeFileServer, link_asset, parse_range, prune_asset_copies
+
+
+class TestParseRange(unittest.TestCase):
+    def test_forms(self):
+        self.assertIsNone(parse_range(None, 100))
+        self.assertEqual(parse_range("bytes=0-9", 100), (0, 9))
+        self.assertEqual(parse_range("bytes=90-", 100), (90, 99))
+        self.assertEqual(parse_range("bytes=-10", 100), (90, 99))
+        self.assertEqual(parse_range("bytes=50-500", 100), (50, 99))
+        self.assertIsNone(parse_range("bytes=0-1,5-6", 100))
+        with self.assertRaises(ValueError):
+            parse_range("bytes=100-", 100)
+
+
+class TestRangeFileServer(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.root = Path(self._td.name)
+        self.src = self.root / "clip one.mp4"
+        self.payload = bytes(range(256)) * 64
+        self.src.write_bytes(self.payload)
+        self.server = RangeFileServer()
+
+    def tearDown(self) -> None:
+        self.server.close()
+        self._td.cleanup()
+
+    def _get(self, url: str, headers=None):
+        req = urllib.request.Request(url, headers=headers or {})
+        with urllib.request.urlopen(req, timeout=5) as resp:
+            return resp.status, dict(resp.headers), resp.read()
+
+    def test_streams_whole_file_and_ranges(self):
+        url = self.server.register(self.src)
+        status, headers, body = self._get(url)
+        self.assertEqual(status, 200)
+        self.assertEqual(body, self.payload)
+        self.assertEqual(headers["Accept-Ranges"], "bytes")
+        self.assertEqual(headers["Content-Type"], "video/mp4")
+
+        status, headers, body = self._get(url, {"Range": "bytes=100-199"})
+        self.assertEqual(status, 206)
+        self.assertEqual(body, self.payload[100:200])
+        self.assertEqual(headers["Content-Range"], f"bytes 100-199/{len(self.payload)}")
+
+    def test_url_uses_public_host(self):
+        server = RangeFileServer(host="0.0.0.0")
+        try:
+            self.assertTrue(server.register(self.src).startswith("http://127.0.0.1:"))
+        finally:
+            server.close()
+        server = RangeFileServer(host="0.0.0.0", public_host="editor.lan")
+        try:
+            self.assertTrue(server.register(self.src).startswith("http://editor.lan:"))
+        finally:
+            server.close()
+
+    def test_unknown_token_and_bad_range(self):
+        url = self.server.register(self.src)
+        base = url.rsplit("/", 2)[0]
+        with self.assertRaises(urllib.error.HTTPError) as cm:
+            self._get(f"{base}/nope/x.mp4")
+        self.assertEqual(cm.exception.code, 404)
+        with self.assertRaises(urllib.error.HTTPError) as cm:
+            self._get(url, {"Range": f"bytes={len(self.payload)}-"})
+        self.assertEqual(cm.exception.code, 416)
+
+
+class TestLinkAsset(unittest.TestCase):
+    def test_links_without_copying(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            src = root / "a.png"
+            src.write_bytes(b"png")
+            dst = root / "assets" / "x" / "a.png"
+            if not link_asset(src, dst):
+                self.skipTest("filesystem does not support hard links")
+            self.assertTrue(os.path.samefile(src, dst))
+            # Re-linking the same file is a no-op; a stale file is replaced.
+            self.assertTrue(link_asset(src, dst))
+            other = root / "b.png"
+            other.write_bytes(b"other")
+            self.assertTrue(link_asset(other, dst))
+            self.assertEqual(dst.read_bytes(), b"other")
+
+
+    def test_prune_removes_copies_but_keeps_links(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            src = root / "a.png"
+            src.write_bytes(b"png")
+            bucket = root / "assets" / "_preview_cache"
+            bucket.mkdir(parents=True)
+            copy = bucket / "old.png"
+            copy.write_bytes(b"copy")
+            linked = bucket / "new.png"
+            if not link_asset(src, linked):
+                self.skipTest("filesystem does not support hard links")
+            self.assertEqual(prune_asset_copies(bucket), 4)
+            self.assertFalse(copy.exists())
+            self.assertTrue(linked.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
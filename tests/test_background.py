@@ -0,0 +1,93 @@
+import threading
+import unittest
+
+from core.background import PriorityLoader
+
+
+class TestPriorityLoader(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loader = PriorityLoader(workers=1, name="test-loader")
+
+    def tearDown(self) -> None:
+        self.loader.close()
+
+    def _block_worker(self) -> threading.Event:
+        release = threading.Event()
+        started = threading.Event()
+
+        def _blocker():
+            started.set()
+            release.wait(timeout=5.0)
+            return "blocker"
+
+        self.loader.request("blocker", _blocker)
+        self.assertTrue(started.wait(timeout=5.0))
+        return release
+
+    def test_runs_lowest_priority_first(self):
+        release = self._block_worker()
+        order = []
+        done = threading.Event()
+        for key, prio in (("far", 900.0), ("selected", -1.0), ("near", 10.0)):
+            self.loader.request(key, lambda k=key: k, lambda r: (order.append(r), len(order) == 3 and done.set()), prio)
+        release.set()
+        self.assertTrue(done.wait(timeout=5.0))
+        self.assertEqual(order, ["selected", "near", "far"])
+
+    def test_reprioritize_follows_the_viewport(self):
+        release = self._block_worker()
+        order = []
+        done = threading.Event()
+        for key, prio in (("start", 0.0), ("middle", 50.0), ("minute50", 3000.0)):
+            self.loader.request(key, lambda k=key: k, lambda r: (order.append(r), len(order) == 3 and done.set()), prio)
+        # Scrolled to minute 50: what's on screen first, the rest by distance.
+        self.assertEqual(self.loader.reprioritize({"minute50": 0.0, "middle": 2950.0}, default=float("inf")), 3)
+        release.set()
+        self.assertTrue(done.wait(timeout=5.0))
+        self.assertEqual(order, ["minute50", "middle", "start"])
+
+    def test_duplicate_requests_share_one_run_and_keep_best_priority(self):
+        release = self._block_worker()
+        calls = []
+        results = []
+        done = threading.Event()
+
+        def _work():
+            calls.append(1)
+            return 42
+
+        def _on_done(r):
+            results.append(r)
+            if len(results) == 2:
+                done.set()
+
+        self.loader.request("other", lambda: "other", None, 5.0)
+        self.loader.request("strip", _work, _on_done, 100.0)
+        self.loader.request("strip", _work, _on_done, 1.0)  # now ahead of "other"
+        self.assertTrue(self.loader.is_pending("strip"))
+        order = []
+        other_done = threading.Event()
+        self.loader.request("other", lambda: "other", lambda r: (order.append("other"), other_done.set()), 5.0)
+        self.loader.request("strip", _work, lambda r: order.append("strip"), 100.0)
+        release.set()
+        self.assertTrue(done.wait(timeout=5.0))
+        self.assertTrue(other_done.wait(timeout=5.0))
+        self.assertEqual(calls, [1])
+        self.assertEqual(results, [42, 42])
+        self.assertEqual(order[0], "strip")
+
+    def test_job_errors_yield_none_and_callback_errors_are_swallowed(self):
+        got = []
+        done = threading.Event()
+
+        def _boom():
+            raise RuntimeError("ffmpeg failed")
+
+        self.loader.request("bad", _boom, lambda r: (_ for _ in ()).throw(ValueError("ui gone")))
+        self.loader.request("bad2", _boom, lambda r: (got.append(r), done.set()))
+        self.assertTrue(done.wait(timeout=5.0))
+        self.assertEqual(got, [None])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,10 @@
 import json
+import os
 import tempfile
+import threading
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 from core.config import ConfigStore
 
@@ -75,6 +78,54 @@ class TestConfigStore(unittest.TestCase):
             store.set_last_export_dir(str(export_path))
             self.assertEqual(Path(store.last_export_dir()), exp_dir.resolve())
 
+    def test_reads_are_cached_until_file_changes(self):
+        with tempfile.TemporaryDirectory() as td:
+            store = ConfigStore(Path(td))
+            store.save({"recent": [], "auto_save_interval_sec": 30})
+            with patch.object(Path, "read_text", side_effect=AssertionError("re-read")):
+                for _ in range(5):
+                    self.assertEqual(store.auto_save_interval_sec(), 30)
+                    store.recent_projects()
+
+            # Another process rewrites the file: picked up via mtime/size.
+            store.path.write_text(json.dumps({"auto_save_interval_sec": 120}), encoding="utf-8")
+            self.assertEqual(store.auto_save_interval_sec(), 120)
+
+    def test_batch_merges_updates_into_one_atomic_write(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            store = ConfigStore(root)
+            with patch("core.config.os.replace", wraps=os.replace) as replace:
+                with store.batch():
+                    store.add_recent_project(str(root / "a.json"))
+                    store.set_last_project_dir(str(root))
+                    store.set_last_export_dir(str(root))
+                    self.assertFalse(store.path.exists())
+                    self.assertEqual(len(store.recent_projects()), 1)
+                self.assertEqual(replace.call_count, 1)
+
+                # Unchanged values don't rewrite the file.
+                store.set_last_project_dir(str(root))
+                self.assertEqual(replace.call_count, 1)
+            data = json.loads(store.path.read_text(encoding="utf-8"))
+            self.assertEqual(data["last_export_dir"], str(root.resolve()))
+            self.assertEqual([p.name for p in root.iterdir()], ["config.json"])
+
+    def test_concurrent_updates_are_not_lost(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            store = ConfigStore(root)
+
+            def _add(i: int) -> None:
+                store.add_recent_project(str(root / f"p{i}.json"))
+
+            threads = [threading.Thread(target=_add, args=(i,)) for i in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            self.assertEqual(len(ConfigStore(root).recent_projects(limit=10)), 8)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+from unittest.mock import patch
+
+from core.ffmpeg import MediaInfo, build_export_command, build_export_command_project
+from core.model import Clip, Track
+
+
+class TestFFmpegInputSeek(unittest.TestCase):
+    def test_default_mode_opens_each_source_once(self):
+        clips = [
+            Clip(id="c1", src="long.mp4", in_sec=3300.0, out_sec=3303.0),
+            Clip(id="c2", src="long.mp4", in_sec=10.0, out_sec=12.0),
+        ]
+        cmd = build_export_command("ffmpeg", clips, "out.mp4")
+        self.assertEqual(cmd.count("-i"), 1)
+        self.assertNotIn("-ss", cmd)
+        self.assertIn("[0:v]trim=start=3300.0:end=3303.0", " ".join(cmd))
+
+    def test_input_seek_opens_one_seeked_input_per_clip(self):
+        clips = [
+            Clip(id="c1", src="long.mp4", in_sec=3300.0, out_sec=3303.0),
+            Clip(id="c2", src="long.mp4", in_sec=10.0, out_sec=12.0),
+        ]
+        cmd = build_export_command("ffmpeg", clips, "out.mp4", input_seek=True)
+        joined = " ".join(cmd)
+        self.assertEqual(cmd.count("-i"), 2)
+        self.assertIn("-ss 3300.000000 -t 3.000000 -i long.mp4", joined)
+        self.assertIn("-ss 10.000000 -t 2.000000 -i long.mp4", joined)
+        # Trim windows are relative to the seeked input start.
+        self.assertIn("[0:v]trim=start=0.0:end=3.0", joined)
+        self.assertIn("[1:v]trim=start=0.0:end=2.0", joined)
+        self.assertIn("[1:a]atrim=start=0.0:end=2.0", joined)
+
+    @patch("core.ffmpeg.probe_media")
+    def test_project_input_seek_covers_v1_and_a1(self, probe_media):
+        probe_media.return_value = MediaInfo(duration=4000.0, has_video=True, has_audio=True)
+        v_clips = [Clip(id="v1", src="lecture.mp4", in_sec=1800.0, out_sec=1805.0)]
+        a_clips = [Clip(id="a1", src="music.mp3", in_sec=60.0, out_sec=65.0)]
+        cmd = build_export_command_project(
+            "ffmpeg",
+            "ffprobe",
+            v_clips,
+            a_clips,
+            "out.mp4",
+            audio_mode="mix",
+            input_seek=True,
+        )
+        joined = " ".join(cmd)
+        self.assertEqual(cmd.count("-i"), 2)
+        self.assertIn("-ss 1800.000000 -t 5.000000 -i lecture.mp4", joined)
+        self.assertIn("-ss 60.000000 -t 5.000000 -i music.mp3", joined)
+        self.assertIn("[1:a]atrim=start=0.0:end=5.0", joined)
+        # Sources are still probed once each.
+        self.assertEqual(probe_media.call_count, 2)
+
+    @patch("core.ffmpeg.probe_media")
+    def test_tracks_input_seek_uses_one_input_per_clip(self, probe_media):
+        probe_media.return_value = MediaInfo(duration=100.0, has_video=True, has_audio=True)
+        tracks = [
+            Track(
+                id="v1",
+                name="V1",
+                kind="video",
+                clips=[
+                    Clip(id="a", src="base.mp4", in_sec=50.0, out_sec=52.0),
+                    Clip(id="b", src="base.mp4", in_sec=70.0, out_sec=71.0),
+                ],
+            ),
+            Track(id="a1", name="A1", kind="audio", clips=[]),
+        ]
+        cmd = build_export_command_project(
+            "ffmpeg",
+            "ffprobe",
+            [],
+            [],
+            "out.mp4",
+            tracks=tracks,
+            input_seek=True,
+        )
+        joined = " ".join(cmd)
+        self.assertEqual(cmd.count("-i"), 2)
+        self.assertIn("-ss 70.000000 -t 1.000000 -i base.mp4", joined)
+        self.assertIn("[1:v]trim=start=0.0:end=1.0", joined)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -65,7 +65,9 @@ class TestFFmpegNoAudio(unittest.TestCase):
         ]
         cmd = build_export_command("ffmpeg", clips, "out.mp4")
         joined = " ".join(cmd)
-        self.assertIn("xfade=transition=dissolve:duration=0.500000:offset=1.500000", joined)
+        # Only the 0.5s overlap window (tail of v1 + head of v2) goes through xfade.
+        self.assertIn("trim=start=1.500000:end=2.000000", joined)
+        self.assertIn("xfade=transition=dissolve:duration=0.500000:offset=0.000000", joined)
         self.assertIn("acrossfade=d=0.500000", joined)
 
     @patch("core.ffmpeg.probe_media")
@@ -138,7 +140,7 @@ class TestFFmpegNoAudio(unittest.TestCase):
             audio_mode="v1_only",
         )
         joined = " ".join(cmd)
-        self.assertIn("xfade=transition=fade:duration=0.500000:offset=1.500000", joined)
+        self.assertIn("xfade=transition=fade:duration=0.500000:offset=0.000000", joined)
         self.assertIn("[a_vid]atrim=start=0:end=4.5[a]", joined)
 
     @patch("core.ffmpeg.probe_media")
@@ -0,0 +1,142 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from core.ffmpeg import ExportCancelled, MediaInfo, export_project_with_progress, plan_parallel_chunks
+from core.ffmpeg import _slice_clips
+from core.model import Clip, Track, Transition
+
+
+class _FakeProc:
+    def __init__(self, lines=None):
+        self.stderr = iter(lines or ["out_time_ms=1000000\n", "progress=end\n"])
+        self.terminated = False
+
+    def wait(self, timeout=None) -> int:
+        return 0
+
+    def terminate(self) -> None:
+        self.terminated = True
+
+    def kill(self) -> None:
+        pass
+
+
+def _clips(n: int, dur: float = 4.0):
+    return [Clip(id=f"c{i}", src=f"s{i}.mp4", in_sec=0.0, out_sec=dur) for i in range(n)]
+
+
+class TestParallelChunkPlan(unittest.TestCase):
+    def test_splits_only_at_hard_cuts(self):
+        clips = _clips(4)
+        clips[2] = Clip(id="c2", src="s2.mp4", in_sec=0.0, out_sec=4.0, transition_in=Transition(kind="fade", duration=1.0))
+        # Timeline: 0-4, 4-8, 7-11 (fade), 11-15.
+        windows = plan_parallel_chunks(clips, 4)
+        edges = [w[0] for w in windows[1:]]
+        self.assertNotIn(7.0, edges)
+        self.assertEqual(windows[0][0], 0.0)
+        self.assertAlmostEqual(windows[-1][1], 15.0, places=6)
+        for t in edges:
+            self.assertIn(t, (4.0, 11.0))
+
+    def test_skips_cuts_inside_overlay_transitions(self):
+        base = _clips(2)
+        overlay = [
+            Clip(id="o1", src="o.mp4", in_sec=0.0, out_sec=4.5),
+            Clip(id="o2", src="o.mp4", in_sec=0.0, out_sec=3.0, transition_in=Transition(kind="fade", duration=1.0)),
+        ]
+        # The overlay fade covers 3.5-4.5, so base cut 4.0 is unusable.
+        self.assertEqual(plan_parallel_chunks(base, 2, [overlay]), [(0.0, 8.0)])
+
+    def test_slice_clips_maps_window_to_source_time(self):
+        clips = [
+            Clip(id="a", src="a.mp4", in_sec=10.0, out_sec=14.0, speed=2.0),
+            Clip(id="b", src="b.mp4", in_sec=0.0, out_sec=5.0, transition_in=Transition(kind="fade", duration=0.5)),
+        ]
+        out = _slice_clips(clips, 1.0, 3.0)
+        self.assertEqual(len(out), 2)
+        self.assertAlmostEqual(out[0].in_sec, 12.0, places=6)
+        self.assertAlmostEqual(out[0].out_sec, 14.0, places=6)
+        # b starts at 1.5 on the timeline (2.0 - 0.5 overlap).
+        self.assertAlmostEqual(out[1].in_sec, 0.0, places=6)
+        self.assertAlmostEqual(out[1].out_sec, 1.5, places=6)
+        self.assertIsNotNone(out[1].transition_in)
+
+        tail = _slice_clips(clips, 2.5, 6.5)
+        self.assertEqual([c.id for c in tail], ["b"])
+        self.assertIsNone(tail[0].transition_in)
+        self.assertAlmostEqual(tail[0].in_sec, 1.0, places=6)
+
+
+class TestParallelExport(unittest.TestCase):
+    @patch("core.ffmpeg.subprocess.Popen")
+    @patch("core.ffmpeg.probe_media")
+    def test_renders_chunks_then_concats(self, probe_media, popen):
+        probe_media.return_value = MediaInfo(duration=100.0, has_video=True, has_audio=True)
+        popen.side_effect = lambda *args, **kwargs: _FakeProc()
+        tracks = [
+            Track(id="v1", name="V1", kind="video", clips=_clips(4)),
+            Track(id="a1", name="A1", kind="audio", clips=[Clip(id="m", src="m.mp3", in_sec=0.0, out_sec=16.0)]),
+        ]
+        events = []
+        with tempfile.TemporaryDirectory() as td:
+            out = str(Path(td) / "out.mp4")
+            export_project_with_progress(
+                "ffmpeg",
+                "ffprobe",
+                [],
+                [],
+                out,
+                on_progress=lambda cur, total: events.append((round(cur, 3), round(total, 3))),
+                tracks=tracks,
+                parallel_workers=4,
+            )
+            self.assertEqual(list(Path(td).glob(".minicut_parallel_*")), [])
+
+        cmds = [c.args[0] for c in popen.call_args_list]
+        self.assertEqual(len(cmds), 5)
+        concat_cmd = cmds[-1]
+        self.assertIn("concat", concat_cmd)
+        self.assertEqual(concat_cmd[-1], out)
+        chunk_joined = sorted(" ".join(c) for c in cmds[:-1])
+        # PCM chunks, audio encoded once while joining: no AAC priming at every chunk edge.
+        self.assertTrue(all("-c:a pcm_s16le" in c and " aac " not in c for c in chunk_joined))
+        self.assertIn("-c:v copy -c:a aac", " ".join(concat_cmd))
+        self.assertNotIn("aac_adtstoasc", concat_cmd)
+        # Each chunk seeks into its own slice of the music bed.
+        self.assertTrue(any("-ss 12.000000 -t 4.000000 -i m.mp3" in c for c in chunk_joined))
+        self.assertEqual(events[0], (0.0, 16.0))
+        self.assertEqual(events[-1], (16.0, 16.0))
+
+    @patch("core.ffmpeg.subprocess.Popen")
+    @patch("core.ffmpeg.probe_media")
+    def test_cancel_stops_all_workers(self, probe_media, popen):
+        probe_media.return_value = MediaInfo(duration=100.0, has_video=True, has_audio=True)
+        popen.side_effect = lambda *args, **kwargs: _FakeProc()
+        with tempfile.TemporaryDirectory() as td:
+            with self.assertRaises(ExportCancelled):
+                export_project_with_progress(
+                    "ffmpeg",
+                    "ffprobe",
+                    _clips(4),
+                    [],
+                    str(Path(td) / "out.mp4"),
+                    should_cancel=lambda: True,
+                    parallel_workers=2,
+                )
+        for call in popen.call_args_list:
+            self.assertNotIn("concat", call.args[0])
+
+    @patch("core.ffmpeg.subprocess.Popen")
+    @patch("core.ffmpeg.probe_media")
+    def test_single_chunk_timeline_uses_regular_export(self, probe_media, popen):
+        probe_media.return_value = MediaInfo(duration=100.0, has_video=True, has_audio=True)
+        popen.return_value = _FakeProc()
+        export_project_with_progress("ffmpeg", "ffprobe", _clips(1), [], "out.mp4", parallel_workers=8)
+        self.assertEqual(popen.call_count, 1)
+        self.assertIn("-filter_complex", popen.call_args.args[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+from core.ffmpeg import MediaInfo, probe_media_batch
+
+
+class TestProbeMediaBatch(unittest.TestCase):
+    @patch("core.ffmpeg.probe_media")
+    def test_reports_failures_without_aborting_batch(self, probe_media):
+        def _fake_probe(_ffprobe_path: str, src: str) -> MediaInfo:
+            if src == "bad.mp4":
+                raise RuntimeError("corrupt")
+            return MediaInfo(duration=3.0, has_video=True, has_audio=True)
+
+        probe_media.side_effect = _fake_probe
+        results = {src: (info, err) for src, info, err in probe_media_batch("ffprobe", ["a.mp4", "bad.mp4", "b.mp4"])}
+        self.assertEqual(set(results), {"a.mp4", "bad.mp4", "b.mp4"})
+        self.assertIsNone(results["bad.mp4"][0])
+        self.assertIsInstance(results["bad.mp4"][1], RuntimeError)
+        self.assertEqual(results["a.mp4"][0].duration, 3.0)
+        self.assertIsNone(results["b.mp4"][1])
+
+    @patch("core.ffmpeg.probe_media")
+    def test_streams_results_in_completion_order(self, probe_media):
+        slow_release = threading.Event()
+
+        def _fake_probe(_ffprobe_path: str, src: str) -> MediaInfo:
+            if src == "slow.mp4":
+                slow_release.wait(timeout=5.0)
+            return MediaInfo(duration=1.0, has_video=True, has_audio=True)
+
+        probe_media.side_effect = _fake_probe
+        results = probe_media_batch("ffprobe", ["slow.mp4", "fast.mp4"], max_workers=2)
+        first = next(results)
+        self.assertEqual(first[0], "fast.mp4")
+        slow_release.set()
+        self.assertEqual(next(results)[0], "slow.mp4")
+
+    @patch("core.ffmpeg.probe_media")
+    def test_duplicate_paths_are_probed_once(self, probe_media):
+        probe_media.return_value = MediaInfo(duration=1.0, has_video=True, has_audio=True)
+        out = list(probe_media_batch("ffprobe", ["a.mp4", "a.mp4"]))
+        self.assertEqual(len(out), 1)
+        self.assertEqual(probe_media.call_count, 1)
+        self.assertEqual(list(probe_media_batch("ffprobe", [])), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
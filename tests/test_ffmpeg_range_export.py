@@ -0,0 +1,100 @@
+import unittest
+from unittest.mock import patch
+
+from core.ffmpeg import MediaInfo, draft_export_settings, export_range_with_progress, range_window
+from core.model import Clip, ExportSettings, Track, Transition
+
+
+class _FakeProc:
+    def __init__(self):
+        self.stderr = iter(["out_time_ms=1000000\n", "progress=end\n"])
+
+    def wait(self, timeout=None) -> int:
+        return 0
+
+    def terminate(self) -> None:
+        pass
+
+    def kill(self) -> None:
+        pass
+
+
+def _clips():
+    # Timeline: a 0-10, b 9-19 (1s fade), c 19-29.
+    return [
+        Clip(id="a", src="a.mp4", in_sec=0.0, out_sec=10.0),
+        Clip(id="b", src="b.mp4", in_sec=0.0, out_sec=10.0, transition_in=Transition(kind="fade", duration=1.0)),
+        Clip(id="c", src="c.mp4", in_sec=20.0, out_sec=30.0),
+    ]
+
+
+class TestRangeWindow(unittest.TestCase):
+    def test_clamps_and_widens_around_transitions(self):
+        self.assertEqual(range_window(_clips(), None, -5.0, 4.0), (0.0, 4.0))
+        self.assertEqual(range_window(_clips(), None, 25.0, 99.0), (25.0, 29.0))
+        a, b = range_window(_clips(), None, 9.5, 12.0)
+        self.assertAlmostEqual(a, 8.95, places=6)
+        self.assertEqual(b, 12.0)
+        a, b = range_window(_clips(), None, 2.0, 9.2)
+        self.assertEqual(a, 2.0)
+        self.assertAlmostEqual(b, 10.05, places=6)
+        self.assertEqual(range_window(_clips(), None, 40.0, 50.0), (0.0, 0.0))
+
+    def test_draft_settings_keep_aspect(self):
+        d = draft_export_settings()
+        self.assertEqual((d.width, d.height, d.preset), (640, 360, "ultrafast"))
+        d = draft_export_settings(ExportSettings(width=1080, height=1920))
+        self.assertEqual((d.width, d.height), (202, 360))
+        d = draft_export_settings(ExportSettings(), source_size=(1080, 1920))
+        self.assertEqual((d.width, d.height), (202, 360))
+
+
+class TestRangeExport(unittest.TestCase):
+    @patch("core.ffmpeg.subprocess.Popen")
+    @patch("core.ffmpeg.probe_media")
+    def test_renders_only_the_window(self, probe_media, popen):
+        probe_media.return_value = MediaInfo(duration=100.0, has_video=True, has_audio=True)
+        popen.return_value = _FakeProc()
+        tracks = [
+            Track(id="v1", name="V1", kind="video", clips=_clips()),
+            Track(id="a1", name="A1", kind="audio", clips=[Clip(id="m", src="m.mp3", in_sec=0.0, out_sec=60.0)]),
+        ]
+        events = []
+        window = export_range_with_progress(
+            "ffmpeg",
+            "ffprobe",
+            [],
+            [],
+            "draft.mp4",
+            20.0,
+            24.0,
+            on_progress=lambda cur, total: events.append(round(total, 3)),
+            tracks=tracks,
+            draft=True,
+        )
+        self.assertEqual(window, (20.0, 24.0))
+        self.assertEqual(popen.call_count, 1)
+        cmd = " ".join(popen.call_args.args[0])
+        self.assertIn("-ss 21.000000 -t 4.000000 -i c.mp4", cmd)
+        self.assertIn("-ss 20.000000 -t 4.000000 -i m.mp3", cmd)
+        self.assertNotIn("a.mp4", cmd)
+        self.assertNotIn("b.mp4", cmd)
+        self.assertIn("ultrafast", cmd)
+        self.assertIn("scale=w=640:h=360", cmd)
+        self.assertEqual(events[-1], 4.0)
+
+    @patch("core.ffmpeg.subprocess.Popen")
+    @patch("core.ffmpeg.probe_media")
+    def test_draft_follows_vertical_source(self, probe_media, popen):
+        probe_media.return_value = MediaInfo(duration=100.0, has_video=True, has_audio=True, width=1080, height=1920)
+        popen.return_value = _FakeProc()
+        export_range_with_progress("ffmpeg", "ffprobe", _clips(), [], "draft.mp4", 0.0, 4.0, draft=True)
+        self.assertIn("scale=w=202:h=360", " ".join(popen.call_args.args[0]))
+
+    def test_empty_range_raises(self):
+        with self.assertRaises(ValueError):
+            export_range_with_progress("ffmpeg", "ffprobe", _clips(), [], "draft.mp4", 50.0, 60.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
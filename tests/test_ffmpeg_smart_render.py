@@ -0,0 +1,166 @@
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from core.ffmpeg import (
+    MediaInfo,
+    SmartRenderPiece,
+    export_project_with_progress,
+    plan_smart_render,
+    probe_keyframes,
+    smart_render_supported,
+)
+from core.model import Clip, ExportSettings, Track, Transition
+
+
+def _info(**overrides) -> MediaInfo:
+    values = dict(
+        duration=60.0,
+        has_video=True,
+        has_audio=True,
+        width=1920,
+        height=1080,
+        fps=30.0,
+        video_codec="h264",
+        audio_codec="aac",
+        pixel_format="yuv420p",
+        sample_rate=48000,
+        channels=2,
+    )
+    values.update(overrides)
+    return MediaInfo(**values)
+
+
+class _FakeProc:
+    def __init__(self):
+        self.stderr = iter(["progress=end\n"])
+
+    def wait(self, timeout=None) -> int:
+        return 0
+
+    def terminate(self) -> None:
+        pass
+
+    def kill(self) -> None:
+        pass
+
+
+class TestSmartRenderPlan(unittest.TestCase):
+    def test_plan_splits_head_copy_and_tail(self):
+        clips = [Clip(id="c1", src="a.mp4", in_sec=1.5, out_sec=9.0)]
+        pieces = plan_smart_render(clips, {"a.mp4": [0.0, 2.0, 4.0, 6.0, 8.0, 10.0]})
+        self.assertEqual(
+            pieces,
+            [
+                SmartRenderPiece(src="a.mp4", start=1.5, end=2.0, copy=False),
+                SmartRenderPiece(src="a.mp4", start=2.0, end=8.0, copy=True),
+                SmartRenderPiece(src="a.mp4", start=8.0, end=9.0, copy=False),
+            ],
+        )
+
+    def test_plan_skips_empty_boundaries_on_keyframe_cuts(self):
+        clips = [Clip(id="c1", src="a.mp4", in_sec=2.0, out_sec=8.0)]
+        pieces = plan_smart_render(clips, {"a.mp4": [0.0, 2.0, 4.0, 6.0, 8.0]})
+        self.assertEqual(pieces, [SmartRenderPiece(src="a.mp4", start=2.0, end=8.0, copy=True)])
+
+    def test_plan_reencodes_short_or_keyframe_less_clips(self):
+        clips = [
+            Clip(id="c1", src="a.mp4", in_sec=2.5, out_sec=3.5),
+            Clip(id="c2", src="b.mp4", in_sec=0.0, out_sec=5.0),
+        ]
+        pieces = plan_smart_render(clips, {"a.mp4": [0.0, 2.0, 4.0]})
+        self.assertEqual([p.copy for p in pieces], [False, False])
+        self.assertAlmostEqual(sum(p.dur for p in pieces), 6.0, places=6)
+
+    def test_probe_keyframes_parses_packet_flags(self):
+        stdout = "0.000000,K__\n0.033333,___\n2.002000,K_\nN/A,K_\n"
+        with patch("core.ffmpeg.subprocess.run") as run:
+            run.return_value = subprocess.CompletedProcess(args=[], returncode=0, stdout=stdout, stderr="")
+            self.assertEqual(probe_keyframes("ffprobe", "a.mp4"), [0.0, 2.002])
+
+
+class TestSmartRenderSupported(unittest.TestCase):
+    def test_plain_hard_cuts_are_supported(self):
+        clips = [
+            Clip(id="c1", src="a.mp4", in_sec=0.0, out_sec=4.0),
+            Clip(id="c2", src="b.mp4", in_sec=1.0, out_sec=3.0),
+        ]
+        infos = {"a.mp4": _info(), "b.mp4": _info()}
+        self.assertTrue(smart_render_supported(clips, infos, ExportSettings()))
+
+    def test_rejects_speed_transitions_and_mismatched_sources(self):
+        infos = {"a.mp4": _info(), "b.mp4": _info()}
+        fast = [Clip(id="c1", src="a.mp4", in_sec=0.0, out_sec=4.0, speed=2.0)]
+        self.assertFalse(smart_render_supported(fast, infos))
+
+        faded = [
+            Clip(id="c1", src="a.mp4", in_sec=0.0, out_sec=4.0),
+            Clip(id="c2", src="b.mp4", in_sec=0.0, out_sec=4.0, transition_in=Transition(kind="fade", duration=0.5)),
+        ]
+        self.assertFalse(smart_render_supported(faded, infos))
+
+        plain = [
+            Clip(id="c1", src="a.mp4", in_sec=0.0, out_sec=4.0),
+            Clip(id="c2", src="b.mp4", in_sec=0.0, out_sec=4.0),
+        ]
+        self.assertFalse(smart_render_supported(plain, {"a.mp4": _info(), "b.mp4": _info(fps=25.0)}))
+        self.assertFalse(smart_render_supported(plain, infos, ExportSettings(width=1280, height=720)))
+        self.assertFalse(smart_render_supported(plain, infos, ExportSettings(video_codec="libx265")))
+
+
+class TestSmartRenderExport(unittest.TestCase):
+    @patch("core.ffmpeg.subprocess.Popen")
+    @patch("core.ffmpeg.probe_keyframes")
+    @patch("core.ffmpeg.probe_media")
+    def test_export_copies_interior_and_concats_pieces(self, probe_media, probe_kf, popen):
+        probe_media.return_value = _info()
+        probe_kf.return_value = [0.0, 2.0, 4.0, 6.0, 8.0]
+        popen.side_effect = lambda *args, **kwargs: _FakeProc()
+        tracks = [
+            Track(id="v1", name="V1", kind="video", clips=[Clip(id="c1", src="a.mp4", in_sec=1.0, out_sec=7.0)]),
+            Track(id="a1", name="A1", kind="audio", clips=[]),
+        ]
+        events = []
+        with tempfile.TemporaryDirectory() as td:
+            out = str(Path(td) / "out.mp4")
+            export_project_with_progress(
+                "ffmpeg",
+                "ffprobe",
+                [],
+                [],
+                out,
+                on_progress=lambda cur, total: events.append((round(cur, 3), round(total, 3))),
+                tracks=tracks,
+                smart_render=True,
+            )
+            # Temporary pieces are cleaned up.
+            self.assertEqual(list(Path(td).glob(".minicut_smart_*")), [])
+
+        cmds = [c.args[0] for c in popen.call_args_list]
+        self.assertEqual(len(cmds), 4)
+        self.assertIn("libx264", cmds[0])
+        self.assertIn("copy", cmds[1])
+        self.assertNotIn("libx264", cmds[1])
+        self.assertIn("libx264", cmds[2])
+        self.assertIn("concat", cmds[3])
+        self.assertEqual(cmds[3][-1], out)
+        self.assertEqual(events[0], (0.0, 6.0))
+        self.assertEqual(events[-1], (6.0, 6.0))
+
+    @patch("core.ffmpeg.subprocess.Popen")
+    @patch("core.ffmpeg.probe_keyframes")
+    @patch("core.ffmpeg.probe_media")
+    def test_export_falls_back_when_not_supported(self, probe_media, probe_kf, popen):
+        probe_media.return_value = _info()
+        popen.side_effect = lambda *args, **kwargs: _FakeProc()
+        v_clips = [Clip(id="c1", src="a.mp4", in_sec=0.0, out_sec=4.0, speed=1.5)]
+        export_project_with_progress("ffmpeg", "ffprobe", v_clips, [], "out.mp4", smart_render=True)
+        probe_kf.assert_not_called()
+        self.assertEqual(popen.call_count, 1)
+        self.assertIn("-filter_complex", popen.call_args.args[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
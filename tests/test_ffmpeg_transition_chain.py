@@ -0,0 +1,86 @@
+import re
+import unittest
+
+from core.ffmpeg import _build_transition_chain
+from core.model import Clip, Transition
+
+
+def _clips(n: int, fade_at=()):
+    out = []
+    for i in range(n):
+        trans = Transition(kind="fade", duration=0.5) if i in fade_at else None
+        out.append(Clip(id=f"c{i}", src=f"s{i}.mp4", in_sec=0.0, out_sec=2.0, transition_in=trans))
+    return out
+
+
+class TestTransitionChain(unittest.TestCase):
+    def test_hard_cuts_use_one_flat_concat(self):
+        clips = _clips(100)
+        parts = []
+        v, a, total = _build_transition_chain(
+            parts,
+            clips,
+            [f"v{i}" for i in range(100)],
+            [f"a{i}" for i in range(100)],
+        )
+        self.assertEqual(len(parts), 1)
+        self.assertIn("concat=n=100:v=1:a=1", parts[0])
+        self.assertTrue(parts[0].startswith("[v0][a0][v1][a1]"))
+        self.assertTrue(parts[0].endswith(f"[{v}][{a}]"))
+        self.assertAlmostEqual(total, 200.0, places=6)
+
+    def test_video_only_chain_concats_without_audio(self):
+        parts = []
+        v, a, _total = _build_transition_chain(parts, _clips(3), ["v0", "v1", "v2"], None)
+        self.assertIsNone(a)
+        self.assertEqual(parts, [f"[v0][v1][v2]concat=n=3:v=1:a=0[{v}]"])
+
+    def test_single_clip_emits_no_nodes(self):
+        parts = []
+        self.assertEqual(_build_transition_chain(parts, _clips(1), ["v0"], ["a0"]), ("v0", "a0", 2.0))
+        self.assertEqual(parts, [])
+
+    def test_labels_are_unique_across_tracks(self):
+        parts = []
+        clips = _clips(3, fade_at=(2,))
+        _build_transition_chain(parts, clips, ["tv0_0", "tv0_1", "tv0_2"], ["ta0_0", "ta0_1", "ta0_2"])
+        _build_transition_chain(parts, clips, ["tv1_0", "tv1_1", "tv1_2"], ["ta1_0", "ta1_1", "ta1_2"])
+        labels = []
+        for p in parts:
+            labels.extend(re.findall(r"\[([^\]]+)\]", re.search(r"(\[[^\]]+\])+$", p).group(0)))
+        self.assertEqual(len(labels), len(set(labels)))
+
+    def test_transitions_only_xfade_the_overlap_window(self):
+        n = 100
+        clips = _clips(n, fade_at=range(1, n))
+        parts = []
+        v, a, total = _build_transition_chain(
+            parts,
+            clips,
+            [f"v{i}" for i in range(n)],
+            [f"a{i}" for i in range(n)],
+        )
+        xfades = [p for p in parts if "xfade=" in p]
+        self.assertEqual(len(xfades), n - 1)
+        for p in xfades:
+            self.assertIn("duration=0.500000:offset=0.000000", p)
+        concat = [p for p in parts if "concat=" in p]
+        self.assertEqual(len(concat), 1)
+        # One body per clip plus one piece per transition.
+        self.assertIn(f"concat=n={2 * n - 1}:v=1:a=1[{v}][{a}]", concat[0])
+        self.assertAlmostEqual(total, n * 2.0 - (n - 1) * 0.5, places=6)
+
+    def test_overlapping_transitions_fall_back_to_accumulated_chain(self):
+        clips = [
+            Clip(id="c0", src="s0.mp4", in_sec=0.0, out_sec=2.0),
+            Clip(id="c1", src="s1.mp4", in_sec=0.0, out_sec=1.0, transition_in=Transition(kind="fade", duration=0.8)),
+            Clip(id="c2", src="s2.mp4", in_sec=0.0, out_sec=2.0, transition_in=Transition(kind="fade", duration=0.8)),
+        ]
+        parts = []
+        _v, _a, total = _build_transition_chain(parts, clips, ["v0", "v1", "v2"], ["a0", "a1", "a2"])
+        self.assertIn("[v0][v1]xfade=transition=fade:duration=0.800000:offset=1.200000[v1_x]", parts)
+        self.assertAlmostEqual(total, 5.0 - 1.6, places=6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
 import unittest
 
-from core.history import HistoryEntry, HistoryManager
+from dataclasses import replace
+
+from core.history import HistoryEntry, HistoryManager, restore_project, snapshot_project
 from core.model import Clip, Project
 
 
@@ -63,6 +65,101 @@ class TestHistoryManager(unittest.TestCase):
         self.assertEqual(e2.label, "2")
         self.assertIsNone(e1)
 
+    def test_coalesced_records_merge_into_one_step(self):
+        mgr = HistoryManager()
+        mgr.record(HistoryEntry(label="Add", project={"n": 0}))
+        for i in range(40):
+            mgr.record(HistoryEntry(label="Volume", project={"n": i + 1}), coalesce_key=("volume", "c1"), now=100.0 + i * 0.1)
+        e = mgr.undo(current=HistoryEntry(label="(current)", project={"n": 99}))
+        self.assertEqual(e.label, "Volume")
+        self.assertEqual(e.project, {"n": 1})
+        self.assertEqual(mgr.peek_undo_label(), "Add")
+
+    def test_coalescing_breaks_on_key_change_gap_and_undo(self):
+        mgr = HistoryManager(coalesce_sec=1.0)
+        key = ("speed", "c1")
+        self.assertTrue(mgr.record(HistoryEntry(label="1", project={"n": 1}), coalesce_key=key, now=0.0))
+        self.assertFalse(mgr.record(HistoryEntry(label="2", project={"n": 2}), coalesce_key=key, now=0.5))
+        self.assertTrue(mgr.record(HistoryEntry(label="3", project={"n": 3}), coalesce_key=("speed", "c2"), now=0.6))
+        self.assertTrue(mgr.record(HistoryEntry(label="4", project={"n": 4}), coalesce_key=("speed", "c2"), now=5.0))
+        mgr.undo(current=HistoryEntry(label="(current)", project={"n": 5}))
+        self.assertTrue(mgr.record(HistoryEntry(label="5", project={"n": 5}), coalesce_key=("speed", "c2"), now=5.1))
+        self.assertFalse(mgr.extend(None))
+
+
+class TestProjectSnapshots(unittest.TestCase):
+    def _project(self, n: int = 200) -> Project:
+        v = [Clip(id=f"v{i}", src=f"/media/clip_{i}.mp4", in_sec=0.0, out_sec=2.0) for i in range(n)]
+        a = [Clip(id="a0", src="/media/music.mp3", in_sec=0.0, out_sec=60.0)]
+        return Project(v_clips=v, a_clips=a, fps=30)
+
+    def test_snapshots_share_unchanged_tracks(self):
+        p = self._project()
+        s0 = snapshot_project(p)
+        p.v_clips = [replace(p.v_clips[0], out_sec=1.0), *p.v_clips[1:]]
+        s1 = snapshot_project(p, s0)
+        self.assertIs(s1.tracks[1], s0.tracks[1])
+        self.assertIsNot(s1.tracks[0], s0.tracks[0])
+        self.assertIs(s1.tracks[0].clips[5], s0.tracks[0].clips[5])
+
+    def test_restore_patches_only_changed_tracks(self):
+        p = self._project(3)
+        s0 = snapshot_project(p)
+        audio_track = p.primary_audio_track()
+        audio_clips = audio_track.clips
+        p.v_clips = p.v_clips[:1]
+        p.primary_video_track().name = "Main"
+
+        changed = restore_project(p, s0)
+        self.assertEqual(changed, [p.primary_video_track().id])
+        self.assertEqual([c.id for c in p.v_clips], ["v0", "v1", "v2"])
+        self.assertEqual(p.primary_video_track().name, s0.tracks[0].name)
+        self.assertIs(p.primary_audio_track(), audio_track)
+        self.assertIs(p.primary_audio_track().clips, audio_clips)
+
+    def test_restore_handles_added_and_removed_tracks(self):
+        p = self._project(2)
+        s0 = snapshot_project(p)
+        extra = p.add_track("video")
+        changed = restore_project(p, s0)
+        self.assertEqual(changed, [extra.id])
+        self.assertIsNone(p.get_track(extra.id))
+        self.assertEqual(p.to_dict(), Project.from_dict(p.to_dict()).to_dict())
+
+    def test_byte_budget_drops_oldest_steps(self):
+        p = self._project(50)
+        one_step = HistoryManager()
+        one_step.record(HistoryEntry(label="0", project=snapshot_project(p)))
+        budget = one_step.used_bytes * 3
+
+        mgr = HistoryManager(max_bytes=budget)
+        for i in range(10):
+            # Every step rewrites all clips, so nothing is shared between steps.
+            p.v_clips = [replace(c, out_sec=c.out_sec + 0.1) for c in p.v_clips]
+            mgr.record(HistoryEntry(label=str(i), project=snapshot_project(p, mgr.peek_undo_project())))
+        self.assertLessEqual(mgr.used_bytes, budget)
+        labels = []
+        while mgr.can_undo():
+            labels.append(mgr.undo(HistoryEntry(label="(current)", project=snapshot_project(p))).label)
+        self.assertEqual(labels[0], "9")
+        self.assertLess(len(labels), 10)
+
+    def test_small_edits_keep_many_steps_within_budget(self):
+        p = self._project(500)
+        full = HistoryManager()
+        full.record(HistoryEntry(label="full", project=snapshot_project(p)))
+        mgr = HistoryManager(max_bytes=full.used_bytes * 10)
+        for i in range(100):
+            clips = list(p.v_clips)
+            clips[i] = replace(clips[i], volume=0.5)
+            p.v_clips = clips
+            mgr.record(HistoryEntry(label=str(i), project=snapshot_project(p, mgr.peek_undo_project())))
+        steps = 0
+        while mgr.can_undo():
+            mgr.undo(HistoryEntry(label="(current)", project=snapshot_project(p)))
+            steps += 1
+        self.assertEqual(steps, 100)
+
 
 if __name__ == "__main__":
     unittest.main()
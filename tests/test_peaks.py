@@ -0,0 +1,87 @@
+import io
+import tempfile
+import unittest
+from array import array
+from pathlib import Path
+from unittest.mock import patch
+
+from core.peaks import WaveformPeaks, build_peak_levels, generate_peaks, write_peaks_file
+
+
+class _FakePopen:
+    def __init__(self, payload: bytes, retcode: int = 0):
+        self.stdout = io.BytesIO(payload)
+        self._retcode = retcode
+
+    def wait(self, timeout=None) -> int:
+        return self._retcode
+
+    def kill(self) -> None:
+        pass
+
+
+def _square(seconds: int, sample_rate: int = 8000, loud_until: float = 1e9) -> array:
+    out = array("h")
+    for i in range(seconds * sample_rate):
+        amp = 20000 if i < loud_until * sample_rate else 100
+        out.append(amp if (i // 40) % 2 == 0 else -amp)
+    return out
+
+
+class TestPeaks(unittest.TestCase):
+    def test_levels_are_mipmapped_min_max(self):
+        samples = array("h", [0, 5, -3, 2] * 64)
+        levels = build_peak_levels(samples, samples_per_peak=4, factor=4, levels=3)
+        self.assertEqual([spp for spp, _p in levels], [4, 16, 64])
+        self.assertEqual(len(levels[0][1]) // 2, 64)
+        self.assertEqual(list(levels[1][1][:2]), [-3, 5])
+        self.assertEqual(len(levels[2][1]) // 2, 4)
+
+    def test_envelope_renders_any_segment_from_mapped_file(self):
+        levels = build_peak_levels(_square(10, loud_until=5.0))
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "x.peaks"
+            write_peaks_file(path, 8000, levels)
+            peaks = WaveformPeaks(path)
+            try:
+                self.assertAlmostEqual(peaks.duration, 10.0, places=2)
+                env = peaks.envelope(4.0, 2.0, 4)
+                self.assertEqual(len(env), 4)
+                self.assertGreater(env[0][1], 0.5)
+                self.assertLess(env[0][0], -0.5)
+                self.assertLess(env[-1][1], 0.05)
+                # Whole file at a narrow width uses a coarse level and still spans it.
+                self.assertEqual(len(peaks.envelope(0.0, 10.0, 3)), 3)
+            finally:
+                peaks.close()
+
+    def test_generate_peaks_decodes_once_and_caches(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            src = root / "talk.wav"
+            src.write_bytes(b"demo-audio")
+            payload = _square(2).tobytes()
+            with patch("core.peaks.subprocess.Popen", side_effect=lambda *a, **k: _FakePopen(payload)) as popen:
+                p1 = generate_peaks("ffmpeg", str(src), root / "cache")
+                p2 = generate_peaks("ffmpeg", str(src), root / "cache")
+            self.assertIsNotNone(p1)
+            self.assertEqual(p1, p2)
+            self.assertEqual(popen.call_count, 1)
+            self.assertIn("s16le", popen.call_args.args[0])
+            peaks = WaveformPeaks(Path(p1))
+            try:
+                self.assertAlmostEqual(peaks.duration, 2.0, places=2)
+            finally:
+                peaks.close()
+
+    def test_generate_peaks_returns_none_on_ffmpeg_error(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            src = root / "video_only.mp4"
+            src.write_bytes(b"demo")
+            with patch("core.peaks.subprocess.Popen", side_effect=lambda *a, **k: _FakePopen(b"", retcode=1)):
+                self.assertIsNone(generate_peaks("ffmpeg", str(src), root / "cache"))
+
+
+if __name__ == "__main__":
+    unittest.main()
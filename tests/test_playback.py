@@ -0,0 +1,74 @@
+import unittest
+
+from core.playback import PlaybackClock
+
+
+class TestPlaybackClock(unittest.TestCase):
+    def _running(self, duration: float = 30.0) -> PlaybackClock:
+        clock = PlaybackClock(duration, startup_sec=0.0)
+        clock.start(2.0, 100.0)
+        return clock
+
+    def test_extrapolates_without_player_reports(self):
+        clock = self._running()
+        self.assertAlmostEqual(clock.position(100.5), 2.5)
+        self.assertAlmostEqual(clock.position(200.0), 30.0)
+
+    def test_poll_interval_backs_off_while_reports_agree(self):
+        clock = self._running()
+        now = 100.0
+        intervals = []
+        for _ in range(6):
+            self.assertTrue(clock.due(now))
+            clock.sync(clock.position(now) + 0.01, now)
+            nxt = now
+            while not clock.due(nxt):
+                nxt += 0.01
+            intervals.append(round(nxt - now, 2))
+            now = nxt
+        self.assertEqual(intervals, [0.5, 1.0, 2.0, 2.0, 2.0, 2.0])
+
+    def test_small_drift_is_slewed_without_going_backwards(self):
+        clock = self._running()
+        ahead = clock.position(101.0)
+        clock.sync(ahead - 0.2, 101.0)  # player is behind the prediction
+        self.assertAlmostEqual(clock.position(101.0), ahead)
+        samples = [clock.position(101.0 + k * 0.05) for k in range(1, 12)]
+        self.assertEqual(samples, sorted(samples))
+        # After the slew window the clock has absorbed the drift.
+        self.assertAlmostEqual(clock.position(101.5), ahead + 0.5 - 0.2, places=6)
+        self.assertAlmostEqual(clock.position(102.5), ahead + 1.5 - 0.2, places=6)
+
+    def test_large_jump_reanchors_and_polls_soon(self):
+        clock = self._running()
+        clock.sync(10.0, 101.0)
+        self.assertAlmostEqual(clock.position(101.0), 10.0)
+        self.assertFalse(clock.due(101.2))
+        self.assertTrue(clock.due(101.25))
+
+    def test_startup_holds_until_player_moves(self):
+        clock = PlaybackClock(30.0, startup_sec=0.35)
+        clock.start(4.0, 50.0)
+        self.assertTrue(clock.in_startup)
+        self.assertEqual(clock.sync(4.0, 50.1), 4.0)
+        self.assertEqual(clock.position(50.2), 4.0)
+        self.assertAlmostEqual(clock.sync(4.05, 50.25), 4.05)
+        self.assertFalse(clock.in_startup)
+        self.assertAlmostEqual(clock.position(50.75), 4.55)
+
+    def test_startup_gives_up_on_a_silent_player(self):
+        clock = PlaybackClock(30.0, startup_sec=0.35)
+        clock.start(1.0, 0.0)
+        self.assertEqual(clock.position(0.3), 1.0)
+        self.assertAlmostEqual(clock.position(1.35), 2.0)
+        self.assertFalse(clock.in_startup)
+
+    def test_stale_reports_keep_the_local_clock(self):
+        clock = self._running()
+        clock.sync(2.5, 100.5)
+        clock.sync(2.5, 101.5)
+        self.assertAlmostEqual(clock.position(101.5), 3.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from core.ffmpeg import MediaInfo, build_export_command_project, probe_media_cached, set_probe_cache
+from core.model import Clip
+from core.probe_cache import ProbeCache
+
+
+class TestProbeCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.root = Path(self._td.name)
+        self.src = self.root / "clip.mp4"
+        self.src.write_bytes(b"x" * 16)
+        self.cache = ProbeCache(self.root / "cache" / "probe.sqlite3")
+
+    def tearDown(self) -> None:
+        set_probe_cache(None)
+        self.cache.close()
+        self._td.cleanup()
+
+    def test_roundtrip_and_counters(self):
+        info = MediaInfo(duration=12.5, has_video=True, has_audio=False, width=640, height=360, video_codec="h264")
+        self.assertIsNone(self.cache.get(str(self.src)))
+        self.cache.put(str(self.src), info)
+        self.assertEqual(self.cache.get(str(self.src)), info)
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 1})
+
+        # A fresh instance reads the persisted entry.
+        other = ProbeCache(self.cache.db_path)
+        try:
+            self.assertEqual(other.get(str(self.src)), info)
+        finally:
+            other.close()
+
+    def test_changed_file_invalidates_entry(self):
+        self.cache.put(str(self.src), MediaInfo(duration=1.0, has_video=True, has_audio=True))
+        self.src.write_bytes(b"y" * 32)
+        st = self.src.stat()
+        os.utime(self.src, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        self.assertIsNone(self.cache.get(str(self.src)))
+
+    def test_missing_file_is_never_cached(self):
+        missing = str(self.root / "missing.mp4")
+        self.cache.put(missing, MediaInfo(duration=1.0, has_video=True, has_audio=True))
+        self.assertIsNone(self.cache.get(missing))
+
+    @patch("core.ffmpeg.probe_media")
+    def test_export_builder_probes_through_installed_cache(self, probe_media):
+        probe_media.return_value = MediaInfo(duration=10.0, has_video=True, has_audio=True)
+        set_probe_cache(self.cache)
+        v_clips = [Clip(id="v1", src=str(self.src), in_sec=0.0, out_sec=2.0)]
+        build_export_command_project("ffmpeg", "ffprobe", v_clips, [], "out.mp4")
+        build_export_command_project("ffmpeg", "ffprobe", v_clips, [], "out.mp4")
+        self.assertEqual(probe_media.call_count, 1)
+        self.assertEqual(probe_media_cached("ffprobe", str(self.src)), probe_media.return_value)
+        self.assertEqual(self.cache.stats()["hits"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,21 @@
+import copy
 import tempfile
 import unittest
+from dataclasses import replace
 from pathlib import Path
 
+from core.ffmpeg import _slice_tracks
+from core.history import snapshot_project
 from core.model import Clip, Project
-from core.project_io import load_project, save_project
+from core.project_io import (
+    LazyTrack,
+    ProjectJournal,
+    convert_project,
+    has_journal,
+    journal_path,
+    load_project,
+    save_project,
+)
 
 
 class TestProjectIO(unittest.TestCase):
@@ -32,6 +44,150 @@ class TestProjectIO(unittest.TestCase):
             self.assertTrue(p2.a_clips[0].muted)
 
 
+class TestProjectContainer(unittest.TestCase):
+    def _project(self) -> Project:
+        p = Project(
+            v_clips=[Clip(id=f"v{i}", src=f"v{i % 3}.mp4", in_sec=float(i), out_sec=i + 1.5, speed=1.25) for i in range(200)],
+            a_clips=[Clip(id="a1", src="music.mp3", in_sec=0.0, out_sec=30.0, muted=True)],
+            fps=25,
+        )
+        p.add_track("video").clips = [Clip(id="o1", src="logo.png", in_sec=0.0, out_sec=3.0)]
+        return p
+
+    def test_container_roundtrip_decodes_tracks_lazily(self):
+        with tempfile.TemporaryDirectory() as td:
+            out = Path(td) / "big.minicutz"
+            p = self._project()
+            save_project(p, str(out))
+            self.assertEqual(out.read_bytes()[:4], b"MCZ1")
+
+            loaded = load_project(str(out))
+            tracks = loaded.tracks
+            self.assertTrue(all(isinstance(t, LazyTrack) and not t.loaded for t in tracks))
+            self.assertEqual(tracks[0].clip_count, 200)
+            self.assertEqual(loaded.fps, 25)
+
+            self.assertEqual(loaded.a_clips[0].src, "music.mp3")
+            self.assertTrue(loaded.primary_audio_track().loaded)
+            self.assertFalse(tracks[0].loaded)
+            self.assertEqual(loaded.to_dict(), p.to_dict())
+
+            tracks[1].clips = []
+            self.assertEqual(tracks[1].clip_count, 0)
+
+    def test_container_tracks_behave_like_tracks(self):
+        with tempfile.TemporaryDirectory() as td:
+            out = Path(td) / "big.minicutz"
+            save_project(self._project(), str(out))
+            tracks = load_project(str(out)).tracks
+
+            sliced = _slice_tracks(tracks, 1.0, 3.0)
+            self.assertAlmostEqual(sum(c.dur for c in sliced[0].clips), 2.0, places=6)
+            self.assertEqual(sliced[0].id, tracks[0].id)
+
+            renamed = replace(tracks[1], name="Renamed")
+            self.assertEqual((renamed.name, renamed.clips), ("Renamed", tracks[1].clips))
+            cloned = copy.deepcopy(tracks[2])
+            self.assertEqual(cloned.to_dict(), tracks[2].to_dict())
+            self.assertIsNot(cloned.clips, tracks[2].clips)
+
+    def test_convert_between_json_and_container(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            p = self._project()
+            save_project(p, str(root / "a.json"))
+            convert_project(str(root / "a.json"), str(root / "a.minicutz"))
+            convert_project(str(root / "a.minicutz"), str(root / "b.json"), legacy=True)
+            self.assertLess((root / "a.minicutz").stat().st_size, (root / "a.json").stat().st_size)
+            self.assertIn("v_clips", (root / "b.json").read_text(encoding="utf-8"))
+            self.assertEqual(load_project(str(root / "b.json")).to_dict(), p.to_dict())
+
+
+class TestProjectJournal(unittest.TestCase):
+    def _setup(self, td: str):
+        path = Path(td) / "project.json"
+        p = Project(
+            v_clips=[Clip(id=f"v{i}", src=f"v{i}.mp4", in_sec=0.0, out_sec=2.0) for i in range(5)],
+            a_clips=[Clip(id="a1", src="music.mp3", in_sec=0.0, out_sec=30.0)],
+            fps=30,
+        )
+        save_project(p, str(path))
+        journal = ProjectJournal(str(path))
+        journal.reset(snapshot_project(p))
+        return path, p, journal
+
+    def test_append_writes_only_changed_tracks_and_replays_on_load(self):
+        with tempfile.TemporaryDirectory() as td:
+            path, p, journal = self._setup(td)
+            main_before = path.read_bytes()
+
+            p.v_clips = [replace(p.v_clips[0], out_sec=1.0), *p.v_clips[1:]]
+            journal.append(snapshot_project(p, journal.last))
+            p.v_clips = p.v_clips[:3]
+            journal.append(snapshot_project(p, journal.last))
+            self.assertEqual(journal.append(snapshot_project(p, journal.last)), 0)
+
+            self.assertEqual(path.read_bytes(), main_before)
+            lines = journal_path(str(path)).read_text(encoding="utf-8").splitlines()
+            self.assertEqual(len(lines), 3)
+            self.assertNotIn("music.mp3", lines[1])
+            self.assertTrue(has_journal(str(path)))
+
+            loaded = load_project(str(path))
+            self.assertEqual([c.id for c in loaded.v_clips], ["v0", "v1", "v2"])
+            self.assertAlmostEqual(loaded.v_clips[0].out_sec, 1.0)
+            self.assertEqual(loaded.a_clips[0].src, "music.mp3")
+            self.assertEqual(len(load_project(str(path), replay_journal=False).v_clips), 5)
+
+    def test_torn_tail_and_stale_journal_are_ignored(self):
+        with tempfile.TemporaryDirectory() as td:
+            path, p, journal = self._setup(td)
+            p.v_clips = p.v_clips[:2]
+            journal.append(snapshot_project(p, journal.last))
+            with journal_path(str(path)).open("a", encoding="utf-8") as fp:
+                fp.write('{"fps": 30, "order": [')
+            self.assertEqual(len(load_project(str(path)).v_clips), 2)
+
+            # The main file changed behind the journal's back: don't replay.
+            save_project(Project(v_clips=[], a_clips=[], fps=25), str(path))
+            self.assertFalse(has_journal(str(path)))
+            self.assertEqual(load_project(str(path)).fps, 25)
+
+    def test_append_after_torn_tail_is_recovered(self):
+        with tempfile.TemporaryDirectory() as td:
+            path, p, journal = self._setup(td)
+            p.v_clips = p.v_clips[:4]
+            journal.append(snapshot_project(p, journal.last))
+            with journal_path(str(path)).open("a", encoding="utf-8") as fp:
+                fp.write('{"fps": 30, "order": [')
+
+            # Reopen after the crash and keep editing.
+            loaded = load_project(str(path))
+            self.assertEqual(len(loaded.v_clips), 4)
+            journal = ProjectJournal(str(path))
+            journal.reset(snapshot_project(loaded))
+            for n in (2, 1):
+                loaded.v_clips = loaded.v_clips[:n]
+                journal.append(snapshot_project(loaded, journal.last))
+            self.assertEqual(len(load_project(str(path)).v_clips), 1)
+
+    def test_compact_folds_journal_into_main_file(self):
+        with tempfile.TemporaryDirectory() as td:
+            path, p, journal = self._setup(td)
+            journal.compact_every = 2
+            for n in (4, 3):
+                p.v_clips = p.v_clips[:n]
+                journal.append(snapshot_project(p, journal.last))
+            self.assertTrue(journal.needs_compaction())
+            journal.compact(snapshot_project(p, journal.last))
+            self.assertFalse(journal_path(str(path)).exists())
+            self.assertEqual(len(load_project(str(path), replay_journal=False).v_clips), 3)
+
+            p.v_clips = p.v_clips[:1]
+            journal.append(snapshot_project(p, journal.last))
+            self.assertEqual(len(load_project(str(path)).v_clips), 1)
+
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -25,7 +25,7 @@ class TestProjectModel(unittest.TestCase):
         a = Clip(id="a1", src="b.mp3", in_sec=1.0, out_sec=3.0, speed=0.5, volume=1.0, muted=True, has_audio=True)
         p = Project(v_clips=[v], a_clips=[a], fps=24)
 
-        d = p.to_dict()
+        d = p.to_dict(legacy=True)
         self.assertIn("v_clips", d)
         self.assertIn("a_clips", d)
 
@@ -43,6 +43,32 @@ class TestProjectModel(unittest.TestCase):
         self.assertTrue(p2.a_clips[0].muted)
         self.assertTrue(p2.a_clips[0].has_audio)
 
+    def test_compact_schema_roundtrip_without_legacy_keys(self):
+        clips = [
+            Clip(id="v1", src="a.mp4", in_sec=0.5, out_sec=2.0, speed=1.5, volume=0.5, has_audio=False),
+            Clip(id="v2", src="a.mp4", in_sec=2.0, out_sec=3.0, transition_in=Transition(kind="dissolve", duration=0.4)),
+        ]
+        a = Clip(id="a1", src="b.mp3", in_sec=1.0, out_sec=3.0, muted=True)
+        p = Project(v_clips=clips, a_clips=[a], fps=25)
+        p.video_tracks[0].visible = False
+
+        d = p.to_dict()
+        self.assertEqual(d["version"], 2)
+        self.assertNotIn("v_clips", d)
+        self.assertEqual(d["sources"], ["a.mp4", "b.mp3"])
+        self.assertNotIn("volume", d["tracks"][0]["clips"][1])
+
+        p2 = Project.from_dict(d)
+        self.assertEqual(p2.fps, 25)
+        self.assertEqual([c.to_dict() for c in p2.v_clips], [c.to_dict() for c in clips])
+        self.assertEqual(p2.a_clips[0].to_dict(), a.to_dict())
+        self.assertFalse(p2.video_tracks[0].visible)
+        self.assertEqual(p2.to_dict(legacy=True), p.to_dict(legacy=True))
+
+    def test_newer_schema_version_is_rejected(self):
+        with self.assertRaises(ValueError):
+            Project.from_dict({"version": 99, "fps": 30, "sources": [], "tracks": []})
+
     def test_clip_speed_from_dict_defaults_and_clamps(self):
         c = Clip.from_dict({"id": "x", "src": "a.mp4", "in_sec": 0.0, "out_sec": 4.0, "speed": "bad"})
         self.assertAlmostEqual(c.speed, 1.0)
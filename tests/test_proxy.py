@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from core.ffmpeg import MediaInfo, build_export_command_project, set_proxy_map
+from core.model import Clip, Track
+from core.proxy import ProxyMap, ProxyPolicy, generate_proxy, proxy_path
+
+
+class TestProxyPolicy(unittest.TestCase):
+    def test_only_heavy_video_needs_a_proxy(self):
+        policy = ProxyPolicy()
+        light = MediaInfo(duration=5.0, has_video=True, has_audio=True, width=1920, height=1080, video_codec="h264", video_bitrate=8_000_000)
+        self.assertFalse(policy.needs_proxy(light))
+        self.assertTrue(policy.needs_proxy(MediaInfo(duration=5.0, has_video=True, has_audio=True, width=3840, height=2160, video_codec="h264")))
+        self.assertTrue(policy.needs_proxy(MediaInfo(duration=5.0, has_video=True, has_audio=True, width=1280, height=720, video_codec="hevc")))
+        self.assertTrue(policy.needs_proxy(MediaInfo(duration=5.0, has_video=True, has_audio=True, width=1920, height=1080, video_codec="h264", video_bitrate=80_000_000)))
+        self.assertFalse(policy.needs_proxy(MediaInfo(duration=5.0, has_video=False, has_audio=True)))
+
+
+class TestGenerateProxy(unittest.TestCase):
+    def test_cached_by_fingerprint_and_written_atomically(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            src = root / "a7s.mov"
+            src.write_bytes(b"4k-video")
+            cmds = []
+
+            def _fake_run(cmd, **_kwargs):
+                cmds.append(cmd)
+                Path(cmd[-1]).write_bytes(b"proxy")
+                return None
+
+            with patch("core.media_cache.subprocess.run", side_effect=_fake_run):
+                p1 = generate_proxy("ffmpeg", str(src), root / "proxies")
+                p2 = generate_proxy("ffmpeg", str(src), root / "proxies")
+            self.assertEqual(p1, p2)
+            self.assertEqual(len(cmds), 1)
+            self.assertTrue(cmds[0][-1].endswith(".part"))
+            self.assertIn("-g", cmds[0])
+            self.assertEqual(list((root / "proxies").iterdir()), [Path(p1)])
+
+            st = src.stat()
+            os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+            self.assertNotEqual(proxy_path(root / "proxies", str(src)), Path(p1))
+
+    def test_failed_transcode_leaves_nothing_behind(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            src = root / "a.mov"
+            src.write_bytes(b"x")
+
+            def _fail(cmd, **_kwargs):
+                Path(cmd[-1]).write_bytes(b"partial")
+                raise RuntimeError("ffmpeg failed")
+
+            with patch("core.media_cache.subprocess.run", side_effect=_fail):
+                self.assertIsNone(generate_proxy("ffmpeg", str(src), root / "proxies"))
+            self.assertEqual(list((root / "proxies").iterdir()), [])
+
+
+class TestProxyExport(unittest.TestCase):
+    def tearDown(self) -> None:
+        set_proxy_map(None)
+
+    @patch("core.ffmpeg.probe_media_cached")
+    def test_export_reads_originals(self, probe):
+        probe.return_value = MediaInfo(duration=10.0, has_video=True, has_audio=True)
+        proxies = ProxyMap()
+        proxies.register("orig.mov", "proxy.mp4")
+        self.assertEqual(proxies.media_src("orig.mov"), "proxy.mp4")
+        self.assertEqual(proxies.original_for("proxy.mp4"), "orig.mov")
+        set_proxy_map(proxies)
+
+        v = [Clip(id="v1", src="proxy.mp4", in_sec=0.0, out_sec=2.0)]
+        cmd = build_export_command_project("ffmpeg", "ffprobe", v, [], "out.mp4")
+        self.assertIn("orig.mov", cmd)
+        self.assertNotIn("proxy.mp4", cmd)
+
+        tracks = [Track(id="v1", name="V1", kind="video", clips=v), Track(id="a1", name="A1", kind="audio", clips=[])]
+        cmd = build_export_command_project("ffmpeg", "ffprobe", [], [], "out.mp4", tracks=tracks)
+        self.assertIn("orig.mov", cmd)
+        self.assertIs(tracks[0].clips, v)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+
+from core.render import FrameScheduler
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestFrameScheduler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = _Clock()
+        self.scheduled = []
+        self.commits = []
+        self.renders = []
+        self.ui = FrameScheduler(
+            commit=lambda: self.commits.append(list(self.renders)),
+            schedule=lambda fn, delay: self.scheduled.append((fn, delay)),
+            frame_sec=0.02,
+            clock=self.clock,
+        )
+        self.ui.register("timeline", lambda: self.renders.append("timeline"))
+        self.ui.register("inspector")
+        self.ui.register("playhead", lambda: self.renders.append("playhead"))
+
+    def _run_scheduled(self) -> None:
+        pending, self.scheduled = self.scheduled, []
+        for fn, _delay in pending:
+            fn()
+
+    def test_burst_of_marks_is_one_render_and_one_commit(self):
+        for _ in range(20):
+            self.ui.invalidate("timeline")
+            self.ui.invalidate("inspector")
+        self.ui.invalidate("playhead", "timeline")
+        self.assertEqual(len(self.scheduled), 1)
+        self.assertEqual(self.scheduled[0][1], 0.0)
+        self._run_scheduled()
+        self.assertEqual(self.renders, ["timeline", "playhead"])
+        self.assertEqual(len(self.commits), 1)
+        self.assertFalse(self.ui.is_dirty("inspector"))
+
+    def test_next_flush_waits_for_the_frame_boundary(self):
+        self.ui.invalidate("inspector")
+        self._run_scheduled()
+        self.clock.now += 0.005
+        self.ui.invalidate("inspector")
+        self.assertAlmostEqual(self.scheduled[0][1], 0.015)
+
+    def test_early_flush_makes_the_scheduled_one_a_no_op(self):
+        self.ui.invalidate("inspector")
+        self.ui.flush()
+        self._run_scheduled()
+        self.assertEqual(len(self.commits), 1)
+
+    def test_marks_made_by_renderers_join_the_same_commit(self):
+        self.ui.register("timeline", lambda: (self.renders.append("timeline"), self.ui.invalidate("playhead")))
+        self.ui.invalidate("timeline")
+        self._run_scheduled()
+        self.assertEqual(self.renders, ["timeline", "playhead"])
+        self.assertEqual(self.commits, [["timeline", "playhead"]])
+        self.assertEqual(self.scheduled, [])
+
+    def test_renderer_errors_are_reported_and_do_not_block_the_commit(self):
+        errors = []
+        ui = FrameScheduler(
+            commit=lambda: self.commits.append("commit"),
+            schedule=lambda fn, delay: fn(),
+            on_error=lambda region, ex: errors.append(region),
+        )
+        ui.register("media", lambda: 1 / 0)
+        ui.invalidate("media")
+        self.assertEqual(errors, ["media"])
+        self.assertEqual(self.commits, ["commit"])
+        ui.invalidate("media")
+        self.assertEqual(errors, ["media", "media"])
+
+
+if __name__ == "__main__":
+    unittest.main()
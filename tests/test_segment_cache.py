@@ -0,0 +1,169 @@
+import os
+import subprocess
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from core.ffmpeg import MediaInfo, export_project_with_progress, plan_segments
+from core.model import Clip, Transition
+from core.segment_cache import SegmentCache
+
+
+class _FakeProc:
+    """Popen stand-in that writes the output file, or fails when `ret` != 0."""
+
+    def __init__(self, cmd, ret: int = 0):
+        self.stderr = iter(["out_time_ms=1000000\n", "progress=end\n"])
+        self.ret = ret
+        if ret == 0:
+            Path(cmd[-1]).write_bytes(b"segment")
+
+    def wait(self, timeout=None) -> int:
+        return self.ret
+
+    def terminate(self) -> None:
+        pass
+
+    def kill(self) -> None:
+        pass
+
+
+class TestSegmentCache(unittest.TestCase):
+    def test_publish_get_and_lru_eviction(self):
+        with tempfile.TemporaryDirectory() as td:
+            cache = SegmentCache(Path(td), max_bytes=10)
+            self.assertIsNone(cache.get("aa11", "mp4"))
+            paths = []
+            for n, key in enumerate(("aa11", "bb22", "cc33")):
+                part = cache.part_path(key, "mp4")
+                part.write_bytes(b"12345")
+                paths.append(cache.publish(key, "mp4", part))
+                old = time.time() - 100 + n
+                os.utime(paths[-1], (old, old))
+            self.assertFalse(any(".part." in p.name for p in Path(td).glob("*/*")))
+
+            # Reading "aa11" makes it the most recently used entry.
+            self.assertEqual(cache.get("aa11", "mp4"), paths[0])
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+            self.assertEqual(cache.evict(), 5)
+            self.assertFalse(paths[1].exists())
+            self.assertTrue(paths[0].exists())
+            self.assertTrue(paths[2].exists())
+
+            # Pinned segments survive even when over budget.
+            cache.max_bytes = 1
+            cache.evict(keep=[paths[0]])
+            self.assertTrue(paths[0].exists())
+            self.assertFalse(paths[2].exists())
+
+            self.assertEqual(cache.clear(), 5)
+            self.assertEqual(cache.size_bytes(), 0)
+
+
+class TestPlanSegments(unittest.TestCase):
+    def test_edges_follow_hard_cuts_only(self):
+        clips = [Clip(id=f"c{i}", src=f"s{i}.mp4", in_sec=0.0, out_sec=4.0) for i in range(4)]
+        clips[2] = Clip(id="c2", src="s2.mp4", in_sec=0.0, out_sec=4.0, transition_in=Transition(kind="fade", duration=1.0))
+        # Timeline: 0-4, 4-8, 7-11 (fade), 11-15.
+        self.assertEqual(plan_segments(clips), [(0.0, 4.0), (4.0, 11.0), (11.0, 15.0)])
+        short = [Clip(id="a", src="a.mp4", in_sec=0.0, out_sec=4.0), Clip(id="b", src="b.mp4", in_sec=0.0, out_sec=1.0)]
+        self.assertEqual(plan_segments(short), [(0.0, 5.0)])
+
+    def test_trimming_one_clip_keeps_other_groups(self):
+        clips = [Clip(id=f"c{i}", src=f"s{i}.mp4", in_sec=0.0, out_sec=1.5) for i in range(10)]
+        before = [round(b - a, 6) for a, b in plan_segments(clips)]
+        clips[0] = Clip(id="c0", src="s0.mp4", in_sec=0.0, out_sec=0.4)
+        after = [round(b - a, 6) for a, b in plan_segments(clips)]
+        # Only the segment holding c0 changes length; later groups just shift.
+        self.assertEqual(len(before), len(after))
+        self.assertEqual(after[1:], before[1:])
+
+
+class TestIncrementalExport(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.root = Path(self._td.name)
+        self.srcs = []
+        for i in range(4):
+            p = self.root / f"s{i}.mp4"
+            p.write_bytes(b"src" * (i + 1))
+            self.srcs.append(str(p))
+        self.cache = SegmentCache(self.root / "segments")
+        self.out = str(self.root / "out.mp4")
+
+    def tearDown(self) -> None:
+        self._td.cleanup()
+
+    def _clips(self, first_out: float = 4.0):
+        return [
+            Clip(id=f"c{i}", src=src, in_sec=0.0, out_sec=first_out if i == 0 else 4.0)
+            for i, src in enumerate(self.srcs)
+        ]
+
+    def _export(self, clips, fail_on=None, workers=2):
+        cmds = []
+
+        def _popen(cmd, **_kwargs):
+            cmds.append(cmd)
+            fail = fail_on is not None and any(fail_on in str(a) for a in cmd) and "concat" not in cmd
+            return _FakeProc(cmd, ret=1 if fail else 0)
+
+        with patch("core.ffmpeg.subprocess.Popen", side_effect=_popen):
+            export_project_with_progress("ffmpeg", "ffprobe", clips, [], self.out, segment_cache=self.cache, parallel_workers=workers)
+        return [c for c in cmds if "concat" not in c], [c for c in cmds if "concat" in c]
+
+    @patch("core.ffmpeg.probe_media")
+    def test_reexport_renders_only_changed_segments(self, probe_media):
+        probe_media.return_value = MediaInfo(duration=100.0, has_video=True, has_audio=True)
+        renders, concats = self._export(self._clips())
+        self.assertEqual((len(renders), len(concats)), (4, 1))
+        # PCM segments, audio encoded once while joining: no AAC priming at every cut.
+        self.assertIn("pcm_s16le", renders[0])
+        self.assertNotIn("aac", renders[0])
+        self.assertIn("aac", concats[0])
+        self.assertEqual(concats[0][concats[0].index("-c:v") + 1], "copy")
+        self.assertEqual(self.cache.size_bytes(), 4 * len(b"segment"))
+
+        renders, concats = self._export(self._clips())
+        self.assertEqual((len(renders), len(concats)), (0, 1))
+
+        renders, _ = self._export(self._clips(first_out=3.0))
+        self.assertEqual(len(renders), 1)
+        self.assertIn(self.srcs[0], renders[0])
+
+    @patch("core.ffmpeg.probe_media")
+    def test_trimming_short_clip_rerenders_one_segment(self, probe_media):
+        probe_media.return_value = MediaInfo(duration=100.0, has_video=True, has_audio=True)
+        srcs = []
+        for i in range(10):
+            p = self.root / f"short{i}.mp4"
+            p.write_bytes(b"short" * (i + 1))
+            srcs.append(str(p))
+
+        def _clips(first_out: float):
+            return [Clip(id=f"c{i}", src=src, in_sec=0.0, out_sec=first_out if i == 0 else 1.5) for i, src in enumerate(srcs)]
+
+        renders, _ = self._export(_clips(1.5))
+        self.assertGreater(len(renders), 1)
+        renders, _ = self._export(_clips(0.4))
+        self.assertEqual(len(renders), 1)
+        self.assertIn(srcs[0], renders[0])
+
+    @patch("core.ffmpeg.probe_media")
+    def test_failed_export_resumes_from_finished_segments(self, probe_media):
+        probe_media.return_value = MediaInfo(duration=100.0, has_video=True, has_audio=True)
+        with self.assertRaises(subprocess.CalledProcessError):
+            # One worker renders in timeline order, so the last segment fails last.
+            self._export(self._clips(), fail_on=self.srcs[3], workers=1)
+        self.assertFalse(any(".part." in p.name for p in self.cache.root.glob("*/*")))
+
+        renders, concats = self._export(self._clips())
+        self.assertEqual(len(concats), 1)
+        self.assertEqual(len(renders), 1)
+        self.assertIn(self.srcs[3], renders[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
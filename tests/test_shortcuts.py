@@ -2,6 +2,7 @@ import unittest
 
 from core.shortcuts import (
     ACTION_DELETE,
+    ACTION_DRAFT_RENDER,
     ACTION_EXPORT,
     ACTION_IMPORT,
     ACTION_REDO,
@@ -35,6 +36,7 @@ class TestShortcuts(unittest.TestCase):
         self.assertEqual(resolve_shortcut_action(key="z", ctrl=True, shift=True), ACTION_REDO)
         self.assertEqual(resolve_shortcut_action(key="i", ctrl=True), ACTION_IMPORT)
         self.assertEqual(resolve_shortcut_action(key="e", ctrl=True), ACTION_EXPORT)
+        self.assertEqual(resolve_shortcut_action(key="E", ctrl=True, shift=True), ACTION_DRAFT_RENDER)
 
     def test_typing_focus_blocks_plain_shortcuts(self):
         self.assertIsNone(resolve_shortcut_action(key="s", typing_focus=True))
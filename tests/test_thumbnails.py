@@ -4,7 +4,7 @@ import unittest
 from pathlib import Path
 from unittest.mock import patch
 
-from core.thumbnails import generate_thumbnail, generate_waveform
+from core.thumbnails import FilmstripIndex, generate_filmstrip, generate_thumbnail, generate_waveform
 
 
 class TestThumbnails(unittest.TestCase):
@@ -23,7 +23,7 @@ class TestThumbnails(unittest.TestCase):
                 out.write_bytes(b"png")
                 return None
 
-            with patch("core.thumbnails.subprocess.run", side_effect=_fake_run):
+            with patch("core.media_cache.subprocess.run", side_effect=_fake_run):
                 p1 = generate_thumbnail("ffmpeg", str(src), 0.5, cache_dir, width=320)
                 p2 = generate_thumbnail("ffmpeg", str(src), 0.5, cache_dir, width=320)
 
@@ -46,7 +46,7 @@ class TestThumbnails(unittest.TestCase):
                 out.write_bytes(b"png")
                 return None
 
-            with patch("core.thumbnails.subprocess.run", side_effect=_fake_run):
+            with patch("core.media_cache.subprocess.run", side_effect=_fake_run):
                 out = generate_waveform("ffmpeg", str(src), 1.2, 3.4, cache_dir, width=300, height=40)
 
             self.assertIsNotNone(out)
@@ -62,13 +62,55 @@ class TestThumbnails(unittest.TestCase):
             cache_dir = root / "wave_cache"
 
             with patch(
-                "core.thumbnails.subprocess.run",
+                "core.media_cache.subprocess.run",
                 side_effect=subprocess.CalledProcessError(1, ["ffmpeg"]),
             ):
                 out = generate_waveform("ffmpeg", str(src), 0.0, 2.0, cache_dir)
 
             self.assertIsNone(out)
 
+    def test_generate_filmstrip_runs_ffmpeg_once_per_source(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            src = root / "src.mp4"
+            src.write_bytes(b"demo-video")
+            cache_dir = root / "strip_cache"
+            cmds = []
+
+            def _fake_run(cmd, **_kwargs):
+                cmds.append(cmd)
+                pattern = Path(cmd[-1])
+                pattern.parent.mkdir(parents=True, exist_ok=True)
+                for n in (1, 2):
+                    (pattern.parent / pattern.name.replace("%04d", f"{n:04d}")).write_bytes(b"jpg")
+                return None
+
+            with patch("core.media_cache.subprocess.run", side_effect=_fake_run):
+                s1 = generate_filmstrip("ffmpeg", str(src), cache_dir, duration=150.0, cols=10, rows=10)
+                s2 = generate_filmstrip("ffmpeg", str(src), cache_dir, duration=150.0, cols=10, rows=10)
+
+            self.assertEqual(len(cmds), 1)
+            self.assertIn("tile=10x10", " ".join(cmds[0]))
+            self.assertIsNotNone(s1)
+            self.assertEqual(s1, s2)
+            self.assertEqual(len(s1.sheets), 2)
+            self.assertEqual(s1.frame_count, 151)
+
+    def test_filmstrip_frame_lookup(self):
+        strip = FilmstripIndex(
+            interval_sec=2.0,
+            tile_w=160,
+            tile_h=90,
+            cols=4,
+            rows=2,
+            frame_count=10,
+            sheets=("a.jpg", "b.jpg"),
+        )
+        self.assertEqual(strip.frame_at(0.0), ("a.jpg", 0, 0))
+        self.assertEqual(strip.frame_at(9.2), ("a.jpg", 160, 90))  # frame 5
+        self.assertEqual(strip.frame_at(16.0), ("b.jpg", 0, 0))  # frame 8
+        self.assertEqual(strip.frame_at(999.0), ("b.jpg", 160, 0))  # clamped to frame 9
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,6 +2,7 @@ import unittest
 
 from core.model import Clip, Transition, new_id
 from core.timeline import (
+    TimelineIndex,
     add_clip_end,
     duplicate_clip,
     insert_clip_before,
@@ -10,6 +11,8 @@ from core.timeline import (
     split_clip_at_timeline_sec,
     total_duration,
     trim_clip,
+    span_spacers,
+    visible_span,
 )
 
 
@@ -232,5 +235,75 @@ class TestTimeline(unittest.TestCase):
         self.assertFalse(out[0].has_audio)
 
 
+class TestTimelineIndex(unittest.TestCase):
+    def _clips(self):
+        a = Clip(id="a", src="a.mp4", in_sec=0.0, out_sec=4.0)
+        b = Clip(id="b", src="b.mp4", in_sec=0.0, out_sec=4.0, transition_in=Transition(kind="fade", duration=1.0))
+        c = Clip(id="c", src="c.mp4", in_sec=0.0, out_sec=4.0, speed=2.0)
+        return [a, b, c]
+
+    def test_starts_account_for_transition_overlap(self):
+        clips = self._clips()
+        idx = TimelineIndex(clips)
+        self.assertEqual(idx.starts, [0.0, 3.0, 7.0])
+        self.assertAlmostEqual(idx.total, total_duration(clips))
+        self.assertEqual(idx.position_of("c"), 2)
+        self.assertIs(idx.get("b"), clips[1])
+        self.assertIsNone(idx.get("missing"))
+
+    def test_locate_uses_incoming_clip_inside_transition(self):
+        idx = TimelineIndex(self._clips())
+        self.assertEqual(idx.locate(1.0), (0, 1.0))
+        self.assertEqual(idx.locate(3.5), (1, 0.5))
+        self.assertEqual(idx.locate(9.0), (2, 2.0))
+        self.assertIsNone(idx.locate(9.5))
+        self.assertIsNone(idx.locate(-1.0))
+
+    def test_update_recomputes_only_after_first_changed_clip(self):
+        clips = self._clips()
+        idx = TimelineIndex(clips)
+        out, _sel, _msg = split_clip(clips, "c", 1.0)
+        idx.update(out)
+        self.assertEqual(len(idx), 4)
+        self.assertIsNone(idx.position_of("c"))
+        self.assertEqual(idx.starts, [0.0, 3.0, 7.0, 8.0])
+        self.assertEqual(idx.position_of(out[3].id), 3)
+        moved = move_clip_before(out, out[3].id, "a")
+        idx.update(moved)
+        self.assertEqual(idx.starts, TimelineIndex(moved).starts)
+        self.assertEqual(idx.position_of("a"), 1)
+
+    def test_split_at_timeline_sec_accounts_for_overlap(self):
+        clips = self._clips()
+        idx = TimelineIndex(clips)
+        out, sel, msg = split_clip_at_timeline_sec(clips, 5.0, index=idx)
+        self.assertEqual(msg, "Split แล้ว")
+        self.assertEqual([c.src for c in out], ["a.mp4", "b.mp4", "b.mp4", "c.mp4"])
+        self.assertAlmostEqual(out[1].dur, 2.0)
+        self.assertEqual(sel, out[1].id)
+
+
+class TestVisibleSpan(unittest.TestCase):
+    def test_returns_items_intersecting_window(self):
+        starts = [0.0, 100.0, 200.0, 300.0]
+        ends = [90.0, 190.0, 290.0, 390.0]
+        self.assertEqual(visible_span(starts, ends, 150.0, 250.0), (1, 3))
+        self.assertEqual(visible_span(starts, ends, 90.0, 100.0), (1, 1))
+        self.assertEqual(visible_span(starts, ends, -50.0, 10.0), (0, 1))
+        self.assertEqual(visible_span(starts, ends, 500.0, 900.0), (4, 4))
+        self.assertEqual(visible_span(starts, ends, 0.0, 1e9), (0, 4))
+        self.assertEqual(visible_span([], [], 0.0, 100.0), (0, 0))
+
+    def test_spacers_cover_unrealized_items(self):
+        starts = [0.0, 100.0, 200.0, 300.0]
+        ends = [90.0, 190.0, 290.0, 390.0]
+        self.assertEqual(span_spacers(starts, ends, 1, 3, 10.0), (90.0, 90.0))
+        self.assertEqual(span_spacers(starts, ends, 0, 4, 10.0), (0.0, 0.0))
+        # Window past the last clip (e.g. scrolled right, then zoomed out).
+        lo, hi = visible_span(starts, ends, 500.0, 900.0)
+        self.assertEqual(span_spacers(starts, ends, lo, hi, 10.0), (390.0, 0.0))
+        self.assertEqual(span_spacers([], [], 0, 0, 10.0), (0.0, 0.0))
+
+
 if __name__ == "__main__":
     unittest.main()